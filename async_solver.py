@@ -0,0 +1,264 @@
+"""
+An asyncio interface to the sudoku solver.
+
+Puzzles are solved in a pool of worker processes so the event loop is
+never blocked. solve_async() returns a SolveResult, solve_events() is an
+async iterator of the solver's events ending with the result and
+solve_many() solves many puzzles at once with a limit on how many run
+together. Cancelling the awaiting task stops the solver in its worker.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count
+import asyncio
+import multiprocessing
+import os
+import sudoku_api as api
+import threading
+
+
+cancel_flags = None  # Cancel flag of each task slot, in the workers
+event_queue = None  # Events sent from the workers to the event loop
+
+
+def init_worker(flags, events):
+    """
+    A function to keep the shared cancel flags and event queue
+    in each worker process.
+    """
+    global cancel_flags, event_queue
+    cancel_flags = flags
+    event_queue = events
+
+
+def solve_task(slot: int, task_id: int, puzzle, options: dict,
+               progress: bool):
+    """
+    A function that solves a puzzle in a worker process, sending the
+    solver's events as dictionaries if progress is True and then the
+    result as events for the task. Stops once the task's slot is
+    cancelled.
+    """
+    def send_event(event):
+        event_queue.put((task_id, "event", event.to_dict()))
+
+    stop = lambda: cancel_flags[slot] == 1  # noqa: E731
+    if stop():  # Cancelled before it started
+        result = api.SolveResult(api.puzzle_text(puzzle) or str(puzzle),
+                                 "cancelled")
+    else:
+        result = api.solve(puzzle, stop=stop,
+                           on_event=send_event if progress else None,
+                           **options)
+
+    event_queue.put((task_id, "result", result.to_dict()))
+
+
+class AsyncSolver:
+    """
+    A class to solve puzzles from asyncio code in a pool of worker
+    processes. Each running solve takes one of limit slots, holding it
+    until its worker has finished, so at most limit solves are queued
+    or running at once and the rest wait their turn.
+    Events from the workers come back on one queue, read by a thread
+    that passes each event to the waiting task's event loop.
+    Used from one event loop at a time.
+    """
+
+    def __init__(self, workers: int = None, limit: int = None):
+        if workers is None:
+            workers = os.cpu_count()
+        if limit is None:
+            limit = workers * 2
+        self.workers = workers
+        self.limit = limit
+
+        self.cancel_flags = multiprocessing.Array("b", limit, lock=False)
+        self.events = multiprocessing.Queue()
+        self.free_slots = list(range(limit))
+        self.semaphore = None  # Made in the event loop on first use
+        self.loop = None  # The event loop the semaphore belongs to
+        self.listeners = {}  # Task id to its event loop and queue
+        self.task_ids = count()
+        self.lock = threading.Lock()
+
+        self.executor = ProcessPoolExecutor(max_workers=workers,
+                                            initializer=init_worker,
+                                            initargs=(self.cancel_flags,
+                                                      self.events))
+        self.reader = threading.Thread(target=self.read_events, daemon=True)
+        self.reader.start()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    def read_events(self):
+        """
+        A function that passes each event from the workers to the
+        queue of its task, until the None sent by close.
+        """
+        while True:
+            event = self.events.get()
+            if event is None:
+                return
+
+            task_id, kind, payload = event
+            with self.lock:
+                listener = self.listeners.get(task_id)
+            if listener is not None:
+                loop, queue = listener
+                loop.call_soon_threadsafe(queue.put_nowait, (kind, payload))
+
+    def close(self):
+        """
+        A function to stop any running solves, the worker processes
+        and the event reader.
+        """
+        for slot in range(self.limit):
+            self.cancel_flags[slot] = 1
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.events.put(None)
+        self.reader.join()
+        self.events.close()
+
+    async def events_for(self, puzzle, progress: bool, options: dict):
+        """
+        A function that yields the events of a solve as dictionaries,
+        each solver event from SolverEvent.to_dict() if progress is True,
+        then {"type": "result", "result": SolveResult}.
+        """
+        loop = asyncio.get_running_loop()
+        if self.semaphore is None or self.loop is not loop:
+            self.semaphore = asyncio.Semaphore(len(self.free_slots))
+            self.loop = loop
+
+        semaphore = self.semaphore
+        await semaphore.acquire()
+        slot = self.free_slots.pop()
+        self.cancel_flags[slot] = 0
+        task_id = next(self.task_ids)
+        queue = asyncio.Queue()
+        with self.lock:
+            self.listeners[task_id] = (loop, queue)
+
+        def release(_):
+            # The slot is only free again once the worker is done with it
+            self.free_slots.append(slot)
+            semaphore.release()
+
+        def failed(future):
+            if not future.cancelled() and future.exception() is not None:
+                queue.put_nowait(("error", future.exception()))
+
+        future = loop.run_in_executor(self.executor, solve_task, slot,
+                                      task_id, puzzle, options, progress)
+        future.add_done_callback(failed)
+        future.add_done_callback(release)
+
+        try:
+            while True:
+                kind, payload = await queue.get()
+                if kind == "event":
+                    yield payload
+                elif kind == "result":
+                    yield {"type": "result",
+                           "result": api.SolveResult.from_dict(payload)}
+                    return
+                else:
+                    raise payload
+        finally:
+            with self.lock:
+                del self.listeners[task_id]
+            if not future.done():
+                self.cancel_flags[slot] = 1  # Stop the worker's solve
+
+    async def solve(self, puzzle, **options):
+        """
+        A function that solves a puzzle and returns its SolveResult.
+        Takes the same options as sudoku_api.solve.
+        """
+        events = self.events_for(puzzle, False, options)
+        try:
+            async for event in events:
+                if event["type"] == "result":
+                    return event["result"]
+        finally:
+            await events.aclose()
+
+    def solve_events(self, puzzle, **options):
+        """
+        A function that returns an async iterator of the solver's events
+        while solving a puzzle, ending with the result.
+        """
+        return self.events_for(puzzle, True, options)
+
+    async def solve_many(self, puzzles, **options):
+        """
+        A function that solves every puzzle, at most limit at once, and
+        returns their SolveResults in the same order.
+        """
+        return await asyncio.gather(*[self.solve(puzzle, **options)
+                                      for puzzle in puzzles])
+
+
+solver = None  # The async solver shared by the functions below
+solver_lock = threading.Lock()
+
+
+def get_solver():
+    """
+    A function that returns the shared async solver,
+    starting it on first use.
+    """
+    global solver
+
+    with solver_lock:
+        if solver is None:
+            solver = AsyncSolver()
+
+    return solver
+
+
+def shutdown():
+    """
+    A function to stop the shared async solver.
+    """
+    global solver
+
+    with solver_lock:
+        if solver is not None:
+            solver.close()
+            solver = None
+
+
+async def solve_async(puzzle, *, engine: str = "ga", seed: int = None,
+                      timeout: float = None, fallback: bool = False):
+    """
+    A function that solves a puzzle in the shared worker processes
+    and returns its SolveResult.
+    """
+    return await get_solver().solve(puzzle, engine=engine, seed=seed,
+                                    timeout=timeout, fallback=fallback)
+
+
+def solve_events(puzzle, *, engine: str = "ga", seed: int = None,
+                 timeout: float = None, fallback: bool = False):
+    """
+    A function that returns an async iterator of the solver's events
+    while solving a puzzle in the shared worker processes.
+    """
+    return get_solver().solve_events(puzzle, engine=engine, seed=seed,
+                                     timeout=timeout, fallback=fallback)
+
+
+async def solve_many(puzzles, *, engine: str = "ga", seed: int = None,
+                     timeout: float = None, fallback: bool = False):
+    """
+    A function that solves many puzzles in the shared worker processes,
+    limited to a few at once, and returns their SolveResults in order.
+    """
+    return await get_solver().solve_many(puzzles, engine=engine, seed=seed,
+                                         timeout=timeout, fallback=fallback)
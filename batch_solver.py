@@ -0,0 +1,262 @@
+"""
+A command line mode to solve many sudoku puzzles without the GUI.
+
+Reads puzzles written as 81 characters, 0 or . for empty cells, one to a
+line from a file or stdin, solves them across a pool of worker processes
+and writes one JSON line for each puzzle, in the order they were read.
+"""
+
+from multiprocessing import Pool
+import argparse
+import json
+import os
+import sudoku_api as api
+import sys
+
+
+def solve_puzzle(job: tuple):
+    """
+    A function that solves a single puzzle and returns its result
+    as a dictionary ready to be written as JSON.
+    The job is the puzzle number, its text and the solver options.
+    A puzzle that runs out of time with the ga is solved again with
+    the exact engine. Puzzles are answered from the puzzle store when
+    one is given, read only as the main process keeps the solutions.
+    """
+    index, text, options = job
+
+    seed = options["seed"]
+    if seed is not None:
+        seed += index
+
+    events = []
+    on_event = None
+    if options.get("events"):
+        on_event = lambda event: events.append(event.to_dict())  # noqa: E731
+
+    profiler = None
+    cpu = bool(options.get("profile") or options.get("top"))
+    if cpu or options.get("trace_memory"):
+        import run_profiler as rp  # Only loaded when profiling
+        profiler = rp.RunProfiler(cpu=cpu,
+                                  memory=bool(options.get("trace_memory")),
+                                  out_dir=options.get("profile"),
+                                  name=f"puzzle_{index}")
+
+    store = None
+    if options.get("store") is not None:
+        import dbm
+        import puzzle_store as ps  # Only loaded when a store is given
+        try:
+            store = ps.PuzzleStore(options["store"], "r")
+        except dbm.error:  # Nothing has been stored yet
+            store = None
+
+    try:
+        solved = api.solve(text, engine=options["engine"], seed=seed,
+                           timeout=options["timeout"],
+                           fallback=options["fallback"], on_event=on_event,
+                           profiler=profiler, store=store)
+    finally:
+        if store is not None:
+            store.close()
+
+    # Out of time with the ga, so hand the puzzle to the exact engine
+    requeued = solved.status == "timeout" and options["engine"] != "exact"
+    if requeued:
+        time_used = solved.time
+        solved = api.solve(text, engine="exact", on_event=on_event,
+                           profiler=profiler)
+        solved.time += time_used
+
+    result = {"index": index}
+    result.update(solved.to_dict())
+    result["requeued"] = requeued
+    if on_event is not None:
+        result["events"] = events
+
+    if profiler is not None and options.get("top"):
+        print(f"Puzzle {index} hotspots:\n" +
+              profiler.summary(options["top"]), file=sys.stderr, flush=True)
+    return result
+
+
+def read_puzzles(lines):
+    """
+    A function that yields each puzzle line, skipping blank lines
+    and lines starting with #.
+    """
+    for line in lines:
+        text = line.strip()
+        if text and not text.startswith("#"):
+            yield text
+
+
+def parse_args(argv: list = None):
+    """
+    A function that returns the command line options.
+    """
+    parser = argparse.ArgumentParser(
+        description="Solve sudoku puzzles without the GUI, writing one " +
+                    "JSON line for each puzzle.")
+    parser.add_argument("file", nargs="?", default="-",
+                        help="file of puzzles, one to a line, " +
+                             "- for stdin (default)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(),
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("-e", "--engine", choices=["ga", "exact"],
+                        default="ga", help="solver engine (default: ga)")
+    parser.add_argument("-f", "--fallback", action="store_true",
+                        help="use the exact solver if the ga gives up")
+    parser.add_argument("-s", "--seed", type=int, default=None,
+                        help="random seed, offset by each puzzle number")
+    parser.add_argument("-t", "--timeout", type=float, default=None,
+                        help="seconds allowed for each puzzle")
+    parser.add_argument("--events", action="store_true",
+                        help="add the solver's progress events to " +
+                             "each result")
+    parser.add_argument("--profile", metavar="DIR", default=None,
+                        help="profile each puzzle with cProfile, writing " +
+                             "the stats to DIR")
+    parser.add_argument("--top", type=int, default=0,
+                        help="print the top N profiled functions of " +
+                             "each puzzle to stderr")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="add the peak memory of each phase to " +
+                             "each result")
+    parser.add_argument("--shared", action="store_true",
+                        help="read the file as fixed width records and " +
+                             "pass puzzles to the workers in shared memory")
+    parser.add_argument("--batch-size", type=int, default=4096,
+                        help="puzzles in each shared memory batch " +
+                             "(default: 4096)")
+    parser.add_argument("--store", metavar="PATH", default=None,
+                        help="answer puzzles solved before from the " +
+                             "puzzle store at PATH, adding new solutions")
+
+    return parser.parse_args(argv)
+
+
+def main(argv: list = None, out=None):
+    """
+    A function to run the batch solver with command line arguments,
+    writing the results to out, stdout by default.
+    Returns 0 if every puzzle was solved, otherwise 1.
+    """
+    args = parse_args(argv)
+    if out is None:
+        out = sys.stdout
+
+    options = {"engine": args.engine,
+               "fallback": args.fallback,
+               "seed": args.seed,
+               "timeout": args.timeout,
+               "events": args.events,
+               "profile": args.profile,
+               "top": args.top,
+               "trace_memory": args.trace_memory,
+               "store": args.store}
+
+    if args.shared:
+        return run_shared(args, options, out)
+
+    store = None
+    if args.store is not None:
+        import puzzle_store as ps  # Only loaded when a store is given
+        # Created before the workers read it, and only written here
+        store = ps.PuzzleStore(args.store)
+
+    if args.file == "-":
+        source = sys.stdin
+    else:
+        # Undecodable bytes become invalid puzzles rather than errors
+        source = open(args.file, encoding="utf-8", errors="replace")
+
+    all_solved = True
+    try:
+        jobs = ((index, text, options)
+                for index, text in enumerate(read_puzzles(source)))
+
+        if args.workers > 1:
+            pool = Pool(processes=args.workers)
+            results = pool.imap(solve_puzzle, jobs)
+        else:
+            pool = None
+            results = map(solve_puzzle, jobs)
+
+        try:
+            for result in results:
+                if not result.get("solved"):
+                    all_solved = False
+                elif store is not None:
+                    store.put(ps.string_grid(result["puzzle"]),
+                              ps.string_grid(result["solution"]))
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if store is not None:
+            store.close()
+
+    return 0 if all_solved else 1
+
+
+def run_shared(args, options: dict, out):
+    """
+    A function to solve a puzzle file in shared memory batches,
+    writing one JSON line for each puzzle.
+    Returns 0 if every puzzle was solved, otherwise 1.
+    """
+    # Needs numpy, so only loaded for this mode
+    import puzzle_corpus as pc
+    import shared_batch as sb
+
+    if args.file == "-":
+        raise SystemExit("--shared needs a puzzle file, not stdin")
+    if options.pop("events"):
+        raise SystemExit("--events can't be used with --shared")
+    if options.pop("store"):
+        raise SystemExit("--store can't be used with --shared")
+    profiling = [options.pop(name)
+                 for name in ("profile", "top", "trace_memory")]
+    if any(profiling):
+        raise SystemExit("Profiling can't be used with --shared")
+
+    all_solved = True
+    with pc.PuzzleCorpus(args.file) as corpus, \
+            sb.SharedBatchSolver(args.batch_size, args.workers,
+                                 **options) as solver:
+        # Bad records are reported as invalid with the rest of the chunk
+        for first, puzzles, valid in corpus.checked_chunks(args.batch_size):
+            solutions, status, times = solver.solve(puzzles, valid)
+
+            for index in range(puzzles.shape[0]):
+                solved = status[index] == sb.SOLVED
+                if not solved:
+                    all_solved = False
+
+                puzzle = pc.puzzle_string(puzzles[index])
+                if not valid[index]:
+                    puzzle = corpus.record_text(first + index)
+
+                result = {"index": first + index,
+                          "puzzle": puzzle,
+                          "status": sb.STATUS_NAMES[int(status[index])],
+                          "solved": bool(solved),
+                          "solution": None,
+                          "time": round(float(times[index]), 6)}
+                if solved:
+                    result["solution"] = pc.puzzle_string(solutions[index])
+                out.write(json.dumps(result) + "\n")
+            out.flush()
+
+    return 0 if all_solved else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
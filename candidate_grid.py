@@ -0,0 +1,227 @@
+from collections import deque
+
+
+ALL_DIGITS = 0b111111111  # Bits 0 - 8 set for digits 1 - 9
+BIT_COUNTS = [bin(mask).count("1") for mask in range(ALL_DIGITS + 1)]
+
+
+def build_units():
+    """
+    A function that returns the cell indices of each unit in the grid,
+    rows 0 - 8, then columns 9 - 17, then boxes 18 - 26.
+    """
+    units = []
+
+    for row_num in range(9):
+        units.append([row_num * 9 + col_num for col_num in range(9)])
+
+    for col_num in range(9):
+        units.append([row_num * 9 + col_num for row_num in range(9)])
+
+    for box_num in range(9):
+        top_row = box_num - (box_num % 3)
+        left_col = (box_num % 3) * 3
+        this_box = []
+        for row_num in range(top_row, top_row + 3):
+            for col_num in range(left_col, left_col + 3):
+                this_box.append(row_num * 9 + col_num)
+        units.append(this_box)
+
+    return units
+
+
+UNITS = build_units()
+
+# The units and the peers (other cells sharing a unit) of each cell
+CELL_UNITS = [[unit_num for unit_num in range(27) if cell in UNITS[unit_num]]
+              for cell in range(81)]
+PEERS = [sorted(set(peer for unit_num in CELL_UNITS[cell]
+                    for peer in UNITS[unit_num] if peer != cell))
+         for cell in range(81)]
+
+
+def digit_bit(digit: int):
+    """
+    A function that returns the candidate bit for a digit 1 - 9.
+    """
+    return 1 << (digit - 1)
+
+
+def bit_digits(mask: int):
+    """
+    A function that returns the digits set in a candidate mask
+    as an ascending list.
+    """
+    digits = []
+    for num in range(9):
+        if mask & (1 << num):
+            digits.append(num + 1)
+    return digits
+
+
+def single_digit(mask: int):
+    """
+    A function that returns the digit of a mask with a single bit set,
+    or 0 if the mask has none or several bits set.
+    """
+    if mask and not mask & (mask - 1):
+        return mask.bit_length()
+    return 0
+
+
+class CandidateGrid:
+    """
+    A class to hold the candidate digits of each cell as bitmasks.
+    Placing a digit queues the cell and propagation removes the digit
+    from its peers, placing any peer left with a single candidate.
+    Cells are indexed 0 - 80 across each row in turn.
+    The grid can be kept and loaded again with more digits placed,
+    only the new digits are propagated.
+    """
+
+    def __init__(self):
+        self.masks = [ALL_DIGITS] * 81
+        self.values = [0] * 81
+        self.unit_filled = [0] * 27  # Placed cells in each unit
+        self.queue = deque()  # Placed cells still to propagate to peers
+        self.contradiction = False
+
+    def __repr__(self):
+        return f"CandidateGrid(values={self.values})"
+
+    def copy(self):
+        """
+        A function that returns an independent copy of the candidates.
+        """
+        other = CandidateGrid()
+        other.masks = self.masks.copy()
+        other.values = self.values.copy()
+        other.unit_filled = self.unit_filled.copy()
+        other.queue = self.queue.copy()
+        other.contradiction = self.contradiction
+        return other
+
+    def load(self, rows: list):
+        """
+        A function to place the digits of a 9x9 grid, 0 for empty cells,
+        and propagate them. Returns False if the digits conflict.
+        """
+        for row_num in range(9):
+            for col_num in range(9):
+                digit = rows[row_num][col_num]
+                if digit > 0 and not self.place(row_num * 9 + col_num,
+                                                digit):
+                    return False
+
+        return self.propagate()
+
+    def agrees_with(self, rows: list):
+        """
+        A function that returns True if every placed digit is also
+        in the 9x9 grid, so loading the grid only adds digits.
+        """
+        for cell in range(81):
+            value = self.values[cell]
+            if value > 0 and rows[int(cell / 9)][cell % 9] != value:
+                return False
+        return True
+
+    def set_value(self, cell: int, digit: int):
+        """
+        A function to record a digit as placed in a cell
+        and queue the cell for propagation.
+        """
+        self.values[cell] = digit
+        for unit_num in CELL_UNITS[cell]:
+            self.unit_filled[unit_num] += 1
+        self.queue.append(cell)
+
+    def place(self, cell: int, digit: int):
+        """
+        A function to set a cell to a digit and queue it for propagation.
+        Returns False if the digit isn't a candidate for the cell.
+        """
+        if self.values[cell] > 0:
+            return self.values[cell] == digit
+
+        bit = digit_bit(digit)
+        if not self.masks[cell] & bit:
+            self.contradiction = True
+            return False
+
+        self.masks[cell] = bit
+        self.set_value(cell, digit)
+        return True
+
+    def eliminate(self, cell: int, bits: int):
+        """
+        A function to remove candidate bits from a cell, placing the cell
+        if a single candidate is left. Returns False if no candidates
+        are left for the cell.
+        """
+        mask = self.masks[cell]
+        if not mask & bits:
+            return True  # Nothing to remove
+
+        mask &= ~bits
+        self.masks[cell] = mask
+
+        if mask == 0:
+            self.contradiction = True
+            return False
+
+        if self.values[cell] == 0:
+            digit = single_digit(mask)
+            if digit:  # Naked single
+                self.set_value(cell, digit)
+
+        return True
+
+    def propagate(self):
+        """
+        A function to remove the digits of queued cells from their peers
+        until the queue is empty. Returns False if a contradiction is found.
+        """
+        if self.contradiction:
+            return False
+
+        while self.queue:
+            cell = self.queue.popleft()
+            bit = self.masks[cell]
+
+            for peer in PEERS[cell]:
+                if not self.eliminate(peer, bit):
+                    self.queue.clear()
+                    return False
+
+        return True
+
+    def is_solved(self):
+        """
+        A function that returns True if every cell has been placed.
+        """
+        return sum(self.unit_filled[:9]) == 81
+
+    def get_rows(self):
+        """
+        A function that returns the placed digits as a 9x9 list,
+        0 for cells not yet placed.
+        """
+        return [self.values[row_num * 9: row_num * 9 + 9]
+                for row_num in range(9)]
+
+    def get_cell_rows(self):
+        """
+        A function that returns the candidate digits of each cell as a
+        9x9 list of ascending digit lists, the format used for phase 1.
+        """
+        cell_rows = []
+
+        for row_num in range(9):
+            this_row = []
+            for col_num in range(9):
+                this_row.append(bit_digits(self.masks[row_num * 9 +
+                                                      col_num]))
+            cell_rows.append(this_row)
+
+        return cell_rows
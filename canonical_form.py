@@ -0,0 +1,227 @@
+from itertools import islice, permutations, product
+
+
+BEAM_WIDTH = 64  # Most tied orderings followed at each step
+
+
+class Transform:
+    """
+    A class to hold the change taking a grid to its canonical form.
+    The grid is transposed if needed, then row r of the canonical grid
+    is row row_order[r] with its cells taken from the columns in
+    col_order, and each digit d is relabelled to labels[d].
+    """
+
+    def __init__(self, transposed: bool, row_order: list, col_order: list,
+                 labels: list):
+        self.transposed = transposed
+        self.row_order = row_order
+        self.col_order = col_order
+        self.labels = labels  # Canonical digit of each digit 0 - 9
+
+    def __repr__(self):
+        return (f"Transform(transposed={self.transposed}, " +
+                f"row_order={self.row_order}, " +
+                f"col_order={self.col_order}, labels={self.labels})")
+
+    def apply(self, rows: list):
+        """
+        A function that returns a 9x9 grid in the canonical form.
+        """
+        if self.transposed:
+            rows = transpose(rows)
+
+        result = []
+        for row_num in self.row_order:
+            this_row = []
+            for col_num in self.col_order:
+                this_row.append(self.labels[rows[row_num][col_num]])
+            result.append(this_row)
+        return result
+
+    def undo(self, rows: list):
+        """
+        A function that returns a 9x9 grid in the canonical form,
+        such as its solution, in the form of the original grid.
+        """
+        digits = [0] * 10
+        for digit in range(10):
+            digits[self.labels[digit]] = digit
+
+        result = []
+        for _ in range(9):
+            result.append([0] * 9)
+        for row_index in range(9):
+            for col_index in range(9):
+                result[self.row_order[row_index]][self.col_order[col_index]] \
+                    = digits[rows[row_index][col_index]]
+
+        if self.transposed:
+            result = transpose(result)
+        return result
+
+
+def transpose(rows: list):
+    """
+    A function that returns the transpose of a 9x9 grid.
+    """
+    return [list(column) for column in zip(*rows)]
+
+
+def refine(stacks: list, given: list):
+    """
+    A function that orders the columns for the given cells of a new row,
+    putting given cells first within each block of tied columns and the
+    stacks with the most leading given cells first within each group of
+    tied stacks.
+    Stacks are a list of groups of tied stacks, each stack a list of
+    blocks of tied columns. Returns the refined stacks and the given
+    cell pattern of the row they produce.
+    """
+    new_stacks = []
+    pattern = []
+
+    for group in stacks:
+        keyed = []
+        for stack in group:
+            new_stack = []
+            bits = []
+            for block in stack:
+                ones = [col for col in block if given[col]]
+                zeros = [col for col in block if not given[col]]
+                for part in (ones, zeros):
+                    if part:
+                        new_stack.append(part)
+                bits += [1] * len(ones) + [0] * len(zeros)
+            keyed.append((bits, new_stack))
+
+        # Tied stacks with the same pattern stay tied
+        keyed.sort(key=lambda entry: entry[0], reverse=True)
+        last_bits = None
+        for bits, new_stack in keyed:
+            if bits == last_bits:
+                new_stacks[-1].append(new_stack)
+            else:
+                new_stacks.append([new_stack])
+            last_bits = bits
+            pattern += bits
+
+    return new_stacks, pattern
+
+
+def column_orders(stacks: list, limit: int):
+    """
+    A function that yields up to limit column orders allowed by the
+    ties left in the stacks.
+    """
+    choices = []
+    for group in stacks:
+        group_orders = []
+        for stack_order in permutations(group):
+            stack_choices = []
+            for stack in stack_order:
+                for block in stack:
+                    stack_choices.append(list(permutations(block)))
+            for blocks in product(*stack_choices):
+                order = []
+                for block in blocks:
+                    order += block
+                group_orders.append(order)
+                if len(group_orders) >= limit:
+                    break
+            if len(group_orders) >= limit:
+                break
+        choices.append(group_orders)
+
+    for orders in islice(product(*choices), limit):
+        col_order = []
+        for order in orders:
+            col_order += order
+        yield col_order
+
+
+def relabel(rows: list, row_order: list, col_order: list):
+    """
+    A function that returns the digits of the reordered grid, relabelled
+    in the order they first appear, along with the labels used.
+    """
+    labels = [0] * 10
+    next_label = 1
+    digits = []
+
+    for row_num in row_order:
+        for col_num in col_order:
+            digit = rows[row_num][col_num]
+            if digit > 0 and labels[digit] == 0:
+                labels[digit] = next_label
+                next_label += 1
+            digits.append(labels[digit])
+
+    # Digits not in the grid take the labels left in order
+    for digit in range(1, 10):
+        if labels[digit] == 0:
+            labels[digit] = next_label
+            next_label += 1
+
+    return digits, labels
+
+
+def canonical_form(rows: list, beam_width: int = BEAM_WIDTH):
+    """
+    A function that returns the canonical key of a 9x9 grid, 0 for empty
+    cells, and the Transform taking the grid to it.
+    Grids that are the same up to relabelling digits, transposing, and
+    reordering bands, stacks, or rows and columns within them share a
+    key. The rows are chosen one at a time, keeping every ordering tied
+    for the most given cells in the leading positions, then the
+    relabelled digits pick between the tied orderings. If more than
+    beam_width orderings tie only the first are followed, so a grid
+    with that many symmetries may have more than one key, but the
+    key always belongs to the grid.
+    """
+    start_stacks = [[[[0, 1, 2]], [[3, 4, 5]], [[6, 7, 8]]]]
+
+    # Each state is the grid, whether transposed, the rows chosen so far
+    # and the column ties left
+    states = [(rows, False, [], start_stacks),
+              (transpose(rows), True, [], start_stacks)]
+
+    for row_index in range(9):
+        best = None
+        next_states = []
+
+        for grid, transposed, row_order, stacks in states:
+            if row_index % 3 == 0:  # Any row of an unused band
+                used_bands = set(int(row_num / 3) for row_num in row_order)
+                options = [row_num for row_num in range(9)
+                           if int(row_num / 3) not in used_bands]
+            else:  # The next row of the same band
+                band = int(row_order[-1] / 3)
+                options = [row_num for row_num in range(band * 3, band * 3 + 3)
+                           if row_num not in row_order]
+
+            for row_num in options:
+                given = [digit > 0 for digit in grid[row_num]]
+                new_stacks, pattern = refine(stacks, given)
+
+                if best is None or pattern > best:
+                    best = pattern
+                    next_states = []
+                if pattern == best and len(next_states) < beam_width:
+                    next_states.append((grid, transposed,
+                                        row_order + [row_num], new_stacks))
+
+        states = next_states
+
+    best_digits = None
+    best_transform = None
+    for grid, transposed, row_order, stacks in states:
+        for col_order in column_orders(stacks, beam_width):
+            digits, labels = relabel(grid, row_order, col_order)
+            if best_digits is None or digits < best_digits:
+                best_digits = digits
+                best_transform = Transform(transposed, row_order,
+                                           col_order, labels)
+
+    key = "".join(str(digit) for digit in best_digits)
+    return key, best_transform
@@ -0,0 +1,465 @@
+"""
+Batch solving spread over several machines.
+
+A coordinator splits a puzzle corpus file into shards and hands them to
+workers that connect over TCP. Messages are JSON objects, one to a line.
+A worker asks for a shard, solves its puzzles with the solver core,
+streams each result back and sends heartbeats while it works. A shard is
+only written out once all of its results are in, and the shards of a
+worker that disconnects or stops sending heartbeats go back in the queue
+for another worker. A shard that fails MAX_TRIES times, or that the
+coordinator can't read, is written out with its missing puzzles marked
+invalid.
+
+    python cluster_solver.py coordinator puzzles.txt --port 9000
+    python cluster_solver.py worker --host 127.0.0.1 --port 9000
+"""
+
+from collections import deque
+import argparse
+import json
+import puzzle_corpus as pc
+import socket
+import socketserver
+import sudoku_api as api
+import sys
+import threading
+import time
+
+
+HEARTBEAT_INTERVAL = 1.0  # Seconds between worker heartbeats
+HEARTBEAT_TIMEOUT = 10.0  # Seconds without a message before a worker is lost
+WAIT_TIME = 0.5  # Seconds a worker waits when no shard is free yet
+MAX_TRIES = 3  # Times a shard is handed out before it is given up
+
+
+def send_message(connection, message: dict, lock: threading.Lock = None):
+    """
+    A function to send a message as a line of JSON.
+    """
+    data = (json.dumps(message) + "\n").encode()
+    if lock is None:
+        connection.sendall(data)
+    else:
+        with lock:
+            connection.sendall(data)
+
+
+class Coordinator:
+    """
+    A class to share out the shards of a puzzle corpus to TCP workers
+    and collect their results. The results of each shard are kept until
+    the shard is complete, then written to out as JSON lines, so a shard
+    solved twice after being reassigned is only written once.
+    """
+
+    def __init__(self, path: str, out, shard_size: int = 256,
+                 host: str = "127.0.0.1", port: int = 0,
+                 heartbeat_timeout: float = HEARTBEAT_TIMEOUT):
+        self.path = path
+        self.out = out
+        self.heartbeat_timeout = heartbeat_timeout
+
+        with pc.PuzzleCorpus(path) as corpus:
+            self.n_puzzles = len(corpus)
+            n_shards = max(1, -(-self.n_puzzles // shard_size))
+            self.shards = corpus.shard_offsets(n_shards)
+            record_size = corpus.record_size
+        self.record_size = record_size
+
+        self.shard_sizes = []  # Puzzles in each shard
+        for start, stop in self.shards:
+            self.shard_sizes.append(
+                min(self.n_puzzles, -(-stop // record_size)) -
+                int(start / record_size))
+
+        self.pending = deque(range(len(self.shards)))  # Shards to hand out
+        self.assigned = {}  # Shard to the worker connection solving it
+        self.results = {}  # Shard to the results received so far
+        self.completed = set()
+        self.tries = {}  # Shard to the times it has been handed out
+        self.reassigned = 0  # Shards handed out again after a failure
+        self.workers = {}  # Worker connection to when it was last heard
+        self.lock = threading.Lock()
+        self.finished = threading.Event()
+        if not self.n_puzzles:
+            self.finished.set()
+
+        handler = type("Handler", (WorkerHandler,), {"coordinator": self})
+        self.server = socketserver.ThreadingTCPServer((host, port), handler,
+                                                      bind_and_activate=False)
+        self.server.allow_reuse_address = True
+        self.server.daemon_threads = True
+        self.server.server_bind()
+        self.server.server_activate()
+        self.port = self.server.server_address[1]
+
+    def start(self):
+        """
+        A function to serve workers and watch their heartbeats
+        in background threads.
+        """
+        threading.Thread(target=self.server.serve_forever,
+                         daemon=True).start()
+        threading.Thread(target=self.watch_workers, daemon=True).start()
+
+    def wait(self, timeout: float = None):
+        """
+        A function that waits until every shard is complete.
+        Returns True if they all are.
+        """
+        return self.finished.wait(timeout)
+
+    def close(self):
+        """
+        A function to stop serving workers.
+        """
+        self.finished.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def read_shard(self, shard: int):
+        """
+        A function that returns the first puzzle number and the puzzles
+        of a shard as strings. Records that aren't digits are sent as
+        their text, for the worker to report as invalid.
+        """
+        start, stop = self.shards[shard]
+        puzzles = []
+        first = None
+        with pc.PuzzleCorpus(self.path) as corpus:
+            for chunk_first, digits, valid in corpus.checked_chunks(
+                    start_byte=start, stop_byte=stop):
+                if first is None:
+                    first = chunk_first
+                for index in range(digits.shape[0]):
+                    if valid[index]:
+                        puzzles.append(pc.puzzle_string(digits[index]))
+                    else:
+                        puzzles.append(
+                            corpus.record_text(chunk_first + index))
+        return first, puzzles
+
+    def next_shard(self, worker):
+        """
+        A function that assigns the next shard to a worker.
+        Returns the shard number, or None if no shard is free.
+        """
+        with self.lock:
+            if not self.pending:
+                return None
+            shard = self.pending.popleft()
+            self.assigned[shard] = worker
+            self.results[shard] = {}
+            self.tries[shard] = self.tries.get(shard, 0) + 1
+            return shard
+
+    def add_result(self, worker, shard: int, result: dict):
+        """
+        A function to keep a puzzle result from the worker
+        solving a shard.
+        """
+        with self.lock:
+            if self.assigned.get(shard) is worker:
+                self.results[shard][result["index"]] = result
+
+    def complete_shard(self, worker, shard: int):
+        """
+        A function to write the results of a shard once the worker
+        solving it has sent them all.
+        """
+        with self.lock:
+            if self.assigned.get(shard) is not worker:
+                return
+            del self.assigned[shard]
+            results = self.results.pop(shard)
+
+            if len(results) < self.shard_sizes[shard]:
+                # Results went missing, so solve the shard again
+                self.requeue(shard, results, False)
+                return
+
+            self.write_shard(shard, results)
+
+    def fail_shard(self, worker, shard: int, error: str):
+        """
+        A function to write out a shard the coordinator couldn't read
+        for the worker, every puzzle marked invalid.
+        """
+        with self.lock:
+            if self.assigned.get(shard) is not worker:
+                return
+            del self.assigned[shard]
+            del self.results[shard]
+            self.write_shard(shard, {}, error)
+
+    def requeue(self, shard: int, results: dict, first: bool):
+        """
+        A function to put a shard back in the queue, first in line if
+        first is True, or once it has been handed out MAX_TRIES times
+        to write it out with the results it has. Called with the lock
+        held.
+        """
+        self.reassigned += 1
+        if self.tries[shard] >= MAX_TRIES:
+            self.write_shard(shard, results, f"Shard {shard} failed " +
+                             f"{MAX_TRIES} times")
+        elif first:
+            self.pending.appendleft(shard)
+        else:
+            self.pending.append(shard)
+
+    def write_shard(self, shard: int, results: dict, error: str = None):
+        """
+        A function to write the results of a shard in puzzle order,
+        any puzzle without a result written as invalid with the error.
+        Called with the lock held.
+        """
+        first = int(self.shards[shard][0] / self.record_size)
+        for index in range(first, first + self.shard_sizes[shard]):
+            result = results.get(index)
+            if result is None:
+                result = {"index": index, "puzzle": None,
+                          "status": "invalid", "solved": False,
+                          "solution": None, "error": error}
+            self.out.write(json.dumps(result) + "\n")
+        self.out.flush()
+
+        self.completed.add(shard)
+        if len(self.completed) == len(self.shards):
+            self.finished.set()
+
+    def heard_from(self, worker):
+        """
+        A function to record that a worker is still alive.
+        """
+        with self.lock:
+            self.workers[worker] = time.time()
+
+    def lose_worker(self, worker):
+        """
+        A function to put the shards of a lost worker back in the queue.
+        """
+        with self.lock:
+            self.workers.pop(worker, None)
+            for shard, owner in list(self.assigned.items()):
+                if owner is worker:
+                    del self.assigned[shard]
+                    self.requeue(shard, self.results.pop(shard), True)
+
+    def watch_workers(self):
+        """
+        A function that disconnects workers whose heartbeats have
+        stopped, so their shards can be reassigned.
+        """
+        while not self.finished.wait(self.heartbeat_timeout / 4):
+            now = time.time()
+            with self.lock:
+                lost = [worker for worker, seen in self.workers.items()
+                        if now - seen > self.heartbeat_timeout]
+            for worker in lost:
+                self.lose_worker(worker)
+                try:
+                    worker.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+
+class WorkerHandler(socketserver.StreamRequestHandler):
+    """
+    A class to talk to a single worker connection for the coordinator.
+    """
+
+    coordinator = None  # Set on the handler class made for a coordinator
+
+    def handle(self):
+        coordinator = self.coordinator
+        worker = self.request
+        coordinator.heard_from(worker)
+
+        try:
+            for line in self.rfile:
+                message = json.loads(line)
+                coordinator.heard_from(worker)
+                kind = message.get("type")
+
+                if kind == "next":
+                    self.send_next()
+                elif kind == "result":
+                    coordinator.add_result(worker, message["shard"],
+                                           message["result"])
+                elif kind == "shard_done":
+                    coordinator.complete_shard(worker, message["shard"])
+        except (OSError, ValueError):
+            pass  # Connection lost or garbled, the shards are reassigned
+        finally:
+            coordinator.lose_worker(worker)
+
+    def send_next(self):
+        """
+        A function to send the worker its next shard, or tell it to
+        wait or stop.
+        """
+        coordinator = self.coordinator
+        if coordinator.finished.is_set():
+            send_message(self.request, {"type": "done"})
+            return
+
+        shard = coordinator.next_shard(self.request)
+        if shard is None:
+            send_message(self.request, {"type": "wait",
+                                        "seconds": WAIT_TIME})
+            return
+
+        try:
+            first, puzzles = coordinator.read_shard(shard)
+        except (OSError, ValueError) as error:
+            # The corpus file failed, not the worker, so give it another
+            coordinator.fail_shard(self.request, shard, str(error))
+            self.send_next()
+            return
+
+        send_message(self.request, {"type": "shard", "shard": shard,
+                                    "first": first, "puzzles": puzzles})
+
+
+def run_worker(host: str, port: int, engine: str = "ga",
+               timeout: float = None, seed: int = None,
+               heartbeat_interval: float = HEARTBEAT_INTERVAL):
+    """
+    A function to solve shards for a coordinator until it has no more.
+    Returns the number of puzzles solved by this worker.
+    """
+    connection = socket.create_connection((host, port))
+    reader = connection.makefile("r")
+    send_lock = threading.Lock()
+    stopped = threading.Event()
+    solved = 0
+
+    def heartbeat():
+        while not stopped.wait(heartbeat_interval):
+            try:
+                send_message(connection, {"type": "heartbeat"}, send_lock)
+            except OSError:
+                return
+
+    threading.Thread(target=heartbeat, daemon=True).start()
+
+    try:
+        solved = solve_shards(connection, reader, send_lock, engine,
+                              timeout, seed)
+    except OSError:
+        pass  # Coordinator has gone
+    finally:
+        stopped.set()
+        reader.close()
+        connection.close()
+
+    return solved
+
+
+def solve_shards(connection, reader, send_lock: threading.Lock, engine: str,
+                 timeout: float, seed: int):
+    """
+    A function that asks the coordinator for shards and streams back the
+    result of each puzzle until there are no more.
+    Returns the number of puzzles solved.
+    """
+    solved = 0
+
+    while True:
+        send_message(connection, {"type": "next"}, send_lock)
+        line = reader.readline()
+        if not line:
+            break  # Coordinator has gone
+        message = json.loads(line)
+
+        if message["type"] == "done":
+            break
+        if message["type"] == "wait":
+            time.sleep(message["seconds"])
+            continue
+
+        shard = message["shard"]
+        for offset, puzzle in enumerate(message["puzzles"]):
+            index = message["first"] + offset
+            result = api.solve(puzzle, engine=engine, timeout=timeout,
+                               seed=None if seed is None
+                               else seed + index).to_dict()
+            result["index"] = index
+            if result["solved"]:
+                solved += 1
+            send_message(connection, {"type": "result", "shard": shard,
+                                      "result": result}, send_lock)
+
+        send_message(connection, {"type": "shard_done",
+                                  "shard": shard}, send_lock)
+
+    return solved
+
+
+def main(argv: list = None):
+    """
+    A function to run a coordinator or a worker from the command line.
+    """
+    parser = argparse.ArgumentParser(
+        description="Solve a puzzle corpus across several machines.")
+    modes = parser.add_subparsers(dest="mode", required=True)
+
+    coordinator = modes.add_parser("coordinator",
+                                   help="share out a corpus file")
+    coordinator.add_argument("file", help="fixed width puzzle file")
+    coordinator.add_argument("-o", "--out", default="-",
+                             help="results file, - for stdout (default)")
+    coordinator.add_argument("--host", default="127.0.0.1",
+                             help="address to listen on " +
+                                  "(default: 127.0.0.1)")
+    coordinator.add_argument("-p", "--port", type=int, default=9000,
+                             help="port to listen on (default: 9000)")
+    coordinator.add_argument("-n", "--shard-size", type=int, default=256,
+                             help="puzzles in each shard (default: 256)")
+
+    worker = modes.add_parser("worker", help="solve shards")
+    worker.add_argument("--host", default="127.0.0.1",
+                        help="coordinator address (default: 127.0.0.1)")
+    worker.add_argument("-p", "--port", type=int, default=9000,
+                        help="coordinator port (default: 9000)")
+    worker.add_argument("-e", "--engine", choices=["ga", "exact"],
+                        default="ga", help="solver engine (default: ga)")
+    worker.add_argument("-t", "--timeout", type=float, default=None,
+                        help="seconds allowed for each puzzle")
+    worker.add_argument("-s", "--seed", type=int, default=None,
+                        help="random seed, offset by each puzzle number")
+
+    args = parser.parse_args(argv)
+
+    if args.mode == "worker":
+        run_worker(args.host, args.port, args.engine, args.timeout,
+                   args.seed)
+        return 0
+
+    out = sys.stdout
+    if args.out != "-":
+        out = open(args.out, "w")
+    try:
+        server = Coordinator(args.file, out, args.shard_size, args.host,
+                             args.port)
+        print(f"Coordinating {server.n_puzzles} puzzles in " +
+              f"{len(server.shards)} shards on port {server.port}",
+              file=sys.stderr, flush=True)
+        server.start()
+        try:
+            server.wait()
+        except KeyboardInterrupt:
+            return 1
+        finally:
+            server.close()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,342 @@
+from itertools import combinations
+import candidate_grid as cg
+import time
+
+
+def count_bits(mask: int):
+    """
+    A function that returns the number of bits set in a mask.
+    """
+    return bin(mask).count("1")
+
+
+def remove(candidates: cg.CandidateGrid, cell: int, bits: int):
+    """
+    A function to remove candidate bits from a cell.
+    Returns 1 if any candidates were removed, 0 otherwise.
+    """
+    if candidates.masks[cell] & bits:
+        candidates.eliminate(cell, bits)
+        return 1
+    return 0
+
+
+def digit_cells(candidates: cg.CandidateGrid, unit: list, bit: int):
+    """
+    A function that returns the cells of a unit with the candidate bit.
+    Placed cells are included as their digit may not have been
+    propagated to the rest of the unit yet.
+    """
+    cells = []
+    for cell in unit:
+        if candidates.masks[cell] & bit:
+            cells.append(cell)
+    return cells
+
+
+def placed_bits(candidates: cg.CandidateGrid, unit: list):
+    """
+    A function that returns the bits of the digits placed in a unit.
+    """
+    bits = 0
+    for cell in unit:
+        if candidates.values[cell] > 0:
+            bits |= candidates.masks[cell]
+    return bits
+
+
+def hidden_singles(candidates: cg.CandidateGrid):
+    """
+    A strategy to place a digit that has only one possible cell in a unit.
+    """
+    hits = 0
+
+    for unit in cg.UNITS:
+        placed = placed_bits(candidates, unit)
+
+        for num in range(9):
+            bit = 1 << num
+            if placed & bit:
+                continue
+
+            cells = digit_cells(candidates, unit, bit)
+            if not cells:  # Digit can't be placed in the unit
+                candidates.contradiction = True
+                return hits
+            if len(cells) == 1 and candidates.values[cells[0]] == 0:
+                if not candidates.place(cells[0], num + 1):
+                    return hits
+                hits += 1
+
+    return hits
+
+
+def naked_subsets(candidates: cg.CandidateGrid, size: int):
+    """
+    A strategy to find cells in a unit sharing exactly size candidates,
+    removing those candidates from the other cells in the unit.
+    """
+    hits = 0
+
+    for unit in cg.UNITS:
+        open_cells = []
+        for cell in unit:
+            if (candidates.values[cell] == 0 and
+                    count_bits(candidates.masks[cell]) <= size):
+                open_cells.append(cell)
+
+        for subset in combinations(open_cells, size):
+            bits = 0
+            for cell in subset:
+                bits |= candidates.masks[cell]
+            if count_bits(bits) != size:
+                continue
+
+            for cell in unit:
+                if cell not in subset and candidates.values[cell] == 0:
+                    hits += remove(candidates, cell, bits)
+            if candidates.contradiction:
+                return hits
+
+    return hits
+
+
+def hidden_subsets(candidates: cg.CandidateGrid, size: int):
+    """
+    A strategy to find size digits limited to the same size cells in a
+    unit, removing every other candidate from those cells.
+    """
+    hits = 0
+
+    for unit in cg.UNITS:
+        placed = placed_bits(candidates, unit)
+        digit_positions = []
+
+        for num in range(9):
+            bit = 1 << num
+            if not placed & bit:
+                cells = digit_cells(candidates, unit, bit)
+                if 0 < len(cells) <= size:
+                    digit_positions.append((bit, cells))
+
+        for subset in combinations(digit_positions, size):
+            bits = 0
+            cells = set()
+            for bit, positions in subset:
+                bits |= bit
+                cells.update(positions)
+            if len(cells) != size:
+                continue
+
+            for cell in cells:
+                hits += remove(candidates, cell, cg.ALL_DIGITS & ~bits)
+            if candidates.contradiction:
+                return hits
+
+    return hits
+
+
+def naked_pairs(candidates: cg.CandidateGrid):
+    """
+    A strategy to apply naked subsets of two cells.
+    """
+    return naked_subsets(candidates, 2)
+
+
+def naked_triples(candidates: cg.CandidateGrid):
+    """
+    A strategy to apply naked subsets of three cells.
+    """
+    return naked_subsets(candidates, 3)
+
+
+def hidden_pairs(candidates: cg.CandidateGrid):
+    """
+    A strategy to apply hidden subsets of two digits.
+    """
+    return hidden_subsets(candidates, 2)
+
+
+def hidden_triples(candidates: cg.CandidateGrid):
+    """
+    A strategy to apply hidden subsets of three digits.
+    """
+    return hidden_subsets(candidates, 3)
+
+
+def line_units(cell: int):
+    """
+    A function that returns the row and column units of a cell.
+    """
+    return cg.CELL_UNITS[cell][0], cg.CELL_UNITS[cell][1]
+
+
+def pointing_pairs(candidates: cg.CandidateGrid):
+    """
+    A strategy to find a digit limited to one row or column of a box,
+    removing it from the rest of that row or column.
+    """
+    hits = 0
+
+    for unit_num in range(18, 27):
+        box = cg.UNITS[unit_num]
+
+        for num in range(9):
+            bit = 1 << num
+            cells = digit_cells(candidates, box, bit)
+            if len(cells) < 2:
+                continue
+
+            for line in range(2):  # 0 for rows, 1 for columns
+                line_nums = set(line_units(cell)[line] for cell in cells)
+                if len(line_nums) != 1:
+                    continue
+
+                for cell in cg.UNITS[line_nums.pop()]:
+                    if cell not in box and candidates.values[cell] == 0:
+                        hits += remove(candidates, cell, bit)
+                if candidates.contradiction:
+                    return hits
+
+    return hits
+
+
+def box_line_reduction(candidates: cg.CandidateGrid):
+    """
+    A strategy to find a digit limited to one box within a row or column,
+    removing it from the rest of that box.
+    """
+    hits = 0
+
+    for unit_num in range(18):
+        line = cg.UNITS[unit_num]
+
+        for num in range(9):
+            bit = 1 << num
+            cells = digit_cells(candidates, line, bit)
+            if len(cells) < 2:
+                continue
+
+            box_nums = set(cg.CELL_UNITS[cell][2] for cell in cells)
+            if len(box_nums) != 1:
+                continue
+
+            for cell in cg.UNITS[box_nums.pop()]:
+                if cell not in line and candidates.values[cell] == 0:
+                    hits += remove(candidates, cell, bit)
+            if candidates.contradiction:
+                return hits
+
+    return hits
+
+
+def x_wing(candidates: cg.CandidateGrid):
+    """
+    A strategy to find a digit limited to the same two columns in two
+    rows, removing it from the rest of those columns, and the same with
+    rows and columns swapped.
+    """
+    hits = 0
+
+    for base in (0, 9):  # Rows as the base lines, then columns
+        cover = 9 - base  # The crossing lines
+
+        for num in range(9):
+            bit = 1 << num
+            line_positions = []
+
+            for unit_num in range(base, base + 9):
+                cells = digit_cells(candidates, cg.UNITS[unit_num], bit)
+                if len(cells) == 2:
+                    crossing = []
+                    for cell in cells:
+                        if base == 0:
+                            crossing.append(cover + cell % 9)
+                        else:
+                            crossing.append(cover + int(cell / 9))
+                    line_positions.append((unit_num, tuple(crossing)))
+
+            for first, second in combinations(line_positions, 2):
+                if first[1] != second[1]:
+                    continue
+
+                wing = cg.UNITS[first[0]] + cg.UNITS[second[0]]
+                for unit_num in first[1]:
+                    for cell in cg.UNITS[unit_num]:
+                        if cell not in wing and candidates.values[cell] == 0:
+                            hits += remove(candidates, cell, bit)
+                if candidates.contradiction:
+                    return hits
+
+    return hits
+
+
+STRATEGIES = [
+    ("hidden singles", hidden_singles),
+    ("naked pairs", naked_pairs),
+    ("hidden pairs", hidden_pairs),
+    ("pointing pairs", pointing_pairs),
+    ("box line reduction", box_line_reduction),
+    ("naked triples", naked_triples),
+    ("hidden triples", hidden_triples),
+    ("x wing", x_wing)
+]
+
+
+class DeductionPipeline:
+    """
+    A class to run deduction strategies on a candidate grid until none
+    of them can make progress. Strategies are tried in order, restarting
+    from the first after any hit so cheaper strategies run most often.
+    Hit counts and times are recorded for each strategy across runs.
+    """
+
+    def __init__(self, strategies: list = None):
+        if strategies is None:
+            strategies = STRATEGIES
+        self.strategies = []
+        self.strategies += strategies
+        self.hits = {}
+        self.times = {}
+
+        for name, _ in self.strategies:
+            self.hits[name] = 0
+            self.times[name] = 0.0
+
+    def run(self, candidates: cg.CandidateGrid):
+        """
+        A function to apply the strategies to the candidates until no
+        more progress is made. Returns False if a contradiction is found.
+        """
+        if not candidates.propagate():
+            return False
+
+        updating = True
+        while updating and not candidates.is_solved():
+            updating = False
+
+            for name, strategy in self.strategies:
+                start_time = time.perf_counter()
+                hits = strategy(candidates)
+                propagated = candidates.propagate()
+                self.times[name] += time.perf_counter() - start_time
+                self.hits[name] += hits
+
+                if not propagated:
+                    return False
+                if hits:
+                    updating = True
+                    break  # restart with the first strategy
+
+        return True
+
+    def report(self):
+        """
+        A function that returns the hit count and time of each strategy
+        as a string, one strategy per line.
+        """
+        result = ""
+        for name, _ in self.strategies:
+            result += (f"{name}: {self.hits[name]} hits in " +
+                       f"{self.times[name] * 1000:.2f} ms\n")
+        return result
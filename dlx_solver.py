@@ -0,0 +1,314 @@
+from itertools import islice
+import threading
+
+
+N_COLUMNS = 324  # 81 cells, then digits in each row, column and box
+SOLUTION_LIMIT = 100  # Most solutions found by a single search
+
+
+def constraint_columns(row_num: int, col_num: int, digit: int):
+    """
+    A function that returns the four exact cover columns, numbered from 1,
+    satisfied by placing a digit 1 - 9 in a cell.
+    """
+    box_num = (row_num - row_num % 3) + int(col_num / 3)
+    num = digit - 1
+
+    return [1 + row_num * 9 + col_num,
+            82 + row_num * 9 + num,
+            163 + col_num * 9 + num,
+            244 + box_num * 9 + num]
+
+
+class DancingLinks:
+    """
+    A class to hold the sudoku exact cover matrix as dancing links.
+    Each of the 729 matrix rows places a digit in a cell and covers four
+    of the 324 columns. The links are restored after every search so the
+    matrix is built once and reused for each puzzle. Given another
+    matrix, its links are copied rather than built again.
+    """
+
+    def __init__(self, source=None):
+        if source is not None:
+            self.copy_links(source)
+            return
+
+        self.left = []
+        self.right = []
+        self.up = []
+        self.down = []
+        self.column = []  # Column header of each node
+        self.row_id = []  # Matrix row of each node, row * 81 + col * 9 + num
+        self.sizes = [0] * (N_COLUMNS + 1)  # Nodes left in each column
+        self.row_nodes = []  # First node of each matrix row
+        self.lock = threading.Lock()  # One search at a time per matrix
+
+        # Root node 0 and the column headers 1 - 324 in a circular list
+        for node in range(N_COLUMNS + 1):
+            self.left.append(node - 1)
+            self.right.append(node + 1)
+            self.up.append(node)
+            self.down.append(node)
+            self.column.append(node)
+            self.row_id.append(-1)
+        self.left[0] = N_COLUMNS
+        self.right[N_COLUMNS] = 0
+
+        for row_num in range(9):
+            for col_num in range(9):
+                for digit in range(1, 10):
+                    self.add_row(row_num, col_num, digit)
+
+    def copy_links(self, source):
+        """
+        A function to take a copy of the links of another matrix,
+        between its searches. The columns and rows of the nodes never
+        change so they are shared.
+        """
+        with source.lock:
+            self.left = list(source.left)
+            self.right = list(source.right)
+            self.up = list(source.up)
+            self.down = list(source.down)
+            self.sizes = list(source.sizes)
+        self.column = source.column
+        self.row_id = source.row_id
+        self.row_nodes = source.row_nodes
+        self.lock = threading.Lock()
+
+    def add_row(self, row_num: int, col_num: int, digit: int):
+        """
+        A function to add the matrix row placing a digit in a cell.
+        """
+        first = len(self.left)
+        row_id = row_num * 81 + col_num * 9 + digit - 1
+        self.row_nodes.append(first)
+
+        for col in constraint_columns(row_num, col_num, digit):
+            node = len(self.left)
+
+            # Link into the bottom of the column
+            self.column.append(col)
+            self.row_id.append(row_id)
+            self.up.append(self.up[col])
+            self.down.append(col)
+            self.down[self.up[col]] = node
+            self.up[col] = node
+            self.sizes[col] += 1
+
+            # Link into the row, closing the circle back to the first node
+            self.left.append(node - 1)
+            self.right.append(first)
+            if node > first:
+                self.right[node - 1] = node
+        self.left[first] = len(self.left) - 1
+
+    def cover(self, col: int):
+        """
+        A function to remove a column and the rows that use it.
+        """
+        left = self.left
+        right = self.right
+        up = self.up
+        down = self.down
+
+        right[left[col]] = right[col]
+        left[right[col]] = left[col]
+
+        node = down[col]
+        while node != col:
+            other = right[node]
+            while other != node:
+                down[up[other]] = down[other]
+                up[down[other]] = up[other]
+                self.sizes[self.column[other]] -= 1
+                other = right[other]
+            node = down[node]
+
+    def uncover(self, col: int):
+        """
+        A function to restore a column removed by cover.
+        """
+        left = self.left
+        right = self.right
+        up = self.up
+        down = self.down
+
+        node = up[col]
+        while node != col:
+            other = left[node]
+            while other != node:
+                self.sizes[self.column[other]] += 1
+                down[up[other]] = other
+                up[down[other]] = other
+                other = left[other]
+            node = up[node]
+
+        right[left[col]] = col
+        left[right[col]] = col
+
+    def select(self, node: int):
+        """
+        A function to cover the columns of a matrix row other than the
+        column of the given node.
+        """
+        other = self.right[node]
+        while other != node:
+            self.cover(self.column[other])
+            other = self.right[other]
+
+    def deselect(self, node: int):
+        """
+        A function to restore the columns covered by select.
+        """
+        other = self.left[node]
+        while other != node:
+            self.uncover(self.column[other])
+            other = self.left[other]
+
+    def search(self, chosen: list):
+        """
+        A function that yields the matrix rows of each exact cover of the
+        remaining columns, added to the rows already chosen.
+        """
+        if self.right[0] == 0:  # Every column covered
+            yield list(chosen)
+            return
+
+        # Branch on the column with the fewest rows
+        best = self.right[0]
+        col = self.right[best]
+        while col != 0:
+            if self.sizes[col] < self.sizes[best]:
+                best = col
+            col = self.right[col]
+
+        if self.sizes[best] == 0:
+            return
+
+        self.cover(best)
+        try:
+            node = self.down[best]
+            while node != best:
+                chosen.append(self.row_id[node])
+                self.select(node)
+                try:
+                    yield from self.search(chosen)
+                finally:
+                    self.deselect(node)
+                    chosen.pop()
+                node = self.down[node]
+        finally:
+            self.uncover(best)
+
+    def grid_solutions(self, rows: list):
+        """
+        A function that yields each solution of a 9x9 grid, 0 for empty
+        cells, as a 9x9 list as soon as it is found. Yields nothing if the
+        clues conflict. The links are restored once the generator ends
+        or is closed, and the caller must keep other searches off the
+        matrix until then.
+        """
+        given = []  # First node of each clue row
+        covered = set()
+
+        try:
+            for row_num in range(9):
+                for col_num in range(9):
+                    digit = rows[row_num][col_num]
+                    if digit == 0:
+                        continue
+
+                    columns = constraint_columns(row_num, col_num, digit)
+                    if covered.intersection(columns):  # Clues conflict
+                        return
+                    covered.update(columns)
+
+                    node = self.row_nodes[row_num * 81 + col_num * 9 +
+                                          digit - 1]
+                    self.cover(self.column[node])
+                    self.select(node)
+                    given.append(node)
+
+            search = self.search([])
+            try:
+                for chosen in search:
+                    solution = []
+                    for row in rows:
+                        solution.append(list(row))
+                    for row_id in chosen:
+                        solution[int(row_id / 81)][
+                            int(row_id / 9) % 9] = row_id % 9 + 1
+                    yield solution
+            finally:
+                search.close()  # Restore the links of the search
+
+        finally:
+            # Restore the clue columns in reverse order
+            for node in reversed(given):
+                self.deselect(node)
+                self.uncover(self.column[node])
+
+    def find_solutions(self, rows: list, limit: int = SOLUTION_LIMIT):
+        """
+        A function that returns up to limit solutions of a 9x9 grid, 0 for
+        empty cells, each as a 9x9 list. Returns an empty list if the clues
+        conflict. The matrix is locked while searching.
+        """
+        with self.lock:
+            search = self.grid_solutions(rows)
+            try:
+                return list(islice(search, limit))
+            finally:
+                search.close()
+
+    def solutions(self, rows: list, limit: int = None):
+        """
+        A function that yields each solution of a 9x9 grid as a 9x9 list
+        as soon as it is found, up to limit if not None. Yields nothing if
+        the clues conflict. The search runs on its own copy of the matrix,
+        so it can be left part way through without holding this one.
+        """
+        yield from islice(DancingLinks(self).grid_solutions(rows), limit)
+
+    def count_solutions(self, rows: list, limit: int = 2):
+        """
+        A function that counts the solutions of a 9x9 grid, stopping
+        once the limit is reached.
+        """
+        return len(self.find_solutions(rows, limit))
+
+
+links = None  # The matrix shared by every search in this process
+links_lock = threading.Lock()
+
+
+def get_links():
+    """
+    A function that returns the process wide matrix, building it
+    on first use.
+    """
+    global links
+
+    with links_lock:
+        if links is None:
+            links = DancingLinks()
+
+    return links
+
+
+def solutions(rows: list, limit: int = None):
+    """
+    A function that yields each solution of a 9x9 grid as it is found,
+    up to limit if not None, from a copy of the process wide matrix.
+    """
+    return get_links().solutions(rows, limit)
+
+
+def count_solutions(rows: list, limit: int = 2):
+    """
+    A function that counts the solutions of a 9x9 grid up to a limit
+    using the process wide matrix.
+    """
+    return get_links().count_solutions(rows, limit)
@@ -0,0 +1,78 @@
+from typing import Callable
+import candidate_grid as cg
+import deduction as dd
+
+
+class ExactSolver:
+    """
+    A class to solve a grid exactly with a depth first search.
+    Each step branches on the empty cell with the fewest candidates
+    and propagates singles before going deeper, so a solution is
+    always found if one exists.
+    """
+
+    def __init__(self, is_running: Callable = None):
+        self.is_running = is_running  # Returns False when a stop is needed
+        self.nodes = 0  # Counts the search steps taken
+
+    def solve(self, rows: list):
+        """
+        A function to solve a 9x9 grid, 0 for empty cells.
+        Returns the solved grid as a 9x9 list, or None if the grid
+        has no solution or the search was stopped.
+        """
+        self.nodes = 0
+        candidates = cg.CandidateGrid()
+        if not candidates.load(rows) or not self.fill_singles(candidates):
+            return None
+
+        result = self.search(candidates)
+        if result is None:
+            return None
+        return result.get_rows()
+
+    def fill_singles(self, candidates: cg.CandidateGrid):
+        """
+        A function to place hidden singles until none are left.
+        Naked singles are placed by the candidate grid itself.
+        Returns False if a contradiction is found.
+        """
+        while dd.hidden_singles(candidates):
+            if not candidates.propagate():
+                return False
+
+        return not candidates.contradiction
+
+    def search(self, candidates: cg.CandidateGrid):
+        """
+        A function to search for a solution from the candidates.
+        Returns the solved candidate grid or None.
+        """
+        self.nodes += 1
+        if self.is_running is not None and not self.is_running():
+            return None
+
+        # Find the empty cell with the fewest candidates
+        best_cell = -1
+        best_count = 10
+        for cell in range(81):
+            if candidates.values[cell] == 0:
+                count = cg.BIT_COUNTS[candidates.masks[cell]]
+                if count < best_count:
+                    best_cell = cell
+                    best_count = count
+                    if count == 2:
+                        break  # Can't do better than 2
+
+        if best_cell == -1:  # Every cell has been placed
+            return candidates
+
+        for digit in cg.bit_digits(candidates.masks[best_cell]):
+            branch = candidates.copy()
+            if (branch.place(best_cell, digit) and branch.propagate() and
+                    self.fill_singles(branch)):
+                result = self.search(branch)
+                if result is not None:
+                    return result
+
+        return None
@@ -50,11 +50,15 @@ class SolutionPoint:
         self.fitness = self.f(self.parameters)
         self.generation_id = generation_id
 
-    def create(self, objects: list, generation_id: int) -> object:
+    def create(self, objects: list, generation_id: int,
+               rng: random.Random = None) -> object:
         """
         A function to create a new point, combining this point
-        with one or more other points.
+        with one or more other points. The new values are drawn from
+        rng, or the random module if not given.
         """
+        if rng is None:
+            rng = random
 
         # Must supply at least one other parent.
         if len(objects) == 0:
@@ -86,9 +90,9 @@ class SolutionPoint:
 
             # Generate the new value within the limits.
             if isinstance(min_value, int) and isinstance(max_value, int):
-                value = random.randint(min_value, max_value)
+                value = rng.randint(min_value, max_value)
             else:
-                value = random.uniform(min_value, max_value)
+                value = rng.uniform(min_value, max_value)
 
             # Append this value.
             child_parameters.append(value)
@@ -110,7 +114,8 @@ class GaSolver:
                  deletion: float = 0.4,  # The deletion fraction for GA.
                  mutation: float = 0.1,  # The mutation fraction for GA.
                  n_mutations: int = 1,  # The number of parameters to mutate.
-                 enable_history: bool = False) -> None:
+                 enable_history: bool = False,
+                 rng: random.Random = None) -> None:  # None => random module
         self.population = []
         self.f = f
         self.limits = []
@@ -122,6 +127,9 @@ class GaSolver:
         self.n_mutations = n_mutations
         self.enable_history = enable_history
         self.history = []
+        self.rng = rng
+        if rng is None:
+            self.rng = random
 
     def __generate_parameter(self, limit):
         """
@@ -129,9 +137,9 @@ class GaSolver:
         within the limits provided.
         """
         if limit[2] == int:
-            value = random.randint(limit[0], limit[1])
+            value = self.rng.randint(limit[0], limit[1])
         else:
-            value = random.uniform(limit[0], limit[1])
+            value = self.rng.uniform(limit[0], limit[1])
         return value
 
     def __generate_parameters(self) -> list:
@@ -198,7 +206,7 @@ class GaSolver:
         # Create the number of new points requested.
         for i in range(n_points):
             # Use any points, selected at random.
-            random.shuffle(all_indices)
+            self.rng.shuffle(all_indices)
 
             # Collect the parent points.
             points = []
@@ -207,7 +215,8 @@ class GaSolver:
                 points.append(self.population[point_index])
 
             # Create the new point.
-            new_point = points[0].create(points[1:], generation_id)
+            new_point = points[0].create(points[1:], generation_id,
+                                         self.rng)
             self.population.append(new_point)
 
         return n_points
@@ -228,7 +237,7 @@ class GaSolver:
         n_mutate = int(self.mutation * len(indices) + 0.5)
 
         # Use indices to select points to mutate.
-        random.shuffle(indices)
+        self.rng.shuffle(indices)
 
         # Mutate the points.
         for i in range(n_mutate):
@@ -250,7 +259,7 @@ class GaSolver:
 
             # Create a shuffled list of parameter indices.
             parameter_indices = list(range(n_parameters))
-            random.shuffle(parameter_indices)
+            self.rng.shuffle(parameter_indices)
 
             # Mutate the parameters.
             for j in range(self.n_mutations):
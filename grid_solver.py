@@ -1,210 +1,583 @@
+from concurrent.futures import (FIRST_COMPLETED, ProcessPoolExecutor,
+                                ThreadPoolExecutor, as_completed, wait)
 from typing import Callable
+import candidate_grid as cg
+import copy
+import deduction as dd
+import exact_solver as ex
 import ga_solver as ga
+import join_engine as je
+import multiprocessing
+import phase_pipeline as pp
+import phase_scheduler as ps
+import random
+import row_cache as rc
+import solver_events as ev
 import sudoku_grid as sg
+import threading
 import time
 
+try:
+    import row_index as ri
+except ImportError:  # numpy not installed, phase 1 uses run_search
+    ri = None
+
+
+race_stop = None  # Stop event shared with the racing worker processes
+
+# GridSolver settings passed on to the solver of each racing attempt
+RACER_SETTINGS = ("deduction", "enumerate_limit", "join_limit",
+                  "use_row_index", "use_row_cache", "streaming",
+                  "buffer_size", "stream_limit", "pipelined",
+                  "max_workers")
+
+
+def init_racer(stop):
+    """
+    A function to store the shared stop event in a racing worker process.
+    """
+    global race_stop
+    race_stop = stop
+
+
+def run_racer(current_solution: list, seed: int, settings: dict):
+    """
+    A function to run a single attempt in a racing worker process,
+    with the settings of the racing solver. Returns whether the grid
+    was solvable and solved along with the current solution after
+    the attempt.
+    """
+    ga.GaSolver.set_seed(seed)
+    grid = sg.SudokuGrid()
+    grid.user_rows = current_solution
+    solver = GridSolver(grid, None)
+    for name, value in settings.items():
+        setattr(solver, name, value)
+    solver.init_solution()
+
+    # Stop the attempt when another racer wins or the user stops
+    watcher = threading.Thread(target=watch_race, args=(solver,))
+    watcher.daemon = True
+    watcher.start()
+
+    solvable = solver.setup_phase_1()
+    if solvable and not solver.solved:
+        can_p2, can_p3 = solver.run_phases()
+        if not solver.solved:
+            solver.update_solution(can_p2, can_p3)
+
+    return solvable, solver.solved, grid.current_solution
+
+
+def watch_race(solver):
+    """
+    A function to stop a racing solver once the shared stop event is set.
+    """
+    race_stop.wait()
+    solver.thread_running = False
+
 
 class GridSolver():
     """
     A class to handle the solve operation for the grid.
     Requires the genetic algorithm class and a passed grid object.
+    Progress is sent as events to self.events, and the output function,
+    if given, is subscribed to them as text.
     """
 
-    def __init__(self, grid: sg.SudokuGrid, output: Callable):
+    def __init__(self, grid: sg.SudokuGrid, output: Callable,
+                 racers: int = 1, engine: str = "ga",
+                 fallback: bool = False):
         self.grid = grid
         self.solved = False
         self.thread_running = True  # Changed to False when a stop is needed
         self.output = output  # Output function from GUI to allow feedback
+        self.events = ev.EventStream()  # Progress events of each run
+        if output is not None:
+            self.events.subscribe(ev.TextOutput(output))
+        self.rows_fixed = 0  # Rows fixed by the last check_boxes
+        self.cells_fixed = 0  # Cells fixed by the last check_rows
+        self.candidates = None  # Candidates kept between attempts
+        self.cells_placed = 0  # Cells placed by the last setup_phase_1
+        self.racers = racers  # Attempts raced in parallel processes per round
+        self.deduction = dd.DeductionPipeline()  # None to skip deductions
+        self.engine = engine  # "ga" for the genetic algorithm or "exact"
+        self.fallback = fallback  # Use the exact solver if the ga gives up
+        self.enumerate_limit = 50000  # Largest search space to enumerate
+        self.join_limit = 2000000  # Most mask tests for a phase 2 or 3 join
+        self.use_row_index = ri is not None  # Phase 1 from the row table
+        self.use_row_cache = True  # Share phase 1 rows across puzzles
+        self.store = None  # PuzzleStore of solved puzzles, None for none
+        self.attempts = 0  # Attempts made by the last run
+        self.phase_times = {}  # Seconds spent in each part of the last run
+        self.evaluations = {}  # Fitness evaluations made in each phase
+        self.deductions = {}  # Hits and seconds of each deduction strategy
+        self.profiler = None  # RunProfiler for each run, None for none
+        self.cpu_times = {}  # CPU seconds in each phase, when profiled
+        self.peak_memory = {}  # Peak bytes in each phase, when traced
+        self.stats_lock = threading.Lock()
+        self.streaming = False  # Run the phases as a streaming pipeline
+        self.buffer_size = 64  # Most rows pulled from a phase 1 source at once
+        self.stream_limit = 200000  # Most candidates the streaming keeps
+        self.pipelined = False  # Start each phase search once it is ready
+        self.max_workers = 4  # Worker threads for the pipelined searches
+        self.rng = random  # Random numbers for the ga, or a random.Random
 
     def run(self):
+        """
+        A function that handles solving the grid, answering from the
+        puzzle store when the puzzle has been solved before.
+        The run is profiled when a profiler is set.
+        """
+        self.attempts = 0
+        self.phase_times = {}
+        self.evaluations = {}
+        self.deductions = {}
+        self.cpu_times = {}
+        self.peak_memory = {}
+
+        if self.profiler is None:
+            self.run_stored()
+            return
+
+        self.profiler.start(self)
+        try:
+            self.run_stored()
+        finally:
+            self.profiler.stop()
+
+    def run_stored(self):
+        """
+        A function that answers from the puzzle store if it can,
+        otherwise runs the solver and stores the solution.
+        """
+        if self.store is not None:
+            start_time = time.time()
+            solution = self.store.get(self.grid.user_rows)
+
+            if solution is not None:
+                self.grid.current_solution.clear()
+                self.grid.current_solution = solution
+                self.solved = True
+                self.events.emit(ev.SOLVED, source="store", count=0,
+                                 elapsed=time.time() - start_time)
+                return
+
+        self.run_solver()
+
+        if self.store is not None and self.solved:
+            self.store.put(self.grid.user_rows, self.grid.current_solution)
+
+    def run_solver(self):
         """
         A function that handles running the genetic algorithm on the grid
         """
+        if self.engine == "exact":
+            self.solved = False
+            self.run_exact(time.time())
+            return
+
+        if self.racers > 1:
+            self.run_racing()
+            return
+
         running = True  # Becomes False when the ga should stop
         running_attempts = 0  # Counts the process repetitions
         self.solved = False  # Becomes True when the solution is found
         start_time = time.time()
 
         # Inititialise the current solution state from user entry
-        self.grid.current_solution.clear()
-        for entry in self.grid.user_rows:
-            this_row = []
-            for cell in entry:
-                this_row.append(cell)
-            self.grid.current_solution.append(this_row)
+        self.init_solution()
 
         while running:
+            setup_start = self.start_phase("setup")
             solvable = self.setup_phase_1()
-            can_p2 = False
-            can_p3 = False
+            self.end_phase("setup", setup_start, solvable)
 
             if solvable:
                 running_attempts += 1
-                self.output(f"Attempt {running_attempts}:\n")
-
-                # Phase 1, find possible rows if not already solved in setup
-                if self.thread_running and not self.solved:
-                    self.output("        Phase 1 ")
-                    can_p2 = self.run_phase_1()
-
-                # Phase 2, find possible box rows
-                if self.thread_running and not self.solved:
-                    if can_p2:
-                        self.output(" Ok\n        Phase 2 ")
-                        can_p3 = self.run_phase_2()
-                    else:
-                        self.output(" X")
-
-                # Phase 3, try to solve the grid
-                if self.thread_running:
-                    if can_p3:
-                        self.output(" Ok\n        Phase 3 ")
-                        self.solved = self.run_phase_3()
-
-                        if self.thread_running:
-                            if self.solved:
-                                self.output(" Ok")
-                            else:
-                                self.output(" X")
-                    else:
-                        if can_p2:
-                            self.output(" X")
-
-                if self.thread_running:
-                    self.output("\n")
-
-                    # Solved condition
-                    if self.solved:
-                        running = False
-                        message = ("Valid solution found after " +
-                                   f"{running_attempts} attempt")
-
-                        if running_attempts > 1:
-                            message += "s"
-
-                        end_time = time.time()
-                        time_dif = end_time - start_time
-                        message += ("!\nSolver ran for " +
-                                    f"{self.convert_time(time_dif)}.\n\n")
-                        self.output(message)
-                    else:
-                        updated = False
-
-                        # Update the solution depending on phases complete
-                        if can_p3:  # Phase 2 completed ok
-                            self.check_boxes()
-                            updated = self.check_rows()
-                        elif can_p2:  # Only phase 1 completed ok
-                            updated = self.check_rows()
-
-                        # Run max 5 attempts unless still updating
-                        if updated:
-                            self.output
-                            end_time = time.time()
-                            time_dif = end_time - start_time
-                            message = ("Found part of the solution, " +
-                                       "starting new attempt.\n" +
-                                       "Current time elapsed: " +
-                                       f"{self.convert_time(time_dif)}.\n\n")
-                            self.output(message)
-                        elif running_attempts >= 5:
-                            running = False
-                            end_time = time.time()
-                            time_dif = end_time - start_time
-                            message = ("Unable to find the solution after " +
-                                       f"{running_attempts} attempts.\n" +
-                                       "Solver ran for " +
-                                       f"{self.convert_time(time_dif)}.\n\n")
-                            self.output(message)
-                        else:
-                            end_time = time.time()
-                            time_dif = end_time - start_time
-                            message = ("Didn't find anything this try, " +
-                                       "starting new attempt.\n" +
-                                       "Current time elapsed: " +
-                                       f"{self.convert_time(time_dif)}.\n\n")
-                            self.output(message)
-                else:  # Thread is stopping
+                self.attempts = running_attempts
+                self.events.emit(ev.CELLS_FIXED, source="setup",
+                                 cells=self.cells_placed)
+                self.events.emit(ev.ATTEMPT_START, attempt=running_attempts,
+                                 unit="attempt", racers=1)
+                can_p2, can_p3 = self.run_phases()
+
+                if not self.thread_running:  # Thread is stopping
+                    running = False
+                    outcome = "stopped"
+                elif self.solved:
                     running = False
-                    self.output("\nStopped solving grid.\n\n")
+                    outcome = "solved"
+                elif self.update_solution(can_p2, can_p3):
+                    outcome = "progress"
+                    self.events.emit(ev.CELLS_FIXED, source="update",
+                                     cells=self.cells_fixed)
+                elif running_attempts >= 5:  # Max 5 attempts unless updating
+                    running = False
+                    outcome = "failed"
+                else:
+                    outcome = "retry"
+
+                time_dif = time.time() - start_time
+                self.events.emit(ev.ATTEMPT_END, attempt=running_attempts,
+                                 unit="attempt", outcome=outcome,
+                                 elapsed=time_dif)
+
+                if outcome == "stopped":
+                    self.events.emit(ev.STOPPED, elapsed=time_dif)
+                elif outcome == "solved":
+                    self.events.emit(ev.SOLVED, source="attempt",
+                                     count=running_attempts,
+                                     elapsed=time_dif)
+                elif outcome == "failed":
+                    self.events.emit(ev.FAILED, reason="attempt",
+                                     count=running_attempts,
+                                     fallback=self.fallback,
+                                     elapsed=time_dif)
+                    if self.fallback:
+                        self.run_exact(start_time)
 
             else:
                 running = False
-                end_time = time.time()
-                message = ("Unable to find the solution.\n" +
-                           "Got stuck due to conflicts in cell values.\n" +
-                           "Check that grid entry is correct.\n" +
-                           "Click 'START' when ready to try again.\n" +
-                           "Solver ran for " +
-                           f"{self.convert_time(end_time - start_time)}.\n\n")
-                self.output(message)
+                self.events.emit(ev.FAILED, reason="conflict", count=0,
+                                 fallback=False,
+                                 elapsed=time.time() - start_time)
+
+    def run_racing(self):
+        """
+        A function that races several attempts with different seeds in
+        separate processes. The first attempt to solve the grid stops the
+        others, otherwise the cells fixed by each attempt are merged into
+        the current solution before the next round.
+        """
+        running = True  # Becomes False when the racing should stop
+        running_rounds = 0  # Counts the rounds of racing attempts
+        self.solved = False  # Becomes True when the solution is found
+        start_time = time.time()
+        stop = multiprocessing.Event()  # Set to stop the racing attempts
+
+        self.init_solution()
+        settings = self.racer_settings()
+
+        with ProcessPoolExecutor(max_workers=self.racers,
+                                 initializer=init_racer,
+                                 initargs=(stop,)) as pool:
+            while running:
+                running_rounds += 1
+                self.attempts = running_rounds * self.racers
+                self.events.emit(ev.ATTEMPT_START, attempt=running_rounds,
+                                 unit="round", racers=self.racers)
+
+                # Start each racer from the same solution with its own seed
+                racers = []
+                for _ in range(self.racers):
+                    racers.append(pool.submit(run_racer,
+                                              self.grid.current_solution,
+                                              self.rng.randrange(1 << 30),
+                                              settings))
+
+                solvable = False
+                solutions = []
+                pending = set(racers)
+
+                while pending and not self.solved:
+                    done, pending = wait(pending, timeout=0.1,
+                                         return_when=FIRST_COMPLETED)
+                    if not self.thread_running:
+                        stop.set()  # Pass the user stop to the racers
+
+                    for racer in done:
+                        racer_solvable, racer_solved, solution = \
+                            racer.result()
+                        self.events.emit(ev.SEARCH_DONE, phase=None,
+                                         method="race",
+                                         results=int(racer_solved),
+                                         evaluations=0)
+
+                        if racer_solved and not self.solved:
+                            self.solved = True
+                            stop.set()  # Winner found, stop the rest
+                            self.grid.current_solution.clear()
+                            self.grid.current_solution = solution
+                        elif racer_solvable:
+                            solvable = True
+                            solutions.append(solution)
+
+                if not self.thread_running:
+                    running = False
+                    outcome = "stopped"
+                elif self.solved:
+                    running = False
+                    outcome = "solved"
+                elif not solvable:
+                    running = False
+                    outcome = "conflict"
+                elif self.merge_solutions(solutions):
+                    outcome = "progress"
+                elif running_rounds >= 5:
+                    running = False
+                    outcome = "failed"
+                else:
+                    outcome = "retry"
+
+                time_dif = time.time() - start_time
+                self.events.emit(ev.ATTEMPT_END, attempt=running_rounds,
+                                 unit="round",
+                                 outcome="failed" if outcome == "conflict"
+                                 else outcome, elapsed=time_dif)
+
+                if outcome == "stopped":
+                    self.events.emit(ev.STOPPED, elapsed=time_dif)
+                elif outcome == "solved":
+                    self.events.emit(ev.SOLVED, source="round",
+                                     count=running_rounds, elapsed=time_dif)
+                elif outcome == "conflict":
+                    self.events.emit(ev.FAILED, reason="conflict", count=0,
+                                     fallback=False, elapsed=time_dif)
+                elif outcome == "failed":
+                    self.events.emit(ev.FAILED, reason="round",
+                                     count=running_rounds,
+                                     fallback=self.fallback,
+                                     elapsed=time_dif)
+                    if self.fallback:
+                        self.run_exact(start_time)
+
+            stop.set()  # Release any racers still waiting on the event
+
+    def racer_settings(self):
+        """
+        A function that returns the settings each racing attempt
+        runs with, by name.
+        """
+        settings = {}
+        for name in RACER_SETTINGS:
+            settings[name] = getattr(self, name)
+        return settings
+
+    def run_exact(self, start_time: float):
+        """
+        A function that handles running the exact solver on the grid,
+        starting again from the user entry.
+        """
+        self.init_solution()
+        self.events.emit(ev.PHASE_START, phase="exact")
+
+        exact_start = time.time()
+        solver = ex.ExactSolver(lambda: self.thread_running)
+        solution = solver.solve(self.grid.current_solution)
+        self.add_time("exact", exact_start)
+        time_dif = time.time() - start_time
+
+        if solution is not None and self.thread_running:
+            self.grid.current_solution.clear()
+            self.grid.current_solution = solution
+            self.solved = True
+
+        self.events.emit(ev.PHASE_END, phase="exact", ok=self.solved,
+                         stopped=not self.thread_running,
+                         seconds=time.time() - exact_start)
+        if not self.thread_running:
+            self.events.emit(ev.STOPPED, elapsed=time_dif)
+        elif solution is None:
+            self.events.emit(ev.FAILED, reason="conflict", count=0,
+                             fallback=False, elapsed=time_dif)
+        else:
+            self.events.emit(ev.SOLVED, source="exact", count=solver.nodes,
+                             elapsed=time_dif)
+
+    def init_solution(self):
+        """
+        A function to initialise the current solution from the user entry.
+        """
+        self.candidates = None
+        self.grid.current_solution.clear()
+        for entry in self.grid.user_rows:
+            this_row = []
+            for cell in entry:
+                this_row.append(cell)
+            self.grid.current_solution.append(this_row)
+
+    def run_phases(self):
+        """
+        A function to run phases 1 to 3 once after setup_phase_1.
+        Returns whether phases 2 and 3 could be run as a tuple.
+        """
+        can_p2 = False
+        can_p3 = False
+
+        # All phases at once through the streaming pipeline
+        if self.streaming and self.thread_running and not self.solved:
+            phase_start = self.start_phase("streaming")
+            solved = self.run_streaming()
+            self.end_phase("streaming", phase_start, bool(solved))
+
+            if solved is not None:
+                self.solved = solved
+                can_p2 = [] not in self.grid.ga_p2_pos_rows
+                can_p3 = can_p2 and [] not in self.grid.ga_p3_pos_box_rows
+                return can_p2, can_p3
+            # Too many candidates to keep, so run the phases in turn
+
+        # All phases at once, each search started when it is ready
+        if self.pipelined and self.thread_running and not self.solved:
+            phase_start = self.start_phase("pipelined")
+            can_p2, can_p3 = self.run_pipelined()
+            self.end_phase("pipelined", phase_start, self.solved)
+
+            return can_p2, can_p3
+
+        # Phase 1, find possible rows if not already solved in setup
+        if self.thread_running and not self.solved:
+            phase_start = self.start_phase("phase_1")
+            can_p2 = self.run_phase_1()
+            self.end_phase("phase_1", phase_start, can_p2)
+
+        # Phase 2, find possible box rows
+        if self.thread_running and not self.solved and can_p2:
+            phase_start = self.start_phase("phase_2")
+            can_p3 = self.run_phase_2()
+            self.end_phase("phase_2", phase_start, can_p3)
+
+        # Phase 3, try to solve the grid
+        if self.thread_running and can_p3:
+            phase_start = self.start_phase("phase_3")
+            self.solved = self.run_phase_3()
+            self.end_phase("phase_3", phase_start, self.solved)
+
+        return can_p2, can_p3
+
+    def start_phase(self, name: str):
+        """
+        A function to send the start of the named phase as an event.
+        Returns the time it started.
+        """
+        self.events.emit(ev.PHASE_START, phase=name)
+        return time.time()
+
+    def end_phase(self, name: str, start_time: float, ok: bool):
+        """
+        A function to add the time spent in the named phase and send
+        its end as an event.
+        """
+        self.add_time(name, start_time)
+        self.events.emit(ev.PHASE_END, phase=name, ok=ok,
+                         stopped=not self.thread_running,
+                         seconds=time.time() - start_time)
+
+    def update_solution(self, can_p2: bool, can_p3: bool):
+        """
+        A function to update the current solution from the phases
+        completed in an attempt. Returns True if any cells were updated.
+        """
+        updated = False
+
+        if can_p3:  # Phase 2 completed ok
+            self.check_boxes()
+            updated = self.check_rows()
+        elif can_p2:  # Only phase 1 completed ok
+            updated = self.check_rows()
+
+        return updated
+
+    def merge_solutions(self, solutions: list):
+        """
+        A function to merge the cells fixed by racing attempts into the
+        current solution. A cell is only set when the attempts agree on
+        its digit and it doesn't conflict with the current solution.
+        Returns True if any cells were updated.
+        """
+        updated = False
+
+        for row_num in range(9):
+            for col_num in range(9):
+                if self.grid.current_solution[row_num][col_num] > 0:
+                    continue
+
+                digits = set()
+                for solution in solutions:
+                    if solution[row_num][col_num] > 0:
+                        digits.add(solution[row_num][col_num])
+                if len(digits) != 1:  # Not found or attempts disagree
+                    continue
+
+                digit = digits.pop()
+                this_row = self.grid.current_solution[row_num]
+                this_col = self.grid.get_columns(
+                    self.grid.current_solution)[col_num]
+                this_box = self.grid.get_boxes(
+                    self.grid.current_solution)[(row_num - row_num % 3) +
+                                                int(col_num / 3)]
+
+                if (this_row.count(digit) == 0 and
+                        this_col.count(digit) == 0 and
+                        this_box.count(digit) == 0):
+                    this_row[col_num] = digit
+                    updated = True
+
+        return updated
 
     def check_boxes(self):
         """
         A function to check if box rows returned during phase 2
         shared a common row indicating a solved row and updates
         the lists used for checking rows.
+        The number of rows fixed is kept in rows_fixed.
         """
+        self.rows_fixed = 0
+
         for box_row_index in range(3):
             this_box_row = self.grid.ga_p3_pos_box_rows[box_row_index]
 
-            # Separate individual rows of the box row, store the unique rows
-            top = []
-            mid = []
-            bot = []
-            for entry in this_box_row:
-                if top.count(entry[0]) == 0:
-                    top.append(entry[0])
-                if mid.count(entry[1]) == 0:
-                    mid.append(entry[1])
-                if bot.count(entry[2]) == 0:
-                    bot.append(entry[2])
-
-            # Check if the returned rows for each position were a single row
-            if len(top) == 1:
-                self.grid.ga_p2_pos_rows[box_row_index*3].clear()
-                self.grid.ga_p2_pos_rows[box_row_index*3] = top
-
-            if len(mid) == 1:
-                self.grid.ga_p2_pos_rows[(box_row_index*3) + 1].clear()
-                self.grid.ga_p2_pos_rows[(box_row_index*3) + 1] = mid
-
-            if len(bot) == 1:
-                self.grid.ga_p2_pos_rows[(box_row_index*3) + 2].clear()
-                self.grid.ga_p2_pos_rows[(box_row_index*3) + 2] = bot
+            for position in range(3):
+                # Store the unique rows in this position of the box row
+                unique_rows = set()
+                for entry in this_box_row:
+                    unique_rows.add(tuple(entry[position]))
+
+                # Check if the returned rows for the position were one row
+                if len(unique_rows) == 1:
+                    row_index = (box_row_index * 3) + position
+                    self.grid.ga_p2_pos_rows[row_index] = \
+                        [list(unique_rows.pop())]
+                    self.rows_fixed += 1
 
     def check_rows(self):
         """
         A function to check if each row returned during phase 1
-        share possible rows with a common cell indicating a solved cell
+        share possible rows with a common cell indicating a solved cell.
+        The digits seen in each cell are collected as bits, so a cell
+        is solved when only one bit is set.
+        The number of cells fixed is kept in cells_fixed.
         """
         grid_updated = False
+        self.cells_fixed = 0
 
         for row_index in range(9):
             this_pos_row = self.grid.ga_p2_pos_rows[row_index]
-            temp_row = []
-            row_updated = False
+            digit_bits = [0] * 9
 
-            for index in range(9):  # each index for a row
-                temp_entries = []
+            # Collect the digits of each entry in the possible row list
+            for entry in this_pos_row:
+                for index in range(9):
+                    digit_bits[index] |= 1 << entry[index]
 
-                # Check each entry in the possible row list
-                for entry in this_pos_row:
-                    if temp_entries.count(entry[index]) == 0:
-                        temp_entries.append(entry[index])
-                if len(temp_entries) == 1:  # Same digit in same cell
-                    temp_row.append(temp_entries[0])
+            temp_row = []
+            for bits in digit_bits:
+                if bits and not bits & (bits - 1):  # Same digit in same cell
+                    temp_row.append(bits.bit_length() - 1)
                 else:  # Different digits in same cell so not possible solution
                     temp_row.append(0)
 
             # Check the temp_row against the current solution
             temp_solution_row = [0] * 9
+            row_fixed = 0
             for sol_index in range(9):  # Each cell
                 current_row = self.grid.current_solution[row_index]
                 if (current_row[sol_index] == 0 and
                         temp_row[sol_index] > 0):  # Entry is possible solution
                     temp_solution_row[sol_index] = temp_row[sol_index]
-                    row_updated = True
+                    row_fixed += 1
                 else:  # Keep the current solution
                     temp_solution_row[sol_index] = current_row[sol_index]
 
@@ -222,66 +595,53 @@ class GridSolver():
                 self.grid.current_solution[row_index] = temp_solution_row
 
                 # Set the grid updated status
-                if row_updated:
+                if row_fixed:
                     grid_updated = True
+                    self.cells_fixed += row_fixed
 
         return grid_updated
 
     def setup_phase_1(self):
         """
         A function to check the grid for possible cell values
-        and setup phase 1
+        and setup phase 1.
+        Placed digits are removed from the candidates of their peers and
+        any cell left with a single candidate is placed in turn, then the
+        deduction strategies remove what they can before phase 1.
+        The candidates are kept for the next attempt, which only has to
+        propagate the cells fixed since.
+        Returns False if the cell values conflict.
         """
-        updating = True
-        self.grid.ga_p1_pos_cells = [[[0]] * 9] * 9
+        candidates = self.candidates
+        if (candidates is None or
+                not candidates.agrees_with(self.grid.current_solution)):
+            candidates = cg.CandidateGrid()
+        self.candidates = None
+        placed = sum(candidates.unit_filled[:9])
+
+        if not candidates.load(self.grid.current_solution):
+            return False
+
+        # Remove further candidates with the deduction strategies
+        if self.deduction is not None:
+            hits = dict(self.deduction.hits)
+            times = dict(self.deduction.times)
+            deduced = self.deduction.run(candidates)
+            self.add_deductions(hits, times)
+            if not deduced:
+                return False
 
-        while updating:
-            updating = False
-            column_grid = self.grid.get_columns(self.grid.current_solution)
-            box_grid = self.grid.get_boxes(self.grid.current_solution)
+        self.candidates = candidates
+        self.cells_placed = sum(candidates.unit_filled[:9]) - placed
 
-            # Check for possible entries in each cell
-            for row_num in range(9):
-                this_row = self.grid.current_solution[row_num]
-                temp_row = []
-
-                for col_num in range(9):
-                    cell = this_row[col_num]
-                    cell_vals = []
-                    if cell > 0:  # Cell has been set
-                        cell_vals.append(cell)
-                    else:
-                        this_col = column_grid[col_num]
-                        box_top_row = row_num - (row_num % 3)
-                        box_left_col = col_num - (col_num % 3)
-                        this_box = box_grid[box_top_row +
-                                            int(box_left_col / 3)]
-
-                        # Check for digits missing in the row, column or box
-                        for num in range(9):
-                            if (this_row.count(num + 1) == 0 and
-                                    this_col.count(num + 1) == 0 and
-                                    this_box.count(num + 1) == 0):
-                                cell_vals.append(num + 1)
-
-                    # Check if cell_vals has been filled
-                    if cell_vals:
-                        temp_row.append(cell_vals)
-                    else:  # cell_vals is empty so error occurred
-                        return False
-
-                # Check if temp_row has new solved entries for any cells
-                for index in range(9):
-                    if len(temp_row[index]) == 1 and this_row[index] == 0:
-                        # New solved cell, update current solution
-                        this_row[index] = temp_row[index][0]
-                        updating = True
+        # Update the current solution with the newly solved cells
+        new_rows = candidates.get_rows()
+        for row_num in range(9):
+            this_row = self.grid.current_solution[row_num]
+            for col_num in range(9):
+                this_row[col_num] = new_rows[row_num][col_num]
 
-                if updating:
-                    break  # restart
-                else:  # Solution not updated so set phase 1 possible cells
-                    self.grid.ga_p1_pos_cells[row_num].clear()
-                    self.grid.ga_p1_pos_cells[row_num] = temp_row
+        self.grid.ga_p1_pos_cells = candidates.get_cell_rows()
 
         # Check if the solution has been found
         self.solved = self.grid.check_solution()
@@ -290,7 +650,10 @@ class GridSolver():
     def run_phase_1(self):
         """
         A function to handle running the genetic algorithm
-        to find possible rows
+        to find possible rows.
+        When the row index is available every valid row is read
+        straight from it instead, and rows found before for the same
+        candidate digits are taken from the row cache.
         """
         self.grid.phase = 1
         self.grid.ga_p2_pos_rows.clear()
@@ -298,67 +661,308 @@ class GridSolver():
         # Run each row through ga
         for row_num in range(len(self.grid.ga_p1_pos_cells)):
             self.grid.current_row = row_num
-            cell_values = self.grid.ga_p1_pos_cells[row_num]
-            possible_rows = self.run_ga_solver(cell_values)
-
-            # Convert possible_row indices to their corresponding values
-            if possible_rows:
-                converted_rows = []
-
-                for entry in possible_rows:
-                    temp_row = []
-                    current_row = self.grid.ga_p1_pos_cells[row_num]
-                    entry_index = 0
-
-                    for cell_vals in current_row:
-                        temp_row.append(cell_vals[entry[entry_index]])
-                        entry_index += 1
-                    converted_rows.append(temp_row)
+            converted_rows = self.search_row(row_num)
 
+            if converted_rows:
                 self.grid.ga_p2_pos_rows.append(converted_rows)
             else:  # Possible rows is empty so error occurred
                 return False
 
         return True
 
+    def search_row(self, row_num: int, cancel: threading.Event = None,
+                   rng: random.Random = None):
+        """
+        A function to find the possible rows for a single row for
+        phase 1, drawing from rng if given. Returns the rows as lists
+        of digits, empty if none were found.
+        """
+        cell_values = self.grid.ga_p1_pos_cells[row_num]
+
+        converted_rows = self.cached_rows(cell_values)
+        if converted_rows is not None:
+            self.events.emit(ev.SEARCH_DONE, phase=1, method="cache",
+                             results=len(converted_rows), evaluations=0)
+            return converted_rows
+
+        if self.use_row_index:
+            converted_rows = ri.get_index().find_rows(cell_values)
+            self.cache_rows(cell_values, converted_rows)
+            self.events.emit(ev.SEARCH_DONE, phase=1, method="index",
+                             results=len(converted_rows), evaluations=0)
+            return converted_rows
+
+        # Each search needs its own phase and row for the fitness function
+        grid = copy.copy(self.grid)
+        grid.phase = 1
+        grid.current_row = row_num
+        possible_rows = self.run_search(cell_values, grid, cancel, rng)
+
+        # Convert possible_row indices to their corresponding values
+        converted_rows = []
+        for entry in possible_rows:
+            temp_row = []
+            entry_index = 0
+
+            for cell_vals in cell_values:
+                temp_row.append(cell_vals[entry[entry_index]])
+                entry_index += 1
+            converted_rows.append(temp_row)
+
+        # Only rows found by an enumeration that wasn't stopped
+        # are known to be complete
+        if (self.search_space(cell_values) <= self.enumerate_limit and
+                self.thread_running and
+                not (cancel is not None and cancel.is_set())):
+            self.cache_rows(cell_values, converted_rows)
+
+        return converted_rows
+
+    def cached_rows(self, cell_values: list):
+        """
+        A function that returns the rows found before for the same
+        candidate digits, or None if they aren't cached.
+        """
+        if not self.use_row_cache:
+            return None
+        return rc.get_cache().get(cell_values)
+
+    def cache_rows(self, cell_values: list, rows: list):
+        """
+        A function to cache every valid row for the candidate digits
+        of a row so other searches can skip phase 1 for them.
+        """
+        if self.use_row_cache:
+            rc.get_cache().put(cell_values, rows)
+
+    def run_pipelined(self):
+        """
+        A function to run phases 1 to 3 with each search started as soon
+        as the searches it needs have finished, so the box row search for
+        rows 0 - 2 can run while the other rows are still being searched.
+        Returns whether phases 2 and 3 could be run as a tuple.
+        """
+        self.grid.phase = 1
+        self.grid.ga_p2_pos_rows = []
+        self.grid.ga_p3_pos_box_rows = []
+        for _ in range(9):
+            self.grid.ga_p2_pos_rows.append([])
+
+        scheduler = ps.PhaseScheduler(self.max_workers)
+        rngs = self.search_rngs(12)
+
+        for row_num in range(9):
+            scheduler.add(f"row {row_num}",
+                          self.scheduled_row(row_num, rngs[row_num]))
+
+        for box_row in range(3):
+            depends = []
+            for index in range(3):
+                depends.append(f"row {box_row * 3 + index}")
+            scheduler.add(f"box row {box_row}",
+                          self.scheduled_box_row(box_row,
+                                                 rngs[9 + box_row]),
+                          depends)
+
+        scheduler.add("grid", self.scheduled_grid(scheduler),
+                      ["box row 0", "box row 1", "box row 2"])
+
+        self.solved = scheduler.run()
+
+        # Keep the box rows found for check_boxes
+        if not self.solved:
+            self.grid.ga_p3_pos_box_rows = []
+            for box_row in range(3):
+                self.grid.ga_p3_pos_box_rows.append(
+                    scheduler.results.get(f"box row {box_row}", []))
+
+        can_p2 = [] not in self.grid.ga_p2_pos_rows
+        can_p3 = can_p2 and [] not in self.grid.ga_p3_pos_box_rows
+        return can_p2, can_p3
+
+    def scheduled_row(self, row_num: int, rng: random.Random = None):
+        """
+        A function that returns the scheduled task finding the
+        possible rows for a row.
+        """
+        def task(cancel: threading.Event):
+            rows = self.search_row(row_num, cancel, rng)
+            self.grid.ga_p2_pos_rows[row_num] = rows
+            return rows
+
+        return task
+
+    def scheduled_box_row(self, box_row: int, rng: random.Random = None):
+        """
+        A function that returns the scheduled task finding the
+        possible box rows for a box row.
+        """
+        def task(cancel: threading.Event):
+            return self.search_box_row(box_row, cancel, rng)
+
+        return task
+
+    def scheduled_grid(self, scheduler: ps.PhaseScheduler):
+        """
+        A function that returns the scheduled task solving the grid
+        from the box rows found.
+        """
+        def task(cancel: threading.Event):
+            self.grid.ga_p3_pos_box_rows.clear()
+            for box_row in range(3):
+                self.grid.ga_p3_pos_box_rows.append(
+                    scheduler.results[f"box row {box_row}"])
+
+            return self.run_phase_3()
+
+        return task
+
+    def run_streaming(self):
+        """
+        A function to run phases 1 to 3 as a pipeline of lazy iterators,
+        with phase 2 joining rows as phase 1 produces them and phase 3
+        starting as soon as each box row has a candidate.
+        Returns True if the grid was solved, or None if the pipeline kept
+        more than stream_limit candidates without solving it.
+        """
+        self.grid.phase = 1
+        sources = []
+        for row_num in range(9):
+            sources.append(self.iter_phase_1_rows(row_num))
+
+        pipeline = pp.PhasePipeline(sources, self.buffer_size,
+                                    lambda: self.thread_running,
+                                    self.stream_limit)
+        solution = pipeline.run()
+        if pipeline.overflowed:
+            return None
+
+        # Keep what was found for check_rows and check_boxes
+        self.grid.ga_p2_pos_rows = pipeline.get_rows()
+        self.grid.ga_p3_pos_box_rows = pipeline.box_rows
+
+        if solution is None:
+            return False
+
+        self.grid.current_solution.clear()
+        self.grid.current_solution = solution
+        return True
+
+    def iter_phase_1_rows(self, row_num: int):
+        """
+        A function that yields the possible rows for a row from the row
+        cache, row index, enumeration or the genetic algorithm,
+        as they are found.
+        """
+        cell_values = self.grid.ga_p1_pos_cells[row_num]
+
+        rows = self.cached_rows(cell_values)
+        if rows is None and self.use_row_index:
+            rows = ri.get_index().find_rows(cell_values)
+            self.cache_rows(cell_values, rows)
+        if rows is not None:
+            yield from rows
+            return
+
+        # Each source needs its own row for the fitness function
+        grid = copy.copy(self.grid)
+        grid.phase = 1
+        grid.current_row = row_num
+
+        if self.search_space(cell_values) <= self.enumerate_limit:
+            found = self.enumerate_solver(cell_values, 1)
+        else:
+            found = self.iter_ga_solver(cell_values, grid)
+
+        for entry in found:
+            temp_row = []
+            for index in range(9):
+                temp_row.append(cell_values[index][entry[index]])
+            yield temp_row
+
     def run_phase_2(self):
         """
         A function to handle running the genetic algorithm
-        to find possible box rows
+        to find possible box rows.
+        The three box rows are searched concurrently and as soon as any
+        box row returns nothing the others are cancelled, so the phase
+        ends once they have seen it. Threads are used so the searches
+        share the grid and overlap rather than for CPU parallelism,
+        which racing attempts in processes provides.
         """
         self.grid.phase = 2
         self.grid.ga_p3_pos_box_rows.clear()
-
-        # Run each set of 3 rows through the ga to see which groupings work
-        for box_row in range(3):
-            self.grid.current_row = box_row
-            possible_rows = []
-
-            # Get the rows depending on box_row, 0 is top 3, 1 is mid, 2 is bot
-            possible_rows.append(self.grid.ga_p2_pos_rows[box_row * 3])
-            possible_rows.append(self.grid.ga_p2_pos_rows[(box_row * 3) + 1])
-            possible_rows.append(self.grid.ga_p2_pos_rows[(box_row * 3) + 2])
-
-            possible_box_rows = self.run_ga_solver(possible_rows)
-
-            # Convert possible box indices into their corresponding lists
-            if possible_box_rows:
-                converted_boxes = []
-
-                for entry in possible_box_rows:
-                    pos_box_row = []
-                    for index in range(len(entry)):
-                        pos_box_row.append(self.grid.ga_p2_pos_rows
-                                           [(box_row * 3) + index]
-                                           [entry[index]])
-                    converted_boxes.append(pos_box_row)
-
-                self.grid.ga_p3_pos_box_rows.append(converted_boxes)
-            else:  # possible_box_rows is empty, no box rows returned
-                return False
+        cancel = threading.Event()  # Set to stop the remaining searches
+        rngs = self.search_rngs(3)
+
+        pool = ThreadPoolExecutor(max_workers=3)
+        try:
+            searches = []
+            for box_row in range(3):
+                searches.append(pool.submit(self.search_box_row,
+                                            box_row, cancel,
+                                            rngs[box_row]))
+
+            # Fail fast on the first box row without results
+            for search in as_completed(searches):
+                if not search.result():
+                    return False
+        finally:
+            # Searches still running see cancel, so they end soon and
+            # nothing is left using the grid after the phase
+            cancel.set()
+            pool.shutdown(wait=True, cancel_futures=True)
+
+        # Store the box rows in order, 0 is top 3, 1 is mid, 2 is bot
+        for search in searches:
+            self.grid.ga_p3_pos_box_rows.append(search.result())
 
         return True
 
+    def search_rngs(self, count: int):
+        """
+        A function that returns a random.Random for each of count
+        searches run at the same time, seeded from the solver's rng in
+        order so a seeded run doesn't depend on how the threads run.
+        """
+        rngs = []
+        for _ in range(count):
+            rngs.append(random.Random(self.rng.randrange(1 << 30)))
+        return rngs
+
+    def search_box_row(self, box_row: int, cancel: threading.Event,
+                       rng: random.Random = None):
+        """
+        A function to run the genetic algorithm on a single box row
+        for phase 2, drawing from rng if given. Returns the possible box
+        rows as lists of rows, empty if none were found.
+        """
+        # Each search needs its own phase and row for the fitness function
+        grid = copy.copy(self.grid)
+        grid.phase = 2
+        grid.current_row = box_row
+        possible_rows = []
+
+        # Get the rows depending on box_row, 0 is top 3, 1 is mid, 2 is bot
+        possible_rows.append(grid.ga_p2_pos_rows[box_row * 3])
+        possible_rows.append(grid.ga_p2_pos_rows[(box_row * 3) + 1])
+        possible_rows.append(grid.ga_p2_pos_rows[(box_row * 3) + 2])
+
+        possible_box_rows = self.run_search(possible_rows, grid, cancel,
+                                            rng)
+
+        # Convert possible box indices into their corresponding lists
+        converted_boxes = []
+        for entry in possible_box_rows:
+            pos_box_row = []
+            for index in range(len(entry)):
+                pos_box_row.append(grid.ga_p2_pos_rows
+                                   [(box_row * 3) + index]
+                                   [entry[index]])
+            converted_boxes.append(pos_box_row)
+
+        return converted_boxes
+
     def run_phase_3(self):
         """
         A function to handle running the genetic algorithm
@@ -368,7 +972,7 @@ class GridSolver():
         solved = False
 
         # Pass the possible box rows to find possible solution
-        solution = self.run_ga_solver(self.grid.ga_p3_pos_box_rows)
+        solution = self.run_search(self.grid.ga_p3_pos_box_rows)
 
         # Check if a solution was found and update the current solution
         if solution:
@@ -393,11 +997,132 @@ class GridSolver():
 
         return solved
 
-    def run_ga_solver(self, values: list):
+    def run_search(self, values: list,
+                   grid: sg.SudokuGrid = None,
+                   cancel: threading.Event = None,
+                   rng: random.Random = None):
+        """
+        A function that finds the valid index combinations of the given
+        values for the current phase. Small search spaces are enumerated
+        and phases 2 and 3 are joined on their digit masks while the join
+        stays within its work limit. Anything larger is searched with the
+        genetic algorithm, drawing from rng if given.
+        Returns the results as a list in the same form as run_ga_solver.
+        """
+        if grid is None:
+            grid = self.grid
+
+        if cancel is not None and cancel.is_set():
+            return []
+
+        # Phase 3 only needs a single solution
+        limit = 0
+        if grid.phase == 3:
+            limit = 1
+
+        results = None
+        if self.search_space(values) <= self.enumerate_limit:
+            results = self.enumerate_solver(values, grid.phase, limit,
+                                            cancel=cancel)
+        elif grid.phase > 1:
+            results = self.enumerate_solver(values, grid.phase, limit,
+                                            self.join_limit, cancel)
+
+        if results is None:
+            return self.run_ga_solver(values, grid, cancel, rng)
+
+        if cancel is None or not cancel.is_set():
+            self.events.emit(ev.SEARCH_DONE, phase=grid.phase,
+                             method="enumerate", results=len(results),
+                             evaluations=0)
+        return results
+
+    def search_space(self, values: list):
+        """
+        A function that returns the number of index combinations
+        for the given values.
+        """
+        size = 1
+        for entry in values:
+            size *= len(entry)
+        return size
+
+    def enumerate_solver(self, values: list, phase: int, limit: int = 0,
+                         max_work: int = 0,
+                         cancel: threading.Event = None):
+        """
+        A function that enumerates every valid index combination of the
+        given values for a phase, stopping after limit results if above 0.
+        Branches are pruned as soon as a chosen entry clashes with those
+        already chosen. Returns None if the search needs more than
+        max_work mask tests, when above 0. The search stops early when
+        the solver is stopped or the optional cancel event is set.
+        """
+        # Convert each entry to its digit mask, -1 if it can't be used
+        masks = []
+        for entry in values:
+            entry_masks = []
+            for item in entry:
+                entry_masks.append(self.entry_mask(item, phase))
+            masks.append(entry_masks)
+
+        def is_running():
+            return self.thread_running and not (cancel is not None and
+                                                cancel.is_set())
+
+        return je.join(masks, limit, max_work, is_running)
+
+    def entry_mask(self, entry, phase: int):
+        """
+        A function that returns the digit mask of a value entry for a
+        phase, or -1 if the entry can never be part of a valid result.
+        Phase 1 entries are cell digits, phase 2 entries are rows with a
+        digit bit for each of their 3 boxes and phase 3 entries are box
+        rows with a digit bit for each of the 9 columns.
+        """
+        if phase == 1:
+            if entry < 1:
+                return -1
+            return 1 << (entry - 1)
+        elif phase == 2:
+            return je.box_mask(entry)
+        else:
+            return je.column_mask(entry)
+
+    def run_ga_solver(self, values: list,
+                      grid: sg.SudokuGrid = None,
+                      cancel: threading.Event = None,
+                      rng: random.Random = None):
         """
         A function that runs the genetic algorithm with given values.
+        The grid used for fitness defaults to the solver grid and the
+        optional cancel event stops the run early when set. Random
+        numbers come from rng, the solver's rng if not given.
         Returns the results of the genetic algorithm as a list.
         """
+        if grid is None:
+            grid = self.grid
+
+        evaluations = grid.evaluations
+        results = list(self.iter_ga_solver(values, grid, cancel, rng))
+        if cancel is None or not cancel.is_set():
+            self.events.emit(ev.SEARCH_DONE, phase=grid.phase, method="ga",
+                             results=len(results),
+                             evaluations=grid.evaluations - evaluations)
+        return results
+
+    def iter_ga_solver(self, values: list,
+                       grid: sg.SudokuGrid = None,
+                       cancel: threading.Event = None,
+                       rng: random.Random = None):
+        """
+        A function that runs the genetic algorithm with given values,
+        yielding each unique result as soon as its run completes.
+        """
+        if grid is None:
+            grid = self.grid
+        if rng is None:
+            rng = self.rng
         limit_list = []
 
         # Get the index range of stored cell values
@@ -410,42 +1135,60 @@ class GridSolver():
         attempts = [50, 20, 3]
         points = [40, 100, 500]
         results = []
-        solver = ga.GaSolver(f=self.grid,
+        solver = ga.GaSolver(f=grid,
                              limits=limit_list,
                              mutation=0.2,
-                             deletion=0.2)
+                             deletion=0.2,
+                             rng=rng)
 
-        for _ in range(attempts[self.grid.phase - 1]):
+        for _ in range(attempts[grid.phase - 1]):
+            if cancel is not None and cancel.is_set():
+                break
             if self.thread_running:
+                evaluations = grid.evaluations
                 solver.solve(n_iterations=30,
-                             n_initial_points=points[self.grid.phase - 1])
+                             n_initial_points=points[grid.phase - 1])
+                self.add_evaluations(f"phase_{grid.phase}",
+                                     grid.evaluations - evaluations)
                 for point in solver.population:
                     if point.fitness == 100:
                         if results.count(point.parameters) == 0:  # unique
                             results.append(point.parameters)
+                            yield list(point.parameters)
 
-        self.output(".")
-        return results
+    def add_time(self, name: str, start_time: float):
+        """
+        A function to add the time since start_time to the time
+        spent in the named part of the run.
+        """
+        time_dif = time.time() - start_time
+        with self.stats_lock:
+            self.phase_times[name] = self.phase_times.get(name, 0) + time_dif
+
+    def add_evaluations(self, name: str, count: int):
+        """
+        A function to add to the fitness evaluations made in the
+        named phase of the run.
+        """
+        with self.stats_lock:
+            self.evaluations[name] = self.evaluations.get(name, 0) + count
+
+    def add_deductions(self, hits: dict, times: dict):
+        """
+        A function to add the hits and seconds of each deduction strategy
+        since the given counts were taken to those of the run.
+        """
+        with self.stats_lock:
+            for name, total in self.deduction.hits.items():
+                stats = self.deductions.setdefault(name, {"hits": 0,
+                                                          "seconds": 0.0})
+                stats["hits"] += total - hits.get(name, 0)
+                stats["seconds"] += (self.deduction.times[name] -
+                                     times.get(name, 0.0))
 
     def convert_time(self, run_time: int):
         """
         A function to convert a run time in seconds into
         minutes and seconds and returns it as a string.
         """
-        minutes = int(run_time / 60)
-        seconds = int(run_time % 60)
-        result = ""
-
-        if minutes > 0:
-            result += f"{minutes} minute"
-            if minutes > 1:
-                result += "s"
-            result += " "
-
-        if seconds < 10:
-            result += "0"
-
-        result += f"{seconds} second"
-        if not seconds == 1:
-            result += "s"
-        return result
+        return ev.convert_time(run_time)
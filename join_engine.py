@@ -0,0 +1,118 @@
+from functools import lru_cache
+from typing import Callable
+
+
+@lru_cache(maxsize=65536)
+def row_masks(row: tuple):
+    """
+    A function that returns the digit masks of a row as a tuple of its
+    3 box masks packed into 27 bits and its 9 column digit bits packed
+    into 81 bits. Both are -1 if the row has an empty cell, and the box
+    mask is -1 if a digit repeats within a box.
+    """
+    box_mask = 0
+    column_mask = 0
+
+    for index in range(9):
+        digit = row[index]
+        if digit < 1:
+            return -1, -1
+
+        bit = 1 << (int(index / 3) * 9 + digit - 1)
+        if box_mask >= 0:
+            if box_mask & bit:  # Digit repeated in a box
+                box_mask = -1
+            else:
+                box_mask |= bit
+
+        column_mask |= 1 << (index * 9 + digit - 1)
+
+    return box_mask, column_mask
+
+
+def box_mask(row: list):
+    """
+    A function that returns the packed box mask of a row for joining
+    rows into box rows, -1 if the row can't be used.
+    """
+    return row_masks(tuple(row))[0]
+
+
+def column_mask(box_row: list):
+    """
+    A function that returns the packed column mask of a box row for
+    joining box rows into a grid, -1 if the box row can't be used.
+    """
+    mask = 0
+
+    for row in box_row:
+        row_mask = row_masks(tuple(row))[1]
+        if row_mask < 0 or mask & row_mask:  # Digit repeated in a column
+            return -1
+        mask |= row_mask
+
+    return mask
+
+
+def join(masks: list, limit: int = 0, max_work: int = 0,
+         is_running: Callable = None):
+    """
+    A function that finds every combination of one entry from each list
+    of masks where no two masks share a bit, pruning as soon as a chosen
+    mask clashes with those already chosen. Entries with a mask below 0
+    are skipped.
+    Stops after limit results if above 0. Returns the combinations as
+    lists of indices, or None if more than max_work mask tests would be
+    needed, when above 0.
+    """
+    results = []
+    if not masks:
+        return results
+
+    # Keep only the usable entries of each list with their index
+    usable = []
+    for entry_masks in masks:
+        this_list = []
+        for index in range(len(entry_masks)):
+            if entry_masks[index] >= 0:
+                this_list.append((index, entry_masks[index]))
+        if not this_list:
+            return results
+        usable.append(this_list)
+
+    n_lists = len(usable)
+    indices = [0] * n_lists
+    work = 0
+
+    # Depth first search with a stack of (depth, used bits, next position)
+    stack = [(0, 0, 0)]
+    while stack:
+        depth, used, position = stack.pop()
+        this_list = usable[depth]
+
+        while position < len(this_list):
+            index, mask = this_list[position]
+            position += 1
+            work += 1
+
+            if mask & used:
+                continue
+
+            indices[depth] = index
+            if depth + 1 == n_lists:
+                results.append(list(indices))
+                if limit and len(results) >= limit:
+                    return results
+                continue
+
+            # Come back to the rest of this list after going deeper
+            stack.append((depth, used, position))
+            stack.append((depth + 1, used | mask, 0))
+            break
+
+        if max_work and work > max_work:
+            return None
+        if is_running is not None and not is_running():
+            return results
+
+    return results
@@ -0,0 +1,175 @@
+from itertools import islice
+from typing import Callable
+import join_engine as je
+
+FULL_MASK = (1 << 81) - 1  # Column mask with every digit in every column
+
+
+class PhasePipeline:
+    """
+    A class to connect the solver phases with lazy iterators.
+    Candidate rows are pulled from each row source a few at a time and
+    joined straight away with the rows already seen for the same box row,
+    and each new box row is joined with the box rows already seen for the
+    rest of the grid. Every combination is found once, when its last
+    member arrives, and the first full grid stops all upstream work.
+    The buffer size only bounds the rows pulled from a source at once.
+    Every usable row and box row is kept to join with later arrivals, as
+    any of them may be part of the grid, so max_kept bounds how many are
+    kept. Past it the pipeline gives up, marked as overflowed, so the
+    caller can run the phases one after the other instead.
+    """
+
+    def __init__(self, row_sources: list, buffer_size: int = 64,
+                 is_running: Callable = None, max_kept: int = None):
+        self.row_sources = []  # An iterator of candidate rows for each row
+        self.row_sources += row_sources
+        self.buffer_size = buffer_size  # Rows pulled from a source at once
+        self.is_running = is_running  # Returns False when a stop is needed
+        self.max_kept = max_kept  # Most rows and box rows kept, or None
+        self.kept = 0  # Rows and box rows kept so far
+        self.overflowed = False  # Gave up with more than max_kept kept
+        self.rows = []  # Rows seen for each row with their box masks
+        self.box_rows = []  # Box rows found for each box row
+        self.box_masks = []  # Column masks of the box rows found
+        self.box_lookup = []  # Column mask to a box row found with it
+        self.solution = None
+
+        for _ in range(9):
+            self.rows.append([])
+        for _ in range(3):
+            self.box_rows.append([])
+            self.box_masks.append([])
+            self.box_lookup.append({})
+
+    def run(self):
+        """
+        A function to pull rows from the sources until a grid is found,
+        every source is used up or more than max_kept candidates are kept.
+        Returns the solved grid as a list of 9 rows, or None if no grid
+        was found.
+        """
+        sources = []
+        for source in self.row_sources:
+            sources.append(iter(source))
+        active = list(range(9))
+
+        try:
+            while active and self.solution is None:
+                for row_num in list(active):
+                    if self.is_running is not None and not self.is_running():
+                        return None
+
+                    # Pull a bounded chunk so downstream work keeps up
+                    chunk = list(islice(sources[row_num], self.buffer_size))
+                    if len(chunk) < self.buffer_size:
+                        active.remove(row_num)
+
+                    for row in chunk:
+                        self.add_row(row_num, row)
+                        if self.solution is not None:
+                            return self.solution
+                        if self.overflowed:
+                            return None
+        finally:
+            # Let the sources release any work still in progress
+            for source in sources:
+                close = getattr(source, "close", None)
+                if close is not None:
+                    close()
+
+        return self.solution
+
+    def add_row(self, row_num: int, row: list):
+        """
+        A function to join a new row with the rows already seen for the
+        other two rows of its box row.
+        """
+        mask = je.box_mask(row)
+        if mask < 0:
+            return
+
+        box_row = int(row_num / 3)
+        position = row_num % 3
+        others = []
+        for index in range(3):
+            if index != position:
+                others.append(self.rows[box_row * 3 + index])
+
+        for first, first_mask in others[0]:
+            if first_mask & mask:
+                continue
+            for second, second_mask in others[1]:
+                if second_mask & (mask | first_mask):
+                    continue
+
+                # Put the three rows back in grid order
+                new_rows = [first, second]
+                new_rows.insert(position, row)
+                self.add_box_row(box_row, new_rows)
+                if self.solution is not None:
+                    return
+
+        self.rows[row_num].append((row, mask))
+        self.keep()
+
+    def add_box_row(self, box_row: int, rows: list):
+        """
+        A function to join a new box row with the box rows already found
+        for the other two box rows, storing the first full grid found.
+        """
+        mask = je.column_mask(rows)
+        if mask < 0:
+            return
+
+        others = []
+        for index in range(3):
+            if index != box_row:
+                others.append(index)
+
+        # The three box rows of a grid fill every column once, so each
+        # fitting box row of one list leaves a single mask to look up
+        first, second = others
+        if len(self.box_masks[first]) > len(self.box_masks[second]):
+            first, second = second, first
+        first_masks = self.box_masks[first]
+        second_lookup = self.box_lookup[second]
+
+        for index in range(len(first_masks)):
+            if first_masks[index] & mask:
+                continue
+            match = second_lookup.get(FULL_MASK ^ mask ^ first_masks[index])
+            if match is not None:
+                grid = {box_row: rows,
+                        first: self.box_rows[first][index],
+                        second: self.box_rows[second][match]}
+                self.solution = grid[0] + grid[1] + grid[2]
+                return
+
+        self.box_rows[box_row].append(rows)
+        self.box_masks[box_row].append(mask)
+        self.box_lookup[box_row].setdefault(mask,
+                                            len(self.box_rows[box_row]) - 1)
+        self.keep()
+
+    def keep(self):
+        """
+        A function to count a row or box row kept,
+        marking the pipeline as overflowed once past max_kept.
+        """
+        self.kept += 1
+        if self.max_kept is not None and self.kept > self.max_kept:
+            self.overflowed = True
+
+    def get_rows(self):
+        """
+        A function that returns the rows seen for each row,
+        in the form used for phase 2.
+        """
+        result = []
+        for seen in self.rows:
+            this_row = []
+            for row, _ in seen:
+                this_row.append(row)
+            result.append(this_row)
+        return result
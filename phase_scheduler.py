@@ -0,0 +1,73 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable
+import threading
+
+
+class PhaseScheduler:
+    """
+    A class to run named tasks in a worker pool, starting each task as
+    soon as the tasks it depends on have finished. A task fails when it
+    returns an empty result, which sets the shared cancel event so the
+    running tasks can stop and no more tasks are started.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self.tasks = {}  # Task name to its function and dependencies
+        self.results = {}  # Task name to its result once finished
+        self.failed = None  # Name of the first task to fail
+        self.cancel = threading.Event()  # Set to stop the running tasks
+
+    def add(self, name: str, function: Callable, depends: list = None):
+        """
+        A function to add a task. The function is called with the cancel
+        event once every task named in depends has finished.
+        """
+        if depends is None:
+            depends = []
+        self.tasks[name] = (function, list(depends))
+
+    def ready_tasks(self, started: set):
+        """
+        A function that returns the names of the tasks not yet started
+        whose dependencies have all finished, in the order they were added.
+        """
+        ready = []
+        for name, (_, depends) in self.tasks.items():
+            if name in started:
+                continue
+            if all(depend in self.results for depend in depends):
+                ready.append(name)
+        return ready
+
+    def run(self):
+        """
+        A function to run every task in dependency order.
+        Returns True if all of the tasks finished with a result.
+        """
+        started = set()
+        pending = {}  # Future of each running task to its name
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while True:
+                if not self.cancel.is_set():
+                    for name in self.ready_tasks(started):
+                        started.add(name)
+                        function = self.tasks[name][0]
+                        pending[pool.submit(function, self.cancel)] = name
+
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = pending.pop(future)
+                    result = future.result()
+
+                    if result:
+                        self.results[name] = result
+                    elif self.failed is None:
+                        self.failed = name
+                        self.cancel.set()  # Fail fast
+
+        return self.failed is None and len(self.results) == len(self.tasks)
@@ -0,0 +1,206 @@
+import mmap
+import numpy as np
+import os
+
+
+CHUNK_SIZE = 65536  # Puzzles in each chunk read
+ZERO = ord("0")
+DOT = ord(".")
+
+
+class PuzzleCorpus:
+    """
+    A class to read a file of fixed width puzzle records, each 81
+    characters with 0 or . for empty cells followed by a line ending.
+    The file is memory mapped and parsed a chunk at a time into
+    (N, 81) uint8 arrays of digits, so only the pages read are loaded.
+    Byte ranges holding whole records can be handed to other processes
+    to read their own shard of the file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, "rb")
+        self.size = os.fstat(self.file.fileno()).st_size
+        self.map = None
+        self.record_size = 82  # 81 characters and a newline
+        self.n_puzzles = 0
+
+        if self.size > 0:
+            self.map = mmap.mmap(self.file.fileno(), 0,
+                                 access=mmap.ACCESS_READ)
+            line_end = self.map.find(b"\n")
+            if line_end < 0:  # A single record without a line ending
+                line_end = self.size
+            if line_end not in (81, 82):
+                self.close()
+                raise ValueError(f"{path} doesn't hold 81 character " +
+                                 "puzzle records")
+
+            self.record_size = line_end + 1
+            # The last record may not have a line ending
+            self.n_puzzles = int((self.size + self.record_size - 81) /
+                                 self.record_size)
+
+    def __len__(self):
+        return self.n_puzzles
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """
+        A function to release the memory map and the file.
+        """
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        self.file.close()
+
+    def read(self, start: int, count: int):
+        """
+        A function that returns count puzzles from puzzle number start
+        as an (N, 81) uint8 array of digits, 0 for empty cells.
+        Raises ValueError if any record has characters other than
+        0 - 9 and .
+        """
+        digits, valid = self.read_checked(start, count)
+        self.check_records(start, valid)
+        return digits
+
+    def read_checked(self, start: int, count: int):
+        """
+        A function that returns count puzzles from puzzle number start
+        as an (N, 81) uint8 array of digits, 0 for empty cells, along
+        with an array of N booleans that are False for the records with
+        characters other than 0 - 9 and . The digits of those records
+        are all 0.
+        """
+        count = max(0, min(count, self.n_puzzles - start))
+        if count == 0:
+            return (np.zeros((0, 81), dtype=np.uint8),
+                    np.zeros(0, dtype=bool))
+
+        # The last record may be missing its line ending, so take each
+        # record's 81 characters from a view of the mapped bytes
+        length = (count - 1) * self.record_size + 81
+        raw = np.frombuffer(self.map, dtype=np.uint8, count=length,
+                            offset=start * self.record_size)
+        records = np.lib.stride_tricks.as_strided(
+            raw, shape=(count, 81), strides=(self.record_size, 1))
+
+        digits = records - np.uint8(ZERO)
+        digits[records == DOT] = 0
+        del raw, records  # Release the view of the memory map
+
+        valid = (digits <= 9).all(axis=1)
+        digits[~valid] = 0
+        return digits, valid
+
+    def check_records(self, start: int, valid):
+        """
+        A function that raises ValueError naming the first bad record
+        of those read from puzzle number start.
+        """
+        bad = np.flatnonzero(~valid)
+        if bad.size > 0:
+            raise ValueError(f"{self.path} puzzle {start + int(bad[0])} " +
+                             "has characters other than 0 - 9 and .")
+
+    def record_text(self, number: int):
+        """
+        A function that returns the 81 characters of a puzzle record
+        as text, such as a record that couldn't be read as digits.
+        """
+        start = number * self.record_size
+        return self.map[start:start + 81].decode("utf-8", errors="replace")
+
+    def chunks(self, chunk_size: int = CHUNK_SIZE, start_byte: int = 0,
+               stop_byte: int = None):
+        """
+        A function that yields the puzzle number and digit array of each
+        chunk of puzzles in a byte range of the file, the whole file by
+        default. The range must start and end on record boundaries.
+        Raises ValueError at the first chunk with a bad record.
+        """
+        for first, digits, valid in self.checked_chunks(chunk_size,
+                                                        start_byte,
+                                                        stop_byte):
+            self.check_records(first, valid)
+            yield first, digits
+
+    def checked_chunks(self, chunk_size: int = CHUNK_SIZE,
+                       start_byte: int = 0, stop_byte: int = None):
+        """
+        A function that yields the puzzle number, digit array and valid
+        records of each chunk of puzzles in a byte range of the file,
+        as read_checked returns them, so bad records can be reported
+        without losing the rest of the chunk.
+        """
+        if stop_byte is None or stop_byte > self.size:
+            stop_byte = self.size
+        if start_byte % self.record_size:
+            raise ValueError(f"Byte {start_byte} isn't the start of a record")
+
+        start = int(start_byte / self.record_size)
+        stop = min(self.n_puzzles,
+                   int((stop_byte + self.record_size - 1) / self.record_size))
+
+        for first in range(start, stop, chunk_size):
+            digits, valid = self.read_checked(first,
+                                              min(chunk_size, stop - first))
+            yield first, digits, valid
+
+    def shard_offsets(self, n_shards: int):
+        """
+        A function that splits the file into n_shards byte ranges of
+        whole records, as (start_byte, stop_byte) tuples.
+        """
+        offsets = []
+        for shard in range(n_shards):
+            start = int(self.n_puzzles * shard / n_shards)
+            stop = int(self.n_puzzles * (shard + 1) / n_shards)
+            offsets.append((start * self.record_size,
+                            min(self.size, stop * self.record_size)))
+        return offsets
+
+
+def iter_shard(path: str, start_byte: int, stop_byte: int,
+               chunk_size: int = CHUNK_SIZE):
+    """
+    A function that yields the chunks of one shard of a puzzle file,
+    for a worker given only the path and byte range.
+    """
+    with PuzzleCorpus(path) as corpus:
+        yield from corpus.chunks(chunk_size, start_byte, stop_byte)
+
+
+def puzzle_rows(digits):
+    """
+    A function that returns one puzzle's 81 digits as a 9x9 list.
+    """
+    return digits.reshape(9, 9).tolist()
+
+
+def puzzle_string(digits):
+    """
+    A function that returns one puzzle's 81 digits as a string.
+    """
+    return (np.asarray(digits, dtype=np.uint8) + np.uint8(ZERO)) \
+        .tobytes().decode()
+
+
+def write_corpus(path: str, puzzles):
+    """
+    A function to write puzzles, each 81 digits or a 9x9 grid,
+    to a file of fixed width records.
+    """
+    digits = np.asarray(puzzles, dtype=np.uint8).reshape(-1, 81)
+    records = np.full((digits.shape[0], 82), ord("\n"), dtype=np.uint8)
+    records[:, :81] = digits + np.uint8(ZERO)
+
+    with open(path, "wb") as corpus_file:
+        corpus_file.write(records.tobytes())
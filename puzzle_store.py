@@ -0,0 +1,109 @@
+import canonical_form as cf
+import dbm
+import threading
+
+
+class PuzzleStore:
+    """
+    A class to keep solved puzzles on disk in a dbm file.
+    Each solution is kept under the puzzle's own digits for a quick exact
+    match, and in canonical form under the canonical key, so relabelled,
+    transposed or reordered copies of a solved puzzle are also found.
+    Opened with flag "r" the store is only read, so worker processes can
+    share a store that one process writes, and nothing is put.
+    """
+
+    def __init__(self, path: str, flag: str = "c"):
+        self.path = path
+        self.read_only = flag == "r"
+        self.db = dbm.open(path, flag)
+        self.lock = threading.Lock()  # dbm files aren't thread safe
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def get(self, rows: list):
+        """
+        A function that returns the stored solution of a 9x9 grid,
+        0 for empty cells, as a 9x9 list, or None if it isn't stored.
+        """
+        puzzle_key = "p" + grid_string(rows)
+
+        with self.lock:
+            value = self.db.get(puzzle_key)
+        if value is not None:
+            self.hits += 1
+            return string_grid(value.decode())
+
+        key, transform = cf.canonical_form(rows)
+        with self.lock:
+            value = self.db.get("c" + key)
+        if value is None:
+            self.misses += 1
+            return None
+
+        solution = transform.undo(string_grid(value.decode()))
+        if not matches(rows, solution):
+            self.misses += 1
+            return None
+
+        # Keep the puzzle itself for next time
+        if not self.read_only:
+            with self.lock:
+                self.db[puzzle_key] = grid_string(solution)
+        self.hits += 1
+        return solution
+
+    def put(self, rows: list, solution: list):
+        """
+        A function to store the solution of a 9x9 grid,
+        unless the store is read only.
+        """
+        if self.read_only:
+            return
+
+        key, transform = cf.canonical_form(rows)
+
+        with self.lock:
+            self.db["p" + grid_string(rows)] = grid_string(solution)
+            self.db["c" + key] = grid_string(transform.apply(solution))
+
+    def close(self):
+        """
+        A function to close the dbm file.
+        """
+        with self.lock:
+            self.db.close()
+
+
+def grid_string(rows: list):
+    """
+    A function that returns a 9x9 grid as a string of 81 digits.
+    """
+    return "".join(str(digit) for row in rows for digit in row)
+
+
+def string_grid(text: str):
+    """
+    A function that returns a string of 81 digits as a 9x9 grid.
+    """
+    return [[int(digit) for digit in text[row_num * 9: row_num * 9 + 9]]
+            for row_num in range(9)]
+
+
+def matches(rows: list, solution: list):
+    """
+    A function that returns True if the solution keeps
+    every given digit of the grid.
+    """
+    for row_num in range(9):
+        for col_num in range(9):
+            digit = rows[row_num][col_num]
+            if digit > 0 and solution[row_num][col_num] != digit:
+                return False
+    return True
@@ -0,0 +1,160 @@
+from collections import OrderedDict
+import os
+import pickle
+import threading
+
+
+MAX_ROWS = 100000  # Most rows kept across every entry, about 12 MB
+MAX_ENTRY_ROWS = 5000  # Most rows kept for a single signature
+
+
+class RowCache:
+    """
+    A class to hold the valid rows found for a row's candidate digits,
+    keyed by the candidate signature, a tuple of each cell's candidate
+    digits as a tuple. Only complete row lists are kept, so a cached
+    row can skip its phase 1 search. The size is bounded by the rows
+    stored rather than the entries, as one signature can have thousands
+    of rows: a row list longer than max_entry_rows isn't cached, and the
+    least recently used entries are dropped once the cache holds more
+    than max_rows rows. The cache can be kept in a pickle file between
+    runs.
+    """
+
+    def __init__(self, max_rows: int = MAX_ROWS,
+                 max_entry_rows: int = MAX_ENTRY_ROWS, path: str = None):
+        self.max_rows = max_rows
+        self.max_entry_rows = max_entry_rows
+        self.path = path  # Pickle file the cache is kept in, None for none
+        self.entries = OrderedDict()  # Signature to its rows as tuples
+        self.n_rows = 0  # Rows held across every entry
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+        if path is not None and os.path.exists(path):
+            self.load()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, cell_values: list):
+        """
+        A function that returns a new list of the rows cached for the
+        candidate digits of a row, or None if they aren't cached.
+        """
+        key = signature(cell_values)
+
+        with self.lock:
+            rows = self.entries.get(key)
+            if rows is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+
+        return [list(row) for row in rows]
+
+    def put(self, cell_values: list, rows: list):
+        """
+        A function to cache every valid row for the candidate digits
+        of a row, dropping the least recently used entries if needed.
+        Row lists over max_entry_rows are left out.
+        """
+        if len(rows) > self.max_entry_rows:
+            return
+
+        key = signature(cell_values)
+        value = tuple(tuple(row) for row in rows)
+
+        with self.lock:
+            self.add_entry(key, value)
+
+    def add_entry(self, key: tuple, value: tuple):
+        """
+        A function to store an entry as the most recently used, then drop
+        the least recently used entries until the rows fit max_rows.
+        Called with the lock held.
+        """
+        old_value = self.entries.pop(key, None)
+        if old_value is not None:
+            self.n_rows -= len(old_value)
+
+        self.entries[key] = value
+        self.n_rows += len(value)
+        while self.n_rows > self.max_rows:
+            _, dropped = self.entries.popitem(last=False)
+            self.n_rows -= len(dropped)
+
+    def clear(self):
+        """
+        A function to remove every entry and reset the counts.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.n_rows = 0
+            self.hits = 0
+            self.misses = 0
+
+    def load(self):
+        """
+        A function to add the entries kept in the cache file,
+        most recently used last.
+        """
+        with open(self.path, "rb") as cache_file:
+            entries = pickle.load(cache_file)
+
+        with self.lock:
+            for key, rows in entries:
+                if len(rows) <= self.max_entry_rows:
+                    self.add_entry(key, rows)
+
+    def save(self):
+        """
+        A function to write the entries to the cache file, replacing any
+        existing file only once the new one is complete.
+        """
+        with self.lock:
+            entries = list(self.entries.items())
+
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as cache_file:
+            pickle.dump(entries, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self.path)
+
+
+def signature(cell_values: list):
+    """
+    A function that returns the cache key for the candidate digits
+    of a row.
+    """
+    return tuple(tuple(digits) for digits in cell_values)
+
+
+cache = None  # The row cache shared by every solver in this process
+cache_lock = threading.Lock()
+
+
+def get_cache():
+    """
+    A function that returns the process wide row cache,
+    creating it on first use.
+    """
+    global cache
+
+    with cache_lock:
+        if cache is None:
+            cache = RowCache()
+
+    return cache
+
+
+def set_cache(new_cache: RowCache):
+    """
+    A function to replace the process wide row cache, for example with
+    one kept in a file or with a different size.
+    """
+    global cache
+
+    with cache_lock:
+        cache = new_cache
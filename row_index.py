@@ -0,0 +1,145 @@
+from collections.abc import Sequence
+from itertools import permutations
+import numpy as np
+import os
+import tempfile
+import threading
+
+
+N_ROWS = 362880  # 9! orderings of the digits 1 - 9
+CHUNK_ROWS = 4096  # Rows converted to lists at once when iterating
+
+
+def default_folder():
+    """
+    A function that returns the folder the index files are kept in.
+    """
+    return os.path.join(tempfile.gettempdir(), "sudoku_row_index")
+
+
+def write_array(path: str, array):
+    """
+    A function to write an array to a .npy file, replacing any existing
+    file only once the new one is complete.
+    """
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    out = np.lib.format.open_memmap(temp_path, mode="w+",
+                                    dtype=array.dtype, shape=array.shape)
+    out[:] = array
+    out.flush()
+    del out
+    os.replace(temp_path, path)
+
+
+class RowMatches(Sequence):
+    """
+    A class to hold the rows matched in the row index as an (N x 9)
+    array of digits, 9 bytes a row, handing out each row as a list of
+    digits only when it is used. Every row of the index as lists would
+    take hundreds of megabytes.
+    """
+
+    def __init__(self, digits):
+        self.digits = digits
+
+    def __len__(self):
+        return len(self.digits)
+
+    def __getitem__(self, index):
+        return self.digits[index].tolist()
+
+    def __iter__(self):
+        for start in range(0, len(self.digits), CHUNK_ROWS):
+            yield from self.digits[start:start + CHUNK_ROWS].tolist()
+
+    def __eq__(self, other):
+        if not isinstance(other, (list, RowMatches)):
+            return NotImplemented
+        return len(self) == len(other) and list(self) == list(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"RowMatches({len(self)} rows)"
+
+
+class RowIndex:
+    """
+    A class to hold every valid sudoku row, the 9! orderings of the
+    digits 1 - 9, as a memory mapped (362880 x 9) table of digits, along
+    with a (9 x 362880) table of digit bits for each position in a row.
+    The tables are built once and kept on disk.
+    """
+
+    def __init__(self, folder: str = None):
+        if folder is None:
+            folder = default_folder()
+        self.folder = folder
+        self.table_path = os.path.join(folder, "rows.npy")
+        self.bits_path = os.path.join(folder, "row_bits.npy")
+
+        if not (os.path.exists(self.table_path) and
+                os.path.exists(self.bits_path)):
+            self.build()
+
+        self.table = np.load(self.table_path, mmap_mode="r")
+        self.bits = np.load(self.bits_path, mmap_mode="r")
+
+    def build(self):
+        """
+        A function to create the row and digit bit tables on disk.
+        """
+        os.makedirs(self.folder, exist_ok=True)
+
+        table = np.array(list(permutations(range(1, 10))), dtype=np.uint8)
+        bits = np.left_shift(np.uint16(1), table.T.astype(np.uint16) - 1)
+
+        write_array(self.table_path, table)
+        write_array(self.bits_path, np.ascontiguousarray(bits))
+
+    def find_rows(self, cell_values: list):
+        """
+        A function that returns every valid row that only uses the
+        candidate digits of each cell, in the form used for phase 2.
+        The rows are returned as RowMatches, or an empty list if none
+        match.
+        """
+        # Candidate mask for each position, most limited positions first
+        masks = []
+        for position in range(9):
+            mask = 0
+            for digit in cell_values[position]:
+                if digit > 0:
+                    mask |= 1 << (digit - 1)
+            masks.append((bin(mask).count("1"), position, mask))
+        masks.sort()
+
+        selected = None
+        for _, position, mask in masks:
+            if selected is None:
+                selected = np.flatnonzero(self.bits[position] & mask)
+            else:
+                keep = self.bits[position][selected] & mask
+                selected = selected[keep != 0]
+            if selected.size == 0:
+                return []
+
+        return RowMatches(self.table[selected])
+
+
+index = None  # The row index shared by every solver in this process
+index_lock = threading.Lock()
+
+
+def get_index():
+    """
+    A function that returns the process wide row index,
+    loading it on first use.
+    """
+    global index
+
+    with index_lock:
+        if index is None:
+            index = RowIndex()
+
+    return index
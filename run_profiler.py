@@ -0,0 +1,146 @@
+"""
+Opt-in profiling of GridSolver runs.
+
+Set a RunProfiler as a solver's profiler and each run records the CPU
+time of every phase, and with memory on the peak memory allocated in
+each phase through tracemalloc. With cpu on the run is also profiled
+with cProfile, the stats dumped to out_dir when given and summary()
+returns the top hotspots.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import solver_events as ev
+import time
+import tracemalloc
+
+
+class RunProfiler:
+    """
+    A class to profile the runs of a GridSolver. The phases are followed
+    through the solver's events, so the CPU time and peak memory of each
+    phase are added to the solver's cpu_times and peak_memory.
+    cProfile only sees the thread running the solver, so work done in
+    the pipelined worker threads or racing processes is counted in the
+    phase times but not in the hotspots.
+    """
+
+    def __init__(self, cpu: bool = True, memory: bool = False,
+                 out_dir: str = None, name: str = None):
+        self.cpu = cpu  # Profile each run with cProfile
+        self.memory = memory  # Trace the memory allocated in each phase
+        self.out_dir = out_dir  # Folder for the stats of each run
+        self.name = name  # File name of the stats, the puzzle if None
+        self.stats = None  # pstats.Stats of the last run
+        self.path = None  # Where the stats of the last run were written
+        self.solver = None
+        self.profile = None
+        self.started_tracing = False  # Tracing was started for this run
+        self.phase_starts = {}  # Phase to its CPU time and memory at start
+        self.run_memory = 0  # Memory traced when the run started
+        self.run_peak = 0  # Most memory allocated since the run started
+
+    def start(self, solver):
+        """
+        A function to start profiling a run of the solver.
+        """
+        self.solver = solver
+        self.phase_starts = {}
+        solver.events.subscribe(self.phase_event)
+
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracing = True
+        if self.memory:
+            self.run_memory = tracemalloc.get_traced_memory()[0]
+            self.run_peak = 0
+            tracemalloc.reset_peak()
+
+        self.stats = None
+        self.profile = None
+        if self.cpu:
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+
+    def stop(self):
+        """
+        A function to stop profiling the run, writing its stats
+        to out_dir if set.
+        """
+        if self.profile is not None:
+            self.profile.disable()
+            self.stats = pstats.Stats(self.profile, stream=io.StringIO())
+            self.profile = None
+
+        if self.memory and tracemalloc.is_tracing():
+            self.add_run_peak()
+            with self.solver.stats_lock:
+                self.solver.peak_memory["run"] = self.run_peak
+            if self.started_tracing:
+                tracemalloc.stop()
+                self.started_tracing = False
+
+        self.solver.events.unsubscribe(self.phase_event)
+
+        if self.stats is not None and self.out_dir is not None:
+            os.makedirs(self.out_dir, exist_ok=True)
+            name = self.name
+            if name is None:
+                name = "".join(str(digit)
+                               for row in self.solver.grid.user_rows
+                               for digit in row)
+            self.path = os.path.join(self.out_dir, name + ".prof")
+            self.stats.dump_stats(self.path)
+
+    def phase_event(self, event: ev.SolverEvent):
+        """
+        A function to record the CPU time and peak memory
+        of each phase from the solver's events.
+        """
+        if event.kind == ev.PHASE_START:
+            memory = 0
+            if self.memory and tracemalloc.is_tracing():
+                self.add_run_peak()
+                memory = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+            self.phase_starts[event.data["phase"]] = (time.process_time(),
+                                                      memory)
+
+        elif event.kind == ev.PHASE_END:
+            phase = event.data["phase"]
+            if phase not in self.phase_starts:
+                return
+            cpu_start, memory = self.phase_starts.pop(phase)
+            cpu_time = time.process_time() - cpu_start
+
+            with self.solver.stats_lock:
+                cpu_times = self.solver.cpu_times
+                cpu_times[phase] = cpu_times.get(phase, 0) + cpu_time
+
+                if self.memory and tracemalloc.is_tracing():
+                    peak = tracemalloc.get_traced_memory()[1] - memory
+                    peak_memory = self.solver.peak_memory
+                    peak_memory[phase] = max(peak_memory.get(phase, 0), peak)
+
+    def add_run_peak(self):
+        """
+        A function to keep the peak memory of the run before the
+        traced peak is reset for a phase.
+        """
+        peak = tracemalloc.get_traced_memory()[1] - self.run_memory
+        self.run_peak = max(self.run_peak, peak)
+
+    def summary(self, top: int = 10):
+        """
+        A function that returns the top functions of the last run by
+        cumulative time as text, empty if it wasn't profiled.
+        """
+        if self.stats is None:
+            return ""
+
+        stream = io.StringIO()
+        self.stats.stream = stream
+        self.stats.sort_stats("cumulative").print_stats(top)
+        return stream.getvalue()
@@ -0,0 +1,247 @@
+from multiprocessing import Pool, shared_memory
+import numpy as np
+import os
+import puzzle_corpus as pc
+import queue
+import sudoku_api as api
+
+
+# Status of each puzzle in a batch
+PENDING = 0
+SOLVED = 1
+UNSOLVED = 2
+INVALID = 3
+TIMEOUT = 4
+STATUS_CODES = {"solved": SOLVED, "unsolved": UNSOLVED,
+                "invalid": INVALID, "timeout": TIMEOUT}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+STATUS_NAMES[PENDING] = "pending"
+
+# Name, shape of each puzzle's entry and type of each shared array
+ARRAYS = [("puzzles", (81,), np.uint8),
+          ("solutions", (81,), np.uint8),
+          ("status", (), np.uint8),
+          ("times", (), np.float64)]
+
+
+def create_arrays(capacity: int):
+    """
+    A function that creates the shared memory blocks for a batch of up to
+    capacity puzzles. Returns the blocks and arrays keyed by name.
+    """
+    blocks = {}
+    arrays = {}
+
+    for name, shape, dtype in ARRAYS:
+        full_shape = (capacity,) + shape
+        size = max(1, int(np.prod(full_shape)) * np.dtype(dtype).itemsize)
+        block = shared_memory.SharedMemory(create=True, size=size)
+        blocks[name] = block
+        arrays[name] = np.ndarray(full_shape, dtype=dtype, buffer=block.buf)
+
+    return blocks, arrays
+
+
+def attach_arrays(names: dict, capacity: int):
+    """
+    A function that attaches to the shared memory blocks of a batch
+    created in another process. Returns the blocks and arrays keyed by name.
+    """
+    blocks = {}
+    arrays = {}
+
+    for name, shape, dtype in ARRAYS:
+        block = shared_memory.SharedMemory(name=names[name])
+        blocks[name] = block
+        arrays[name] = np.ndarray((capacity,) + shape, dtype=dtype,
+                                  buffer=block.buf)
+
+    return blocks, arrays
+
+
+worker_blocks = None  # Shared blocks attached by this worker process
+worker_arrays = None
+worker_options = None
+
+
+def init_worker(names: dict, capacity: int, options: dict):
+    """
+    A function to attach a worker process to the shared batch arrays
+    once, when the worker starts.
+    """
+    global worker_blocks, worker_arrays, worker_options
+
+    worker_blocks, worker_arrays = attach_arrays(names, capacity)
+    worker_options = options
+
+
+def solve_range(descriptor: tuple):
+    """
+    A function that solves the puzzles in a range of the shared batch,
+    given as (offset, count, engine), writing each result in place.
+    Puzzles already marked invalid are skipped.
+    Returns the descriptor and the puzzles that ran out of time.
+    """
+    offset, count, engine = descriptor
+    puzzles = worker_arrays["puzzles"]
+    solutions = worker_arrays["solutions"]
+    status = worker_arrays["status"]
+    times = worker_arrays["times"]
+    seed = worker_options["seed"]
+    timeout = worker_options["timeout"]
+    if engine == "exact":
+        timeout = worker_options["exact_timeout"]
+    timed_out = []
+
+    for index in range(offset, offset + count):
+        if status[index] == INVALID:
+            continue
+        result = api.solve(pc.puzzle_rows(puzzles[index]),
+                           engine=engine,
+                           seed=None if seed is None else seed + index,
+                           timeout=timeout,
+                           fallback=worker_options["fallback"])
+
+        if result.solved:
+            solutions[index] = np.asarray(result.solution,
+                                          dtype=np.uint8).reshape(81)
+        else:
+            solutions[index] = 0
+        times[index] += result.time
+        status[index] = STATUS_CODES[result.status]
+
+        if result.status == "timeout":
+            timed_out.append(index)
+
+    return descriptor, timed_out
+
+
+class SharedBatchSolver:
+    """
+    A class to solve batches of puzzles in a pool of worker processes
+    through shared memory. Each batch is copied into a shared puzzle
+    array, the workers are sent only (offset, count, engine) descriptors
+    and write the solutions, statuses and times straight into shared
+    arrays. The pool and arrays are created once and reused for every
+    batch of up to capacity puzzles.
+    Descriptors wait in the pool's shared task queue and shrink towards
+    the end of a batch, so a worker held up by a hard puzzle leaves the
+    rest to the others. A puzzle that runs out of time with the ga is
+    queued again for the exact engine.
+    """
+
+    def __init__(self, capacity: int, workers: int = None,
+                 engine: str = "ga", timeout: float = None,
+                 seed: int = None, fallback: bool = False,
+                 max_unit: int = 16, exact_timeout: float = None):
+        if workers is None:
+            workers = os.cpu_count()
+        self.capacity = capacity
+        self.workers = workers
+        self.engine = engine
+        self.max_unit = max_unit  # Most puzzles in a descriptor
+        self.requeued = 0  # Puzzles queued again for the exact engine
+        self.blocks, self.arrays = create_arrays(capacity)
+
+        names = {}
+        for name, block in self.blocks.items():
+            names[name] = block.name
+        options = {"timeout": timeout, "exact_timeout": exact_timeout,
+                   "seed": seed, "fallback": fallback}
+
+        try:
+            self.pool = Pool(processes=workers, initializer=init_worker,
+                             initargs=(names, capacity, options))
+        except BaseException:
+            self.release()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def descriptors(self, count: int):
+        """
+        A function that splits count puzzles into (offset, count, engine)
+        ranges, each a share of the puzzles left so the ranges get
+        smaller towards the end, down to single puzzles.
+        """
+        descriptors = []
+        offset = 0
+
+        while offset < count:
+            size = int((count - offset) / (self.workers * 4))
+            size = max(1, min(self.max_unit, size))
+            descriptors.append((offset, size, self.engine))
+            offset += size
+
+        return descriptors
+
+    def solve(self, puzzles, valid=None):
+        """
+        A function that solves an (N, 81) array of puzzle digits, 0 for
+        empty cells. Puzzles that are False in the optional valid array,
+        such as records that couldn't be read, are marked invalid without
+        being solved. Returns copies of the solutions, statuses and times
+        of the batch, the solution 0 where a puzzle wasn't solved.
+        """
+        puzzles = np.asarray(puzzles, dtype=np.uint8).reshape(-1, 81)
+        count = puzzles.shape[0]
+        if count > self.capacity:
+            raise ValueError(f"Batch of {count} puzzles is over the " +
+                             f"capacity of {self.capacity}")
+
+        self.arrays["puzzles"][:count] = puzzles
+        self.arrays["status"][:count] = PENDING
+        if valid is not None:
+            self.arrays["status"][:count][~np.asarray(valid)] = INVALID
+        self.arrays["solutions"][:count] = 0
+        self.arrays["times"][:count] = 0
+        finished = queue.Queue()  # Results or errors as they arrive
+
+        def submit(descriptor: tuple):
+            self.pool.apply_async(solve_range, (descriptor,),
+                                  callback=finished.put,
+                                  error_callback=finished.put)
+
+        pending = 0
+        for descriptor in self.descriptors(count):
+            submit(descriptor)
+            pending += 1
+
+        while pending:
+            result = finished.get()
+            pending -= 1
+            if isinstance(result, BaseException):
+                raise result
+
+            descriptor, timed_out = result
+            if descriptor[2] != "exact":
+                for index in timed_out:
+                    submit((index, 1, "exact"))
+                    pending += 1
+                    self.requeued += 1
+
+        return (self.arrays["solutions"][:count].copy(),
+                self.arrays["status"][:count].copy(),
+                self.arrays["times"][:count].copy())
+
+    def close(self):
+        """
+        A function to stop the workers and free the shared memory.
+        """
+        self.pool.terminate()
+        self.pool.join()
+        self.release()
+
+    def release(self):
+        """
+        A function to free the shared memory blocks.
+        """
+        self.arrays = {}
+        for block in self.blocks.values():
+            block.close()
+            block.unlink()
+        self.blocks = {}
@@ -0,0 +1,353 @@
+"""
+A local HTTP service to solve sudoku puzzles for other tools.
+
+Listens on 127.0.0.1 only. Puzzles are solved in a pool of worker
+processes started and warmed up before the first request. Requests wait
+in a bounded queue and are turned away with 503 when it is full, each
+has a deadline after which it stops, and any request can be cancelled.
+
+POST /solve   {"puzzle": "...", "engine": "ga", "seed": 1, "timeout": 5,
+               "id": "any name", "events": true} returns the result as
+              JSON, with the solver's progress events if events is true.
+POST /cancel  {"id": "..."} cancels a queued or running request.
+GET /metrics  returns the request counts, queue use and latencies.
+GET /health   returns {"status": "ok"}.
+"""
+
+from collections import deque
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import json
+import multiprocessing
+import os
+import sudoku_api as api
+import threading
+import time
+import uuid
+
+
+HOST = "127.0.0.1"  # The service is only reachable from this machine
+LATENCY_SAMPLES = 1000  # Recent request latencies kept for the metrics
+
+
+cancel_flags = None  # Cancel flag of each request slot, in the workers
+
+
+def init_worker(flags):
+    """
+    A function to warm up a worker process when it starts, loading the
+    solver modules and the tables they share between solves.
+    """
+    global cancel_flags
+    cancel_flags = flags
+
+    import dlx_solver as dlx
+    import grid_solver as gsol
+    dlx.get_links()
+    if gsol.ri is not None:
+        gsol.ri.get_index()
+
+
+def ready():
+    """
+    A function that returns once a worker process has started.
+    """
+    return os.getpid()
+
+
+def solve_request(slot: int, puzzle, engine: str, seed: int,
+                  deadline: float, events: bool = False):
+    """
+    A function that solves a request's puzzle in a worker process,
+    stopping at the deadline or once the request's slot is cancelled.
+    Returns the result as a dictionary, with the solver's progress
+    events if asked for.
+    """
+    time_left = deadline - time.time()
+    if time_left <= 0:  # Expired while waiting in the queue
+        return api.SolveResult(api.puzzle_text(puzzle) or str(puzzle),
+                               "timeout").to_dict()
+
+    found = []  # Events of the solve when asked for
+    on_event = None
+    if events:
+        on_event = lambda event: found.append(event.to_dict())  # noqa: E731
+
+    result = api.solve(puzzle, engine=engine, seed=seed, timeout=time_left,
+                       stop=lambda: cancel_flags[slot] == 1,
+                       on_event=on_event).to_dict()
+    if events:
+        result["events"] = found
+    return result
+
+
+class SolveService:
+    """
+    A class to run the solve service. The worker pool is created and
+    warmed up before the server starts. Each request takes one of a
+    fixed number of slots, workers plus queue_size, for as long as it is
+    queued or running, so a full queue turns new requests away.
+    """
+
+    def __init__(self, port: int = 8765, workers: int = None,
+                 queue_size: int = 32, max_timeout: float = 60.0):
+        if workers is None:
+            workers = os.cpu_count()
+        self.workers = workers
+        self.queue_size = queue_size
+        self.max_timeout = max_timeout  # Longest deadline allowed
+        self.n_slots = workers + queue_size
+
+        self.cancel_flags = multiprocessing.Array("b", self.n_slots,
+                                                  lock=False)
+        self.free_slots = list(range(self.n_slots))
+        self.requests = {}  # Request id to its slot and future
+        self.lock = threading.Lock()
+
+        self.counts = {"requests": 0, "solved": 0, "unsolved": 0,
+                       "invalid": 0, "timeout": 0, "cancelled": 0,
+                       "rejected": 0, "errors": 0}
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.start_time = time.time()
+
+        self.pool = ProcessPoolExecutor(max_workers=workers,
+                                        initializer=init_worker,
+                                        initargs=(self.cancel_flags,))
+        self.warm_up()
+
+        handler = type("Handler", (ServiceHandler,), {"service": self})
+        self.server = ThreadingHTTPServer((HOST, port), handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def warm_up(self):
+        """
+        A function to start every worker process before the first request.
+        """
+        futures = [self.pool.submit(ready) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def start(self):
+        """
+        A function to serve requests in a background thread.
+        """
+        self.thread = threading.Thread(target=self.server.serve_forever,
+                                       daemon=True)
+        self.thread.start()
+
+    def serve_forever(self):
+        """
+        A function to serve requests until interrupted.
+        """
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def close(self):
+        """
+        A function to stop the server and the worker processes,
+        cancelling any requests still running.
+        """
+        if self.thread is not None:
+            self.server.shutdown()
+            self.thread = None
+        self.server.server_close()
+
+        with self.lock:
+            for slot, _ in self.requests.values():
+                self.cancel_flags[slot] = 1
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+    def solve(self, request: dict):
+        """
+        A function that solves a request, waiting for a free slot only if
+        one is free now. Returns the HTTP status and the response.
+        """
+        request_id = str(request.get("id") or uuid.uuid4())
+        timeout = request.get("timeout", self.max_timeout)
+        if not isinstance(timeout, (int, float)) or timeout <= 0:
+            return 400, {"id": request_id,
+                         "error": "timeout must be a number above 0"}
+        timeout = min(timeout, self.max_timeout)
+        deadline = time.time() + timeout
+
+        with self.lock:
+            self.counts["requests"] += 1
+            if request_id in self.requests:
+                return 409, {"id": request_id,
+                             "error": "A request with this id is running"}
+            if not self.free_slots:
+                self.counts["rejected"] += 1
+                return 503, {"id": request_id,
+                             "error": "Queue is full, try again later"}
+
+            slot = self.free_slots.pop()
+            self.cancel_flags[slot] = 0
+            future = self.pool.submit(solve_request, slot,
+                                      request.get("puzzle"),
+                                      request.get("engine", "ga"),
+                                      request.get("seed"), deadline,
+                                      bool(request.get("events")))
+            self.requests[request_id] = (slot, future)
+
+        start_time = time.time()
+        try:
+            result = future.result()
+            code = 200
+        except CancelledError:  # Cancelled while still in the queue
+            result = {"status": "cancelled", "solved": False}
+            code = 200
+        except ValueError as error:  # Unknown engine
+            result = {"error": str(error)}
+            code = 400
+        except Exception as error:
+            result = {"error": f"Solver failed: {error}"}
+            code = 500
+        finally:
+            with self.lock:
+                del self.requests[request_id]
+                self.free_slots.append(slot)
+
+        with self.lock:
+            if code == 200:
+                self.counts[result["status"]] += 1
+            else:
+                self.counts["errors"] += 1
+            self.latencies.append(time.time() - start_time)
+
+        result["id"] = request_id
+        return code, result
+
+    def cancel(self, request_id: str):
+        """
+        A function to cancel a queued or running request.
+        Returns True if the request was found.
+        """
+        with self.lock:
+            entry = self.requests.get(str(request_id))
+            if entry is None:
+                return False
+            slot, future = entry
+            self.cancel_flags[slot] = 1
+        future.cancel()  # Only works while the request is queued
+        return True
+
+    def metrics(self):
+        """
+        A function that returns the service metrics as a dictionary.
+        """
+        with self.lock:
+            latencies = sorted(self.latencies)
+            metrics = dict(self.counts)
+            metrics["in_flight"] = len(self.requests)
+            metrics["slots"] = self.n_slots
+            metrics["workers"] = self.workers
+
+        metrics["uptime"] = round(time.time() - self.start_time, 3)
+        if latencies:
+            metrics["latency_mean"] = round(sum(latencies) /
+                                            len(latencies), 6)
+            for name, share in (("latency_p50", 0.5), ("latency_p99", 0.99)):
+                index = min(len(latencies) - 1, int(len(latencies) * share))
+                metrics[name] = round(latencies[index], 6)
+        return metrics
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """
+    A class to handle the HTTP requests of a SolveService.
+    """
+
+    service = None  # Set on the handler class made for each service
+
+    def log_message(self, format, *args):
+        pass  # Keep the console quiet under load
+
+    def send_json(self, code: int, body: dict):
+        """
+        A function to send a JSON response.
+        """
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if code == 503:
+            self.send_header("Retry-After", "1")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def read_json(self):
+        """
+        A function that returns the request body as a dictionary,
+        or None if it isn't a JSON object.
+        """
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return None
+        if not isinstance(body, dict):
+            return None
+        return body
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            self.send_json(200, self.service.metrics())
+        elif self.path == "/health":
+            self.send_json(200, {"status": "ok"})
+        else:
+            self.send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        if self.path not in ("/solve", "/cancel"):
+            self.send_json(404, {"error": "Not found"})
+            return
+
+        request = self.read_json()
+        if request is None:
+            self.send_json(400, {"error": "Body must be a JSON object"})
+        elif self.path == "/solve":
+            self.send_json(*self.service.solve(request))
+        else:
+            found = self.service.cancel(request.get("id"))
+            self.send_json(200 if found else 404,
+                           {"id": request.get("id"), "cancelled": found})
+
+
+def main(argv: list = None):
+    """
+    A function to run the service from the command line.
+    """
+    parser = argparse.ArgumentParser(
+        description=f"Serve sudoku solves over HTTP on {HOST}.")
+    parser.add_argument("-p", "--port", type=int, default=8765,
+                        help="port to listen on (default: 8765)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(),
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("-q", "--queue-size", type=int, default=32,
+                        help="requests allowed to wait (default: 32)")
+    parser.add_argument("-t", "--max-timeout", type=float, default=60.0,
+                        help="longest deadline allowed in seconds " +
+                             "(default: 60)")
+    args = parser.parse_args(argv)
+
+    service = SolveService(args.port, args.workers, args.queue_size,
+                           args.max_timeout)
+    print(f"Serving on http://{HOST}:{service.port}", flush=True)
+    service.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,13 +5,22 @@ Employs a GUI to allow a user to enter an unsolved sudoku puzzle and run the
 genetic algorithm to solve the puzzle. The solution can then be displayed
 to the user through the GUI. The user can also request hints or validate
 their guesses to check for correctness against the solution.
+
+Given command line arguments, puzzles are solved without the GUI instead,
+see batch_solver.py.
 """
 
-import gui
+import sys
 
 
 if __name__ == "__main__":
 
+    if len(sys.argv) > 1:
+        # Solve puzzles from a file or stdin without the GUI
+        import batch_solver
+        sys.exit(batch_solver.main(sys.argv[1:]))
+
     # Create the GUI and start the program
+    import gui
     solver = gui.GUI()
     solver.display_window()
@@ -0,0 +1,247 @@
+"""
+Progress events sent by the grid solver.
+
+The solver emits typed events to an EventStream rather than writing text,
+each stamped with time.monotonic(). Subscribers are called with every
+event in the order they happen, and TextOutput turns the events back
+into the progress messages shown to the user.
+"""
+
+from typing import Callable
+import threading
+import time
+
+
+# Kinds of event, the data each carries is listed alongside
+ATTEMPT_START = "attempt_start"  # attempt, unit ("attempt" or "round"),
+#                                  racers
+ATTEMPT_END = "attempt_end"  # attempt, unit, outcome ("solved", "progress",
+#                              "retry", "failed" or "stopped"), elapsed
+PHASE_START = "phase_start"  # phase
+PHASE_END = "phase_end"  # phase, ok, stopped, seconds
+SEARCH_DONE = "search_done"  # phase, method ("cache", "index", "enumerate",
+#                              "ga" or "race"), results, evaluations
+CELLS_FIXED = "cells_fixed"  # source ("setup" or "update"), cells
+SOLVED = "solved"  # source ("store", "attempt", "round" or "exact"),
+#                    count, elapsed
+FAILED = "failed"  # reason ("conflict", "attempt" or "round"), count,
+#                    fallback, elapsed
+STOPPED = "stopped"  # elapsed
+
+# Names of the phases in the text output
+PHASE_NAMES = {"phase_1": "Phase 1", "phase_2": "Phase 2",
+               "phase_3": "Phase 3", "streaming": "Streaming",
+               "pipelined": "Pipelined", "exact": "Exact solver"}
+
+
+class SolverEvent:
+    """
+    A class to hold a single solver event, its kind, the monotonic time
+    it happened and the data that goes with it.
+    """
+
+    __slots__ = ("kind", "time", "data")
+
+    def __init__(self, kind: str, data: dict):
+        self.kind = kind
+        self.time = time.monotonic()
+        self.data = data
+
+    def __repr__(self):
+        return f"SolverEvent({self.kind!r}, {self.data!r})"
+
+    def to_dict(self):
+        """
+        A function that returns the event as a dictionary
+        ready to be written as JSON.
+        """
+        event = {"type": self.kind, "time": self.time}
+        event.update(self.data)
+        return event
+
+
+class EventStream:
+    """
+    A class to pass solver events to its subscribers. No event is built
+    while there are no subscribers, so emitting costs little when
+    nothing is listening.
+    """
+
+    def __init__(self):
+        self.subscribers = []
+        self.lock = threading.Lock()
+
+    def subscribe(self, subscriber: Callable):
+        """
+        A function to call subscriber with each event from now on.
+        """
+        with self.lock:
+            self.subscribers = self.subscribers + [subscriber]
+
+    def unsubscribe(self, subscriber: Callable):
+        """
+        A function to stop calling subscriber with events.
+        """
+        with self.lock:
+            self.subscribers = [entry for entry in self.subscribers
+                                if entry != subscriber]
+
+    def emit(self, kind: str, **data):
+        """
+        A function to send an event to every subscriber.
+        """
+        subscribers = self.subscribers  # Replaced, never changed in place
+        if not subscribers:
+            return
+
+        event = SolverEvent(kind, data)
+        for subscriber in subscribers:
+            subscriber(event)
+
+
+def convert_time(run_time: float):
+    """
+    A function to convert a run time in seconds into
+    minutes and seconds and returns it as a string.
+    """
+    minutes = int(run_time / 60)
+    seconds = int(run_time % 60)
+    result = ""
+
+    if minutes > 0:
+        result += f"{minutes} minute"
+        if minutes > 1:
+            result += "s"
+        result += " "
+
+    if seconds < 10:
+        result += "0"
+
+    result += f"{seconds} second"
+    if not seconds == 1:
+        result += "s"
+    return result
+
+
+def conflict_message(run_time: float):
+    """
+    A function that returns the message given when the grid
+    can't be solved due to conflicting cell values.
+    """
+    return ("Unable to find the solution.\n" +
+            "Got stuck due to conflicts in cell values.\n" +
+            "Check that grid entry is correct.\n" +
+            "Click 'START' when ready to try again.\n" +
+            "Solver ran for " +
+            f"{convert_time(run_time)}.\n\n")
+
+
+def plural(count: int, word: str):
+    """
+    A function that returns the count and the word, made plural
+    unless the count is 1.
+    """
+    return f"{count} {word}" + ("s" if count > 1 else "")
+
+
+class TextOutput:
+    """
+    A class to subscribe an output function, such as the GUI output box,
+    to a solver's events. Each event is written as the progress text
+    the user sees.
+    """
+
+    def __init__(self, output: Callable):
+        self.output = output
+        self.phase_open = False  # A phase has been written on this line
+
+    def __call__(self, event: SolverEvent):
+        text = self.text(event)
+        if text:
+            self.output(text)
+
+    def text(self, event: SolverEvent):
+        """
+        A function that returns the text written for an event.
+        """
+        data = event.data
+        kind = event.kind
+
+        if kind == SEARCH_DONE:
+            return "."
+
+        if kind in (PHASE_START, PHASE_END) and \
+                data["phase"] not in PHASE_NAMES:
+            return ""  # Not shown, such as the setup before each attempt
+
+        if kind == PHASE_START:
+            name = PHASE_NAMES[data["phase"]]
+            if data["phase"] == "exact":
+                return name + " "
+            text = f"        {name} "
+            if self.phase_open:
+                text = "\n" + text
+            self.phase_open = True
+            return text
+
+        if kind == PHASE_END:
+            if data["stopped"]:
+                return ""
+            text = " Ok" if data["ok"] else " X"
+            if data["phase"] == "exact":
+                text += "\n"
+            return text
+
+        if kind == ATTEMPT_START:
+            self.phase_open = False
+            if data["unit"] == "round":
+                return (f"Round {data['attempt']}: " +
+                        f"racing {data['racers']} attempts ")
+            return f"Attempt {data['attempt']}:\n"
+
+        if kind == ATTEMPT_END:
+            self.phase_open = False
+            unit = data["unit"]
+            if data["outcome"] == "stopped":
+                return "\n" if unit == "round" else ""
+
+            text = "\n"
+            if data["outcome"] == "progress":
+                text += ("Found part of the solution, " +
+                         f"starting new {unit}.\n" +
+                         "Current time elapsed: " +
+                         f"{convert_time(data['elapsed'])}.\n\n")
+            elif data["outcome"] == "retry":
+                text += ("Didn't find anything this " +
+                         ("round" if unit == "round" else "try") +
+                         f", starting new {unit}.\n" +
+                         "Current time elapsed: " +
+                         f"{convert_time(data['elapsed'])}.\n\n")
+            return text
+
+        if kind == SOLVED:
+            if data["source"] == "store":
+                return ("Solution found in the puzzle store!\n" +
+                        "Solver ran for " +
+                        f"{convert_time(data['elapsed'])}.\n\n")
+            unit = data["source"]
+            if unit == "exact":
+                unit = "search step"
+            return ("Valid solution found after " +
+                    f"{plural(data['count'], unit)}!\n" +
+                    f"Solver ran for {convert_time(data['elapsed'])}.\n\n")
+
+        if kind == FAILED:
+            if data["reason"] == "conflict":
+                return conflict_message(data["elapsed"])
+            text = ("Unable to find the solution after " +
+                    f"{data['count']} {data['reason']}s.\n")
+            if not data["fallback"]:
+                text += ("Solver ran for " +
+                         f"{convert_time(data['elapsed'])}.\n\n")
+            return text
+
+        if kind == STOPPED:
+            return "\nStopped solving grid.\n\n"
+
+        return ""
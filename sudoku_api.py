@@ -0,0 +1,246 @@
+"""
+A small library interface to the sudoku solver.
+
+solve() takes a puzzle and returns a SolveResult, without needing a
+prepared SudokuGrid or an output function. Nothing here imports tkinter,
+and the solver modules are only loaded on the first solve so importing
+this module stays quick.
+"""
+
+from typing import Callable
+import random
+import threading
+import time
+
+
+STOP_CHECK = 0.05  # Seconds between checks for a stop
+
+
+class SolveResult:
+    """
+    A class to hold the result of solving a single puzzle.
+    Status is "solved", "unsolved" when the solver gave up, "invalid"
+    when the puzzle can't be read or its digits conflict, "timeout"
+    when the solver was stopped at the time limit, or "cancelled" when
+    it was stopped by the caller.
+    """
+
+    def __init__(self, puzzle: str, status: str, solution: list = None,
+                 error: str = None):
+        self.puzzle = puzzle  # The puzzle as 81 digits, 0 for empty cells
+        self.status = status
+        self.solution = solution  # The solved 9x9 grid, None if unsolved
+        self.error = error  # Why the puzzle is invalid
+        self.engine = None
+        self.attempts = 0
+        self.time = 0.0
+        self.phase_times = {}
+        self.evaluations = {}
+        self.deductions = {}  # Hits and seconds of each deduction strategy
+        self.cpu_times = {}  # CPU seconds in each phase, when profiled
+        self.peak_memory = {}  # Peak bytes in each phase, when traced
+        self.messages = []  # The solver's progress output
+
+    def __repr__(self):
+        return (f"SolveResult(status={self.status!r}, " +
+                f"solution={self.solution_string()!r}, " +
+                f"attempts={self.attempts}, time={self.time:.6f})")
+
+    @property
+    def solved(self):
+        return self.status == "solved"
+
+    def solution_string(self):
+        """
+        A function that returns the solution as 81 digits,
+        or None if unsolved.
+        """
+        if self.solution is None:
+            return None
+        return "".join(str(digit) for row in self.solution for digit in row)
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """
+        A function that returns the result written by to_dict.
+        """
+        solution = None
+        if data.get("solution") is not None:
+            text = data["solution"]
+            solution = [[int(digit) for digit in text[row_num * 9:
+                                                      row_num * 9 + 9]]
+                        for row_num in range(9)]
+
+        result = cls(data["puzzle"], data["status"], solution,
+                     data.get("error"))
+        result.engine = data.get("engine")
+        result.attempts = data.get("attempts", 0)
+        result.time = data.get("time", 0.0)
+        result.phase_times = dict(data.get("phase_times", {}))
+        result.evaluations = dict(data.get("evaluations", {}))
+        result.deductions = {}
+        for name, stats in data.get("deductions", {}).items():
+            result.deductions[name] = dict(stats)
+        result.cpu_times = dict(data.get("cpu_times", {}))
+        result.peak_memory = dict(data.get("peak_memory", {}))
+        return result
+
+    def to_dict(self):
+        """
+        A function that returns the result as a dictionary
+        ready to be written as JSON.
+        """
+        result = {"puzzle": self.puzzle,
+                  "status": self.status,
+                  "solved": self.solved,
+                  "solution": self.solution_string(),
+                  "engine": self.engine,
+                  "attempts": self.attempts,
+                  "time": round(self.time, 6),
+                  "phase_times": {},
+                  "evaluations": dict(self.evaluations)}
+        for name, seconds in self.phase_times.items():
+            result["phase_times"][name] = round(seconds, 6)
+        if self.deductions:
+            result["deductions"] = {}
+            for name, stats in self.deductions.items():
+                result["deductions"][name] = {
+                    "hits": stats["hits"],
+                    "seconds": round(stats["seconds"], 6)}
+        if self.cpu_times:
+            result["cpu_times"] = {}
+            for name, seconds in self.cpu_times.items():
+                result["cpu_times"][name] = round(seconds, 6)
+        if self.peak_memory:
+            result["peak_memory"] = dict(self.peak_memory)
+        if self.error is not None:
+            result["error"] = self.error
+        return result
+
+
+def puzzle_text(puzzle):
+    """
+    A function that returns a puzzle given as text or as a 9x9 grid
+    as a string of 81 characters, or None if it isn't either.
+    """
+    if isinstance(puzzle, str):
+        return puzzle.strip()
+
+    try:
+        rows = [list(row) for row in puzzle]
+    except TypeError:
+        return None
+    if len(rows) != 9 or any(len(row) != 9 for row in rows):
+        return None
+
+    text = ""
+    for row in rows:
+        for cell in row:
+            if not isinstance(cell, int) or not 0 <= cell <= 9:
+                return None
+            text += str(cell)
+    return text
+
+
+def solve(puzzle, *, engine: str = "ga", seed: int = None,
+          timeout: float = None, fallback: bool = False,
+          stop: Callable = None, output: Callable = None,
+          on_event: Callable = None, profiler=None, store=None):
+    """
+    A function that solves a puzzle, given as 81 characters with 0 or .
+    for empty cells or as a 9x9 grid of digits, and returns a SolveResult.
+    Engine is "ga" for the genetic algorithm or "exact". Seed makes a ga
+    run repeatable using its own random.Random, leaving the state of the
+    random module alone. Timeout stops the solver after that many seconds
+    and fallback uses the exact solver if the ga gives up. Stop is checked
+    while solving and cancels the solve once it returns True, output
+    is called with each progress message as it is written and on_event
+    with each solver_events.SolverEvent as it happens. A
+    run_profiler.RunProfiler profiles the solve, adding the CPU time and
+    peak memory of each phase to the result. Store, a
+    puzzle_store.PuzzleStore or the path of one, answers puzzles solved
+    before and keeps each new solution.
+    """
+    # Loaded on first use to keep importing this module quick
+    import grid_solver as gsol
+    import sudoku_grid as sg
+
+    if engine not in ("ga", "exact"):
+        raise ValueError(f"Unknown engine {engine!r}, use 'ga' or 'exact'")
+
+    text = puzzle_text(puzzle)
+    grid = sg.SudokuGrid()
+    if text is None or not grid.load_puzzle(text):
+        return SolveResult(str(puzzle), "invalid", error="Puzzle must be " +
+                           "81 digits, 0 or . for empty cells")
+
+    text = text.replace(".", "0")
+    if not grid.check_user_grid():
+        return SolveResult(text, "invalid",
+                           error="Puzzle has conflicting cell values")
+
+    messages = []
+
+    def add_message(message: str, tag: str = ""):
+        messages.append(message)
+        if output is not None:
+            output(message)
+
+    solver = gsol.GridSolver(grid, add_message, engine=engine,
+                             fallback=fallback)
+    if on_event is not None:
+        solver.events.subscribe(on_event)
+    solver.profiler = profiler
+    solver.store = store
+    if isinstance(store, str):
+        import puzzle_store as ps
+        solver.store = ps.PuzzleStore(store)  # Open for this solve only
+    if seed is not None:
+        solver.rng = random.Random(seed)  # Leaves the global random alone
+
+    start_time = time.time()
+    stopped = None  # "timeout" or "cancelled" if the solver was stopped
+    if timeout is None and stop is None:
+        solver.run()
+    else:
+        # Run in a thread so the solver can be stopped early
+        thread = threading.Thread(target=solver.run, daemon=True)
+        thread.start()
+        while thread.is_alive():
+            wait_time = STOP_CHECK
+            if timeout is not None:
+                time_left = start_time + timeout - time.time()
+                if time_left <= 0:
+                    stopped = "timeout"
+                    break
+                wait_time = min(wait_time, time_left)
+            if stop is not None and stop():
+                stopped = "cancelled"
+                break
+            thread.join(wait_time)
+
+        if stopped is not None:
+            solver.thread_running = False
+            thread.join()
+
+    if solver.solved:
+        result = SolveResult(text, "solved", grid.current_solution)
+    elif stopped is not None:
+        result = SolveResult(text, stopped)
+    else:
+        result = SolveResult(text, "unsolved")
+
+    result.engine = engine
+    result.attempts = solver.attempts
+    result.time = time.time() - start_time
+    result.phase_times = dict(solver.phase_times)
+    result.evaluations = dict(solver.evaluations)
+    for name, stats in solver.deductions.items():
+        result.deductions[name] = dict(stats)
+    result.cpu_times = dict(solver.cpu_times)
+    result.peak_memory = dict(solver.peak_memory)
+    result.messages = messages
+
+    if isinstance(store, str):
+        solver.store.close()
+    return result
@@ -1,3 +1,6 @@
+import dlx_solver as dlx
+
+
 class SudokuGrid:
     """
     A class to represent a 9x9 sudoku grid.
@@ -18,6 +21,7 @@ class SudokuGrid:
 
         self.current_row = 0
         self.phase = 0
+        self.evaluations = 0  # Fitness evaluations made through this grid
 
     def __repr__(self):
         result = "Grid\n"
@@ -45,6 +49,7 @@ class SudokuGrid:
         A function that allows the fitness function to be called
         and returns the fitness value.
         """
+        self.evaluations += 1
         return self.fitness(params)
 
     def fitness(self, params):
@@ -224,3 +229,53 @@ class SudokuGrid:
                 new_row.append(entry)
 
         return len(set(new_row)) < len(new_row)
+
+    def count_solutions(self, limit: int = 2):
+        """
+        A function that counts the solutions of the user grid,
+        stopping once the limit is reached.
+        """
+        return dlx.count_solutions(self.user_rows, limit)
+
+    def has_unique_solution(self):
+        """
+        A function to check the user grid has exactly one solution.
+        Returns True or False.
+        """
+        return self.count_solutions(2) == 1
+
+    def load_puzzle(self, text: str):
+        """
+        A function to set the user grid from a puzzle written as 81
+        characters across each row in turn, 0 or . for empty cells.
+        Returns False if the text isn't a puzzle.
+        """
+        text = text.strip()
+        if len(text) != 81:
+            return False
+
+        rows = []
+        for row_num in range(9):
+            this_row = []
+            for char in text[row_num * 9: row_num * 9 + 9]:
+                if char == ".":
+                    this_row.append(0)
+                elif char in "0123456789":
+                    this_row.append(int(char))
+                else:
+                    return False
+            rows.append(this_row)
+
+        self.user_rows = rows
+        return True
+
+    def solution_string(self):
+        """
+        A function that returns the current solution as 81 digits
+        across each row in turn.
+        """
+        result = ""
+        for row in self.current_solution:
+            for cell in row:
+                result += str(cell)
+        return result
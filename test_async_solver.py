@@ -0,0 +1,122 @@
+import async_solver as asol
+import asyncio
+import unittest
+
+
+def puzzles_for_tests():
+    """
+    A function to build the puzzles used in tests
+    """
+    easy = ("..21...7..8...6..113..8...2.59..82.....391....." +
+            "75..38.2...5..378..6...2..7...34..")
+    hard = ("800000000003600000070090200050007000000045700" +
+            "000100030001000068008500010090000400")
+
+    return easy, hard
+
+
+class TestAsyncSolver(unittest.TestCase):
+    """
+    A class to perform unittests on functions
+    in async_solver
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.solver = asol.AsyncSolver(workers=2, limit=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.solver.close()
+
+    def test_solve(self):
+        """
+        A function to test the solve and solve_many functions
+        of the AsyncSolver class
+        """
+        print("\nTesting solve")
+        easy, hard = puzzles_for_tests()
+
+        async def run():
+            result = await self.solver.solve(hard, engine="exact")
+            self.assertTrue(result.solved)
+            self.assertEqual(result.solution[0], [8, 1, 2, 7, 5, 3, 6, 4, 9])
+
+            results = await self.solver.solve_many([easy, hard] * 10,
+                                                   seed=1)
+            self.assertEqual(len(results), 20)
+            self.assertTrue(all(result.solved for result in results))
+
+            with self.assertRaises(ValueError):
+                await self.solver.solve(easy, engine="fast")
+
+        asyncio.run(run())
+        self.assertEqual(sorted(self.solver.free_slots), [0, 1])
+
+    def test_solve_events(self):
+        """
+        A function to test the solve_events function
+        of the AsyncSolver class
+        """
+        print("\nTesting solve_events")
+
+        async def run():
+            events = []
+            async for event in self.solver.solve_events(
+                    puzzles_for_tests()[1], seed=1):
+                events.append(event)
+            return events
+
+        events = asyncio.run(run())
+        self.assertEqual(events[0]["type"], "phase_start")
+        self.assertEqual(events[0]["phase"], "setup")
+        self.assertIn("time", events[0])
+        attempts = [event for event in events
+                    if event["type"] == "attempt_start"]
+        self.assertEqual(attempts[0]["attempt"], 1)
+        self.assertEqual(events[-1]["type"], "result")
+        self.assertTrue(events[-1]["result"].solved)
+
+    def test_cancel(self):
+        """
+        A function to test cancelling a solve stops its worker
+        """
+        print("\nTesting cancel")
+
+        async def run():
+            task = asyncio.create_task(
+                self.solver.solve(puzzles_for_tests()[1], seed=1))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+            # Both slots come back once the worker has stopped
+            for _ in range(100):
+                if len(self.solver.free_slots) == 2:
+                    break
+                await asyncio.sleep(0.05)
+            self.assertEqual(len(self.solver.free_slots), 2)
+
+        asyncio.run(run())
+
+    def test_solve_async(self):
+        """
+        A function to test the solve_async function
+        in async_solver
+        """
+        print("\nTesting solve_async")
+
+        async def run():
+            return await asol.solve_async(puzzles_for_tests()[0],
+                                          engine="exact")
+
+        try:
+            self.assertTrue(asyncio.run(run()).solved)
+        finally:
+            asol.shutdown()
+        self.assertIsNone(asol.solver)
+
+
+if __name__ == "__main__":
+    unittest.main()
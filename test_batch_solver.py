@@ -0,0 +1,168 @@
+import batch_solver as bs
+import io
+import json
+import os
+import row_cache as rc
+import tempfile
+import unittest
+
+
+def puzzles_for_tests():
+    """
+    A function to build the puzzle lines used in tests
+    """
+    lines = [
+        "# Test puzzles",
+        "..21...7..8...6..113..8...2.59..82.....391.....75..38.",
+        "2...5..378..6...2..7...34..",
+        "",
+        "112100070080006001130080002059008200000391000007500380" +
+        "200050037800600020070003400",
+        "12345"
+    ]
+    lines[1] += lines.pop(2)
+    lines.append("\u00b2" + lines[1][1:])  # Digit character that isn't 0-9
+
+    return lines
+
+
+class TestBatchSolver(unittest.TestCase):
+    """
+    A class to perform unittests on functions
+    in batch_solver
+    """
+
+    def setUp(self):
+        # Rows cached by earlier tests would skip the phase 1 searches
+        rc.set_cache(rc.RowCache())
+
+    def test_solve_puzzle(self):
+        """
+        A function to test the solve_puzzle function
+        in batch_solver
+        """
+        print("\nTesting solve_puzzle")
+
+        options = {"engine": "ga", "fallback": True, "seed": 1,
+                   "timeout": None}
+        result = bs.solve_puzzle((0, puzzles_for_tests()[1], options))
+        self.assertTrue(result["solved"])
+        self.assertEqual(result["solution"][:9], "962145873")
+        self.assertGreaterEqual(result["attempts"], 1)
+        self.assertIn("setup", result["phase_times"])
+        self.assertNotIn("events", result)
+
+        # Progress events asked for
+        options["events"] = True
+        result = bs.solve_puzzle((0, puzzles_for_tests()[1], options))
+        self.assertEqual(result["events"][-1]["type"], "solved")
+        options["events"] = False
+
+        # Memory traced for each phase
+        options["trace_memory"] = True
+        result = bs.solve_puzzle((0, puzzles_for_tests()[1], options))
+        self.assertIn("setup", result["cpu_times"])
+        self.assertIn("run", result["peak_memory"])
+        options["trace_memory"] = False
+
+        # Out of time with the ga
+        hard = ("800000000003600000070090200050007000000045700" +
+                "000100030001000068008500010090000400")
+        options["timeout"] = 0.001
+        result = bs.solve_puzzle((2, hard, options))
+        self.assertTrue(result["solved"])
+        self.assertTrue(result["requeued"])
+        self.assertEqual(result["engine"], "exact")
+
+        # Conflicting cell values
+        result = bs.solve_puzzle((1, puzzles_for_tests()[3], options))
+        self.assertFalse(result["solved"])
+        self.assertEqual(result["status"], "invalid")
+        self.assertIn("error", result)
+
+    def test_main(self):
+        """
+        A function to test the main function
+        in batch_solver
+        """
+        print("\nTesting main")
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "puzzles.txt")
+            with open(path, "w", encoding="utf-8") as puzzle_file:
+                puzzle_file.write("\n".join(puzzles_for_tests()) + "\n")
+
+            for workers in ["1", "2"]:
+                out = io.StringIO()
+                status = bs.main([path, "--workers", workers,
+                                  "--engine", "exact"], out)
+                results = [json.loads(line)
+                           for line in out.getvalue().splitlines()]
+
+                self.assertEqual(status, 1)
+                self.assertEqual([result["index"] for result in results],
+                                 [0, 1, 2, 3])
+                self.assertTrue(results[0]["solved"])
+                self.assertIn("error", results[1])
+                self.assertIn("error", results[2])
+                self.assertEqual(results[3]["status"], "invalid")
+
+            # Shared memory batches of a fixed width file
+            with open(path, "w") as puzzle_file:
+                puzzle_file.write(puzzles_for_tests()[1] + "\n" +
+                                  puzzles_for_tests()[3] + "\n")
+            out = io.StringIO()
+            status = bs.main([path, "--shared", "--workers", "2",
+                              "--batch-size", "1", "--engine", "exact"], out)
+            results = [json.loads(line)
+                       for line in out.getvalue().splitlines()]
+
+            self.assertEqual(status, 1)
+            self.assertEqual([result["status"] for result in results],
+                             ["solved", "invalid"])
+            self.assertEqual(results[0]["solution"][:9], "962145873")
+
+            # A bad record gives the same result in both modes
+            bad = puzzles_for_tests()[1].replace(".", "x", 1)
+            with open(path, "w") as puzzle_file:
+                puzzle_file.write(puzzles_for_tests()[1] + "\n" + bad +
+                                  "\n" + puzzles_for_tests()[1] + "\n")
+            modes = []
+            for shared in [[], ["--shared", "--batch-size", "4"]]:
+                out = io.StringIO()
+                status = bs.main([path, "--workers", "2",
+                                  "--engine", "exact"] + shared, out)
+                self.assertEqual(status, 1)
+                modes.append([{key: json.loads(line)[key] for key in
+                               ["index", "puzzle", "status", "solved",
+                                "solution"]}
+                              for line in out.getvalue().splitlines()])
+
+            self.assertEqual(modes[0], modes[1])
+            self.assertEqual([result["status"] for result in modes[1]],
+                             ["solved", "invalid", "solved"])
+            self.assertEqual(modes[1][1]["puzzle"], bad)
+
+            # Puzzles solved in one run are answered from the store in
+            # the next
+            store_path = os.path.join(folder, "solved")
+            with open(path, "w") as puzzle_file:
+                puzzle_file.write(puzzles_for_tests()[1] + "\n")
+            for workers in ["1", "2"]:
+                sources = []
+                for _ in range(2):
+                    out = io.StringIO()
+                    status = bs.main([path, "--workers", workers,
+                                      "--engine", "exact", "--events",
+                                      "--store", store_path], out)
+                    self.assertEqual(status, 0)
+                    result = json.loads(out.getvalue())
+                    self.assertEqual(result["solution"][:9], "962145873")
+                    sources.append(result["events"][-1]["source"])
+
+                self.assertEqual(sources[1], "store")
+            self.assertEqual(sources[0], "store")  # Kept from workers 1
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import candidate_grid as cg
+import dlx_solver as dlx
+import unittest
+
+
+def rows_for_tests():
+    """
+    A function to build the rows used in tests
+    """
+    rows = [
+        [0, 0, 2, 1, 0, 0, 0, 7, 0],
+        [0, 8, 0, 0, 0, 6, 0, 0, 1],
+        [1, 3, 0, 0, 8, 0, 0, 0, 2],
+        [0, 5, 9, 0, 0, 8, 2, 0, 0],
+        [0, 0, 0, 3, 9, 1, 0, 0, 0],
+        [0, 0, 7, 5, 0, 0, 3, 8, 0],
+        [2, 0, 0, 0, 5, 0, 0, 3, 7],
+        [8, 0, 0, 6, 0, 0, 0, 2, 0],
+        [0, 7, 0, 0, 0, 3, 4, 0, 0]
+    ]
+
+    return rows
+
+
+class TestCandidateGrid(unittest.TestCase):
+    """
+    A class to perform unittests on functions
+    in candidate_grid
+    """
+
+    def test_units(self):
+        """
+        A function to test the unit and peer tables
+        in candidate_grid
+        """
+        print("\nTesting units")
+
+        self.assertEqual(len(cg.UNITS), 27)
+        self.assertEqual(cg.UNITS[18], [0, 1, 2, 9, 10, 11, 18, 19, 20])
+        self.assertEqual(cg.CELL_UNITS[80], [8, 17, 26])
+
+        for cell in range(81):
+            self.assertEqual(len(cg.PEERS[cell]), 20)
+
+    def test_load(self):
+        """
+        A function to test the load function
+        in candidate_grid
+        """
+        print("\nTesting load")
+
+        # Good Grid
+        candidates = cg.CandidateGrid()
+        self.assertTrue(candidates.load(rows_for_tests()))
+        self.assertEqual(candidates.get_rows()[0][2], 2)
+        self.assertEqual(candidates.get_cell_rows()[0][2], [2])
+        self.assertEqual(candidates.get_cell_rows()[0][0], [4, 5, 6, 9])
+
+        # Duplicate digits in a row
+        rows = rows_for_tests()
+        rows[0][0] = 7
+        candidates = cg.CandidateGrid()
+        self.assertFalse(candidates.load(rows))
+        self.assertTrue(candidates.contradiction)
+
+    def test_agrees_with(self):
+        """
+        A function to test the agrees_with function and the placed
+        cell counts in candidate_grid
+        """
+        print("\nTesting agrees_with")
+
+        candidates = cg.CandidateGrid()
+        self.assertTrue(candidates.load(rows_for_tests()))
+        self.assertEqual(sum(candidates.unit_filled[:9]),
+                         81 - candidates.values.count(0))
+        self.assertEqual(candidates.unit_filled[0],
+                         9 - candidates.values[:9].count(0))
+
+        # Only more digits placed
+        rows = candidates.get_rows()
+        cell = candidates.values.index(0)
+        rows[int(cell / 9)][cell % 9] = \
+            next(dlx.solutions(rows_for_tests()))[int(cell / 9)][cell % 9]
+        self.assertTrue(candidates.agrees_with(rows))
+        self.assertTrue(candidates.load(rows))
+        self.assertEqual(candidates.values[cell],
+                         rows[int(cell / 9)][cell % 9])
+
+        # A placed digit removed
+        rows[0][2] = 0
+        self.assertFalse(candidates.agrees_with(rows))
+
+    def test_place(self):
+        """
+        A function to test the place function
+        in candidate_grid
+        """
+        print("\nTesting place")
+
+        candidates = cg.CandidateGrid()
+        self.assertTrue(candidates.place(0, 5))
+        self.assertTrue(candidates.propagate())
+        self.assertEqual(candidates.masks[1], cg.ALL_DIGITS & ~cg.digit_bit(5))
+
+        # Digit removed by a peer
+        self.assertFalse(candidates.place(1, 5))
+
+    def test_eliminate(self):
+        """
+        A function to test the eliminate function
+        in candidate_grid
+        """
+        print("\nTesting eliminate")
+
+        candidates = cg.CandidateGrid()
+
+        # Leaving a single candidate places the cell
+        self.assertTrue(candidates.eliminate(0, cg.ALL_DIGITS &
+                                             ~cg.digit_bit(4)))
+        self.assertEqual(candidates.values[0], 4)
+        self.assertTrue(candidates.propagate())
+        self.assertTrue(candidates.masks[80] & cg.digit_bit(4))
+        self.assertFalse(candidates.masks[8] & cg.digit_bit(4))
+
+        # Removing the last candidate
+        self.assertFalse(candidates.eliminate(0, cg.digit_bit(4)))
+
+    def test_bit_digits(self):
+        """
+        A function to test the bit helper functions
+        in candidate_grid
+        """
+        print("\nTesting bit_digits")
+
+        self.assertEqual(cg.bit_digits(0b100000101), [1, 3, 9])
+        self.assertEqual(cg.single_digit(cg.digit_bit(7)), 7)
+        self.assertEqual(cg.single_digit(0b11), 0)
+        self.assertEqual(cg.single_digit(0), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
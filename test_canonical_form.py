@@ -0,0 +1,80 @@
+import canonical_form as cf
+import unittest
+
+
+def rows_for_tests():
+    """
+    A function to build the rows used in tests
+    """
+    rows = [
+        [0, 0, 2, 1, 0, 0, 0, 7, 0],
+        [0, 8, 0, 0, 0, 6, 0, 0, 1],
+        [1, 3, 0, 0, 8, 0, 0, 0, 2],
+        [0, 5, 9, 0, 0, 8, 2, 0, 0],
+        [0, 0, 0, 3, 9, 1, 0, 0, 0],
+        [0, 0, 7, 5, 0, 0, 3, 8, 0],
+        [2, 0, 0, 0, 5, 0, 0, 3, 7],
+        [8, 0, 0, 6, 0, 0, 0, 2, 0],
+        [0, 7, 0, 0, 0, 3, 4, 0, 0]
+    ]
+
+    return rows
+
+
+def variant_for_tests():
+    """
+    A function to build a transposed, reordered and relabelled
+    copy of the rows used in tests
+    """
+    rows = cf.transpose(rows_for_tests())
+    row_order = [7, 6, 8, 0, 2, 1, 4, 5, 3]
+    col_order = [3, 5, 4, 8, 7, 6, 1, 0, 2]
+    labels = [0, 4, 9, 1, 3, 8, 2, 7, 5, 6]
+
+    return [[labels[rows[row_num][col_num]] for col_num in col_order]
+            for row_num in row_order]
+
+
+class TestCanonicalForm(unittest.TestCase):
+    """
+    A class to perform unittests on functions
+    in canonical_form
+    """
+
+    def test_canonical_form(self):
+        """
+        A function to test the canonical_form function
+        in canonical_form
+        """
+        print("\nTesting canonical_form")
+
+        key, transform = cf.canonical_form(rows_for_tests())
+        self.assertEqual(len(key), 81)
+        self.assertEqual(key.count("0"), 81 - 31)
+
+        # Equivalent grids share a key
+        self.assertEqual(cf.canonical_form(variant_for_tests())[0], key)
+
+        # Different grids don't
+        rows = rows_for_tests()
+        rows[0][2] = 0
+        self.assertNotEqual(cf.canonical_form(rows)[0], key)
+
+    def test_transform(self):
+        """
+        A function to test the apply and undo functions
+        of the Transform class
+        """
+        print("\nTesting transform")
+
+        rows = variant_for_tests()
+        key, transform = cf.canonical_form(rows)
+
+        canonical = transform.apply(rows)
+        self.assertEqual("".join(str(digit) for row in canonical
+                                 for digit in row), key)
+        self.assertEqual(transform.undo(canonical), rows)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,208 @@
+import cluster_solver as cs
+import io
+import json
+import multiprocessing
+import os
+import socket
+import tempfile
+import time
+import unittest
+
+
+def puzzles_for_tests():
+    """
+    A function to build the puzzles used in tests
+    """
+    puzzle = ("..21...7..8...6..113..8...2.59..82.....391....." +
+              "75..38.2...5..378..6...2..7...34..")
+    solution = ("962145873784236591135789642359478216628391754" +
+                "417562389296854137843617925571923468")
+
+    # Blank a different cell of the solution in each of the others
+    puzzles = [puzzle.replace(".", "0")]
+    for cell in range(5):
+        puzzles.append(solution[:cell] + "0" + solution[cell + 1:])
+    return puzzles, solution
+
+
+def write_puzzles(folder: str):
+    """
+    A function to write the test puzzles to a corpus file
+    and return its path.
+    """
+    path = os.path.join(folder, "puzzles.txt")
+    with open(path, "w") as corpus_file:
+        corpus_file.write("\n".join(puzzles_for_tests()[0]) + "\n")
+    return path
+
+
+def take_shard(port: int):
+    """
+    A function that connects as a worker, takes a shard and then sends
+    nothing more. Returns the connection and the shard message.
+    """
+    connection = socket.create_connection(("127.0.0.1", port))
+    cs.send_message(connection, {"type": "next"})
+    reader = connection.makefile("r")
+    return connection, reader, json.loads(reader.readline())
+
+
+class TestClusterSolver(unittest.TestCase):
+    """
+    A class to perform unittests on functions
+    in cluster_solver
+    """
+
+    def test_cluster(self):
+        """
+        A function to test solving a corpus with several worker
+        processes, one shard reassigned from a worker that dropped it
+        """
+        print("\nTesting cluster")
+
+        puzzles, solution = puzzles_for_tests()
+        with tempfile.TemporaryDirectory() as folder:
+            out = io.StringIO()
+            coordinator = cs.Coordinator(write_puzzles(folder), out,
+                                         shard_size=2)
+            self.assertEqual(len(coordinator.shards), 3)
+            self.assertEqual(coordinator.shard_sizes, [2, 2, 2])
+            coordinator.start()
+
+            try:
+                # A worker that disconnects part way through a shard
+                connection, reader, message = take_shard(coordinator.port)
+                self.assertEqual(message["type"], "shard")
+                self.assertEqual(message["puzzles"], puzzles[:2])
+                reader.close()
+                connection.close()
+
+                workers = [multiprocessing.Process(
+                    target=cs.run_worker,
+                    args=("127.0.0.1", coordinator.port, "exact"))
+                    for _ in range(2)]
+                for worker in workers:
+                    worker.start()
+
+                self.assertTrue(coordinator.wait(60))
+                for worker in workers:
+                    worker.join(30)
+                    self.assertEqual(worker.exitcode, 0)
+            finally:
+                coordinator.close()
+
+        results = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(sorted(result["index"] for result in results),
+                         list(range(len(puzzles))))
+        for result in results:
+            self.assertTrue(result["solved"])
+            self.assertEqual(result["solution"], solution)
+            self.assertEqual(result["puzzle"], puzzles[result["index"]])
+        self.assertEqual(coordinator.reassigned, 1)
+
+    def test_bad_records(self):
+        """
+        A function to test a corrupt record is reported as invalid and
+        a shard the coordinator can't read doesn't cost the worker
+        """
+        print("\nTesting bad_records")
+
+        puzzles, solution = puzzles_for_tests()
+        bad = puzzles[1].replace("0", "x")
+        with tempfile.TemporaryDirectory() as folder:
+            path = write_puzzles(folder)
+            with open(path, "r+") as corpus_file:
+                corpus_file.seek(82)
+                corpus_file.write(bad)
+
+            out = io.StringIO()
+            coordinator = cs.Coordinator(path, out, shard_size=2)
+            read_shard = coordinator.read_shard
+
+            def fail_last(shard):
+                if shard == 2:
+                    raise OSError("Corpus file gone")
+                return read_shard(shard)
+
+            coordinator.read_shard = fail_last
+            coordinator.start()
+            try:
+                worker = multiprocessing.Process(
+                    target=cs.run_worker,
+                    args=("127.0.0.1", coordinator.port, "exact"))
+                worker.start()
+                self.assertTrue(coordinator.wait(60))
+                worker.join(30)
+                self.assertEqual(worker.exitcode, 0)
+            finally:
+                coordinator.close()
+
+        results = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([result["index"] for result in results],
+                         list(range(len(puzzles))))
+        self.assertEqual([result["status"] for result in results],
+                         ["solved", "invalid", "solved", "solved",
+                          "invalid", "invalid"])
+        self.assertEqual(results[1]["puzzle"], bad)
+        self.assertEqual(results[4]["error"], "Corpus file gone")
+        self.assertEqual(coordinator.reassigned, 0)
+
+    def test_max_tries(self):
+        """
+        A function to test a shard that keeps losing its worker
+        is given up rather than handed out forever
+        """
+        print("\nTesting max_tries")
+
+        with tempfile.TemporaryDirectory() as folder:
+            out = io.StringIO()
+            coordinator = cs.Coordinator(write_puzzles(folder), out,
+                                         shard_size=6)
+            coordinator.server.server_close()
+
+        for _ in range(cs.MAX_TRIES):
+            worker = object()
+            self.assertEqual(coordinator.next_shard(worker), 0)
+            coordinator.add_result(worker, 0, {"index": 3, "solved": True})
+            coordinator.lose_worker(worker)
+
+        self.assertTrue(coordinator.wait(0))
+        self.assertEqual(coordinator.reassigned, cs.MAX_TRIES)
+        results = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([result["index"] for result in results],
+                         list(range(6)))
+        self.assertEqual(results[3], {"index": 3, "solved": True})
+        self.assertEqual(results[0]["status"], "invalid")
+
+    def test_heartbeat(self):
+        """
+        A function to test a shard is reassigned once
+        its worker stops sending heartbeats
+        """
+        print("\nTesting heartbeat")
+
+        with tempfile.TemporaryDirectory() as folder:
+            coordinator = cs.Coordinator(write_puzzles(folder), io.StringIO(),
+                                         shard_size=3, heartbeat_timeout=0.4)
+            coordinator.start()
+
+            try:
+                connection, reader, message = take_shard(coordinator.port)
+                self.assertEqual(message["shard"], 0)
+                self.assertEqual(list(coordinator.pending), [1])
+
+                # The silent worker is disconnected and its shard is free
+                end_time = time.time() + 10
+                while coordinator.reassigned == 0 and time.time() < end_time:
+                    time.sleep(0.05)
+                self.assertEqual(coordinator.reassigned, 1)
+                self.assertEqual(list(coordinator.pending), [0, 1])
+                self.assertEqual(reader.readline(), "")
+                reader.close()
+                connection.close()
+            finally:
+                coordinator.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
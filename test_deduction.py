@@ -0,0 +1,165 @@
+import candidate_grid as cg
+import deduction as dd
+import unittest
+
+
+def rows_for_tests():
+    """
+    A function to build the rows used in tests
+    """
+    rows = [
+        [8, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 3, 6, 0, 0, 0, 0, 0],
+        [0, 7, 0, 0, 9, 0, 2, 0, 0],
+        [0, 5, 0, 0, 0, 7, 0, 0, 0],
+        [0, 0, 0, 0, 4, 5, 7, 0, 0],
+        [0, 0, 0, 1, 0, 0, 0, 3, 0],
+        [0, 0, 1, 0, 0, 0, 0, 6, 8],
+        [0, 0, 8, 5, 0, 0, 0, 1, 0],
+        [0, 9, 0, 0, 0, 0, 4, 0, 0]
+    ]
+
+    return rows
+
+
+class TestDeduction(unittest.TestCase):
+    """
+    A class to perform unittests on functions
+    in deduction
+    """
+
+    def test_hidden_singles(self):
+        """
+        A function to test the hidden_singles function
+        in deduction
+        """
+        print("\nTesting hidden_singles")
+
+        # Digit 1 only possible in the first cell of row 0
+        candidates = cg.CandidateGrid()
+        for cell in range(1, 9):
+            candidates.masks[cell] &= ~cg.digit_bit(1)
+
+        self.assertEqual(dd.hidden_singles(candidates), 1)
+        self.assertEqual(candidates.values[0], 1)
+
+        # Digit 1 not possible anywhere in row 0
+        candidates = cg.CandidateGrid()
+        for cell in range(9):
+            candidates.masks[cell] &= ~cg.digit_bit(1)
+
+        dd.hidden_singles(candidates)
+        self.assertTrue(candidates.contradiction)
+
+    def test_naked_pairs(self):
+        """
+        A function to test the naked_pairs function
+        in deduction
+        """
+        print("\nTesting naked_pairs")
+
+        candidates = cg.CandidateGrid()
+        pair = cg.digit_bit(1) | cg.digit_bit(2)
+        candidates.masks[0] = pair
+        candidates.masks[8] = pair
+
+        self.assertTrue(dd.naked_pairs(candidates))
+        self.assertFalse(candidates.masks[4] & pair)
+        self.assertEqual(candidates.masks[9], cg.ALL_DIGITS)
+        self.assertEqual(candidates.masks[0], pair)
+
+    def test_hidden_pairs(self):
+        """
+        A function to test the hidden_pairs function
+        in deduction
+        """
+        print("\nTesting hidden_pairs")
+
+        # Digits 1 and 2 only possible in the first two cells of row 0
+        candidates = cg.CandidateGrid()
+        pair = cg.digit_bit(1) | cg.digit_bit(2)
+        for cell in range(2, 9):
+            candidates.masks[cell] &= ~pair
+
+        self.assertTrue(dd.hidden_pairs(candidates))
+        self.assertEqual(candidates.masks[0], pair)
+        self.assertEqual(candidates.masks[1], pair)
+
+    def test_pointing_pairs(self):
+        """
+        A function to test the pointing_pairs function
+        in deduction
+        """
+        print("\nTesting pointing_pairs")
+
+        # Digit 1 limited to row 0 within box 0
+        candidates = cg.CandidateGrid()
+        for cell in [9, 10, 11, 18, 19, 20]:
+            candidates.masks[cell] &= ~cg.digit_bit(1)
+
+        self.assertTrue(dd.pointing_pairs(candidates))
+        self.assertFalse(candidates.masks[5] & cg.digit_bit(1))
+        self.assertTrue(candidates.masks[0] & cg.digit_bit(1))
+
+    def test_box_line_reduction(self):
+        """
+        A function to test the box_line_reduction function
+        in deduction
+        """
+        print("\nTesting box_line_reduction")
+
+        # Digit 1 limited to box 0 within row 0
+        candidates = cg.CandidateGrid()
+        for cell in range(3, 9):
+            candidates.masks[cell] &= ~cg.digit_bit(1)
+
+        self.assertTrue(dd.box_line_reduction(candidates))
+        self.assertFalse(candidates.masks[10] & cg.digit_bit(1))
+        self.assertTrue(candidates.masks[1] & cg.digit_bit(1))
+
+    def test_x_wing(self):
+        """
+        A function to test the x_wing function
+        in deduction
+        """
+        print("\nTesting x_wing")
+
+        # Digit 1 limited to columns 0 and 4 in rows 0 and 4
+        candidates = cg.CandidateGrid()
+        for row_num in [0, 4]:
+            for col_num in [1, 2, 3, 5, 6, 7, 8]:
+                candidates.masks[row_num * 9 + col_num] &= ~cg.digit_bit(1)
+
+        self.assertTrue(dd.x_wing(candidates))
+        self.assertFalse(candidates.masks[18] & cg.digit_bit(1))
+        self.assertFalse(candidates.masks[76] & cg.digit_bit(1))
+        self.assertTrue(candidates.masks[36] & cg.digit_bit(1))
+        self.assertTrue(candidates.masks[19] & cg.digit_bit(1))
+
+    def test_run(self):
+        """
+        A function to test the run function
+        of the DeductionPipeline class
+        """
+        print("\nTesting run")
+
+        # Good Grid
+        candidates = cg.CandidateGrid()
+        candidates.load(rows_for_tests())
+        pipeline = dd.DeductionPipeline()
+
+        self.assertTrue(pipeline.run(candidates))
+        self.assertIn("hidden singles", pipeline.report())
+
+        # Bad Grid
+        candidates = cg.CandidateGrid()
+        for cell in range(9):
+            candidates.masks[cell] &= ~cg.digit_bit(1)
+        pipeline = dd.DeductionPipeline()
+
+        self.assertFalse(pipeline.run(candidates))
+        self.assertEqual(pipeline.hits["naked pairs"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
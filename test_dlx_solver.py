@@ -0,0 +1,104 @@
+import dlx_solver as dlx
+import sudoku_grid as sg
+import time
+import unittest
+
+
+def rows_for_tests():
+    """
+    A function to build the rows used in tests
+    """
+    rows = [
+        [8, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 3, 6, 0, 0, 0, 0, 0],
+        [0, 7, 0, 0, 9, 0, 2, 0, 0],
+        [0, 5, 0, 0, 0, 7, 0, 0, 0],
+        [0, 0, 0, 0, 4, 5, 7, 0, 0],
+        [0, 0, 0, 1, 0, 0, 0, 3, 0],
+        [0, 0, 1, 0, 0, 0, 0, 6, 8],
+        [0, 0, 8, 5, 0, 0, 0, 1, 0],
+        [0, 9, 0, 0, 0, 0, 4, 0, 0]
+    ]
+
+    return rows
+
+
+class TestDancingLinks(unittest.TestCase):
+    """
+    A class to perform unittests on functions
+    in dlx_solver
+    """
+
+    def test_constraint_columns(self):
+        """
+        A function to test the constraint_columns function
+        in dlx_solver
+        """
+        print("\nTesting constraint_columns")
+
+        self.assertEqual(dlx.constraint_columns(0, 0, 1), [1, 82, 163, 244])
+        self.assertEqual(dlx.constraint_columns(8, 8, 9),
+                         [81, 162, 243, 324])
+
+    def test_solutions(self):
+        """
+        A function to test the solutions function
+        in dlx_solver
+        """
+        print("\nTesting solutions")
+
+        solutions = list(dlx.solutions(rows_for_tests()))
+        self.assertEqual(len(solutions), 1)
+
+        grid = sg.SudokuGrid()
+        grid.current_solution = solutions[0]
+        self.assertTrue(grid.check_solution())
+
+        # Stopping early leaves the matrix ready for the next puzzle
+        search = dlx.solutions([[0] * 9] * 9)
+        next(search)
+        search.close()
+
+        self.assertEqual(dlx.get_links().right[0], 1)
+        self.assertEqual(dlx.get_links().sizes[1:], [9] * 324)
+
+        # A search left part way through doesn't hold the matrix
+        search = dlx.solutions([[0] * 9] * 9, 5)
+        next(search)
+        self.assertEqual(dlx.count_solutions(rows_for_tests()), 1)
+        self.assertEqual(len(list(search)), 4)
+
+        # The first solution of an empty grid comes without finding more
+        start_time = time.time()
+        solution = next(dlx.solutions([[0] * 9] * 9, None))
+        self.assertLess(time.time() - start_time, 0.5)
+        grid.current_solution = solution
+        self.assertTrue(grid.check_solution())
+
+    def test_count_solutions(self):
+        """
+        A function to test the count_solutions function
+        in dlx_solver
+        """
+        print("\nTesting count_solutions")
+
+        self.assertEqual(dlx.count_solutions(rows_for_tests()), 1)
+        self.assertEqual(dlx.count_solutions([[0] * 9] * 9, 20), 20)
+
+        # Conflicting clues
+        rows = rows_for_tests()
+        rows[0][1] = 8
+        self.assertEqual(dlx.count_solutions(rows), 0)
+
+    def test_get_links(self):
+        """
+        A function to test the get_links function
+        in dlx_solver returns the same matrix each time
+        """
+        print("\nTesting get_links")
+
+        self.assertIs(dlx.get_links(), dlx.get_links())
+
+
+if __name__ == "__main__":
+    unittest.main()
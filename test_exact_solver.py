@@ -0,0 +1,77 @@
+import exact_solver as ex
+import sudoku_grid as sg
+import unittest
+
+
+def rows_for_tests():
+    """
+    A function to build the rows used in tests
+    """
+    rows = [
+        [8, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 3, 6, 0, 0, 0, 0, 0],
+        [0, 7, 0, 0, 9, 0, 2, 0, 0],
+        [0, 5, 0, 0, 0, 7, 0, 0, 0],
+        [0, 0, 0, 0, 4, 5, 7, 0, 0],
+        [0, 0, 0, 1, 0, 0, 0, 3, 0],
+        [0, 0, 1, 0, 0, 0, 0, 6, 8],
+        [0, 0, 8, 5, 0, 0, 0, 1, 0],
+        [0, 9, 0, 0, 0, 0, 4, 0, 0]
+    ]
+
+    return rows
+
+
+class TestExactSolver(unittest.TestCase):
+    """
+    A class to perform unittests on functions
+    in exact_solver
+    """
+
+    def test_solve(self):
+        """
+        A function to test the solve function
+        in exact_solver
+        """
+        print("\nTesting solve")
+
+        # Good Grid
+        rows = rows_for_tests()
+        solver = ex.ExactSolver()
+        solution = solver.solve(rows)
+
+        grid = sg.SudokuGrid()
+        grid.current_solution = solution
+        self.assertTrue(grid.check_solution())
+        self.assertGreater(solver.nodes, 1)
+
+        # Clues are kept
+        for row_num in range(9):
+            for col_num in range(9):
+                if rows[row_num][col_num] > 0:
+                    self.assertEqual(solution[row_num][col_num],
+                                     rows[row_num][col_num])
+
+        # Bad Grid, no digit left for the first cell
+        bad_rows = []
+        for _ in range(9):
+            bad_rows.append([0] * 9)
+        bad_rows[0] = [0, 1, 2, 3, 4, 5, 6, 7, 0]
+        bad_rows[3][0] = 8
+        bad_rows[4][0] = 9
+
+        self.assertIsNone(solver.solve(bad_rows))
+
+    def test_solve_stopped(self):
+        """
+        A function to test the solve function
+        in exact_solver stops when asked
+        """
+        print("\nTesting solve_stopped")
+
+        solver = ex.ExactSolver(lambda: False)
+        self.assertIsNone(solver.solve(rows_for_tests()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 import ga_solver
 import math
 import matplotlib.pyplot as plt
+import random
 import unittest
 
 
@@ -221,6 +222,25 @@ class TestGaSolver(unittest.TestCase):
         plt.savefig("solve.png")
         plt.close()
 
+    def test_solve_rng(self):
+        """
+        A function to verify that a solver given its own random number
+        generator is repeatable and leaves the random module alone.
+        """
+        limits = [(0, 9, int), (0, 9, int), (0, 9, int), (0, 9, int)]
+        state = random.getstate()
+
+        populations = []
+        for _ in range(2):
+            solver = ga_solver.GaSolver(f_2, limits=limits,
+                                        rng=random.Random(7))
+            self.assertEqual(solver.solve(n_iterations=10), 0)
+            populations.append([point.parameters
+                                 for point in solver.population])
+
+        self.assertEqual(populations[0], populations[1])
+        self.assertEqual(random.getstate(), state)
+
 
 if __name__ == '__main__':
     unittest.main()
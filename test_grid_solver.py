@@ -1,5 +1,15 @@
+import copy
+import dlx_solver as dlx
 import grid_solver as gsol
+import os
+import puzzle_store as ps
+import random
+import row_cache as rc
+import solver_events as ev
 import sudoku_grid as sg
+import tempfile
+import threading
+import time
 import unittest
 
 
@@ -41,6 +51,10 @@ class TestGridSolver(unittest.TestCase):
     in grid_solver
     """
 
+    def setUp(self):
+        # Rows cached by earlier tests would skip the phase 1 searches
+        rc.set_cache(rc.RowCache())
+
     def test_run(self):
         """
         A function to test the run function
@@ -53,6 +67,251 @@ class TestGridSolver(unittest.TestCase):
 
         solver.run()
         self.assertTrue(solver.solved)
+        self.assertGreaterEqual(solver.attempts, 1)
+        self.assertIn("setup", solver.phase_times)
+
+    def test_run_events(self):
+        """
+        A function to test the events sent
+        by the run function in grid_solver
+        """
+
+        print("\nTesting run events")
+        grid = grid_for_tests()
+        solver = gsol.GridSolver(grid, None)
+        solver.deduction = None  # Leave the phases something to solve
+        events = []
+        solver.events.subscribe(events.append)
+
+        solver.run()
+        self.assertTrue(solver.solved)
+        kinds = [event.kind for event in events]
+        self.assertEqual(kinds[:5], [ev.PHASE_START, ev.PHASE_END,
+                                     ev.CELLS_FIXED, ev.ATTEMPT_START,
+                                     ev.PHASE_START])
+        self.assertEqual(events[0].data["phase"], "setup")
+        self.assertEqual(kinds[-2:], [ev.ATTEMPT_END, ev.SOLVED])
+        self.assertEqual(events[-1].data["count"], solver.attempts)
+        times = [event.time for event in events]
+        self.assertEqual(times, sorted(times))
+
+        # Each phase ends after its searches
+        phases = [event.data["phase"] for event in events
+                  if event.kind == ev.PHASE_END]
+        self.assertEqual(phases[-3:], ["phase_1", "phase_2", "phase_3"])
+        searches = [event for event in events
+                    if event.kind == ev.SEARCH_DONE]
+        self.assertGreaterEqual(len(searches), 9)
+        self.assertEqual(sum(event.data["evaluations"]
+                             for event in searches),
+                         sum(solver.evaluations.values()))
+
+    def test_run_seeded(self):
+        """
+        A function to test two runs with the same seed
+        make the same searches, with phase 2 run in threads
+        """
+
+        print("\nTesting run seeded")
+        runs = []
+        for _ in range(2):
+            rc.set_cache(rc.RowCache())
+            solver = gsol.GridSolver(grid_for_tests(), None)
+            solver.deduction = None  # Leave the phases something to solve
+            solver.use_row_cache = False
+            solver.use_row_index = False
+            solver.enumerate_limit = 1000
+            solver.join_limit = 1  # Phases 2 and 3 always use the ga
+            solver.rng = random.Random(3)
+            events = []
+            solver.events.subscribe(events.append)
+
+            solver.run()
+            self.assertTrue(solver.solved)
+
+            # Concurrent searches may finish in either order
+            found = []
+            for event in events:
+                data = dict(event.data)
+                for name in ["seconds", "elapsed"]:
+                    data.pop(name, None)
+                found.append(repr((event.kind, sorted(data.items()))))
+            runs.append((solver.attempts, sorted(found)))
+
+        self.assertEqual(runs[0], runs[1])
+
+    def test_run_store(self):
+        """
+        A function to test the run function
+        in grid_solver with a puzzle store
+        """
+
+        print("\nTesting run with a puzzle store")
+        with tempfile.TemporaryDirectory() as folder:
+            with ps.PuzzleStore(os.path.join(folder, "solved")) as store:
+                grid = grid_for_tests()
+                solver = gsol.GridSolver(grid, output)
+                solver.store = store
+                solver.run()
+                self.assertTrue(solver.solved)
+                self.assertEqual(store.misses, 1)
+
+                # Transposed copy found in the store
+                grid = sg.SudokuGrid()
+                grid.user_rows = [list(column) for column in
+                                  zip(*grid_for_tests().user_rows)]
+                solver = gsol.GridSolver(grid, output)
+                solver.store = store
+                solver.run()
+                self.assertTrue(solver.solved)
+                self.assertTrue(grid.check_solution())
+                self.assertEqual(store.hits, 1)
+
+    def test_run_racing(self):
+        """
+        A function to test the run_racing function
+        in grid_solver
+        """
+
+        print("\nTesting run_racing")
+        grid = grid_for_tests()
+        solver = gsol.GridSolver(grid, output, racers=2)
+
+        solver.run()
+        self.assertTrue(solver.solved)
+        self.assertTrue(grid.check_solution())
+
+    def test_run_racer(self):
+        """
+        A function to test the run_racer function
+        in grid_solver runs with the racing solver's settings
+        """
+
+        print("\nTesting run_racer")
+        gsol.init_racer(threading.Event())
+        solver = gsol.GridSolver(grid_for_tests(), output)
+        solver.deduction = None  # Leave the phases something to solve
+        solver.use_row_cache = False
+        settings = solver.racer_settings()
+        self.assertEqual(set(settings), set(gsol.RACER_SETTINGS))
+
+        solvable, solved, solution = gsol.run_racer(
+            grid_for_tests().user_rows, 1, settings)
+        self.assertTrue(solvable)
+        self.assertTrue(solved)
+        self.assertEqual(rc.get_cache().n_rows, 0)
+
+        # The phase 1 rows are cached once the racer may use the cache
+        settings["use_row_cache"] = True
+        gsol.run_racer(grid_for_tests().user_rows, 1, settings)
+        self.assertGreater(rc.get_cache().n_rows, 0)
+
+    def test_run_exact(self):
+        """
+        A function to test the run function
+        in grid_solver with the exact engine
+        """
+
+        print("\nTesting run_exact")
+        grid = grid_for_tests()
+        solver = gsol.GridSolver(grid, output, engine="exact")
+
+        solver.run()
+        self.assertTrue(solver.solved)
+        self.assertTrue(grid.check_solution())
+
+    def test_run_streaming(self):
+        """
+        A function to test the run_streaming function
+        in grid_solver
+        """
+        print("\nTesting run_streaming")
+
+        grid = grid_for_tests()
+        grid.current_solution = grid.user_rows
+        solver = gsol.GridSolver(grid, output)
+        solver.deduction = None
+        solver.setup_phase_1()
+
+        self.assertTrue(solver.run_streaming())
+        self.assertTrue(grid.check_solution())
+
+        # Bad Grid
+        grid.ga_p1_pos_cells = [[[0]] * 9] * 9
+        self.assertFalse(solver.run_streaming())
+        self.assertEqual(grid.ga_p2_pos_rows[0], [])
+
+        # Past the bound the phases are run in turn instead
+        grid = grid_for_tests()
+        grid.current_solution = grid.user_rows
+        solver = gsol.GridSolver(grid, output)
+        solver.deduction = None
+        solver.stream_limit = 1
+        solver.setup_phase_1()
+        self.assertIsNone(solver.run_streaming())
+
+        grid = grid_for_tests()
+        solver = gsol.GridSolver(grid, output)
+        solver.deduction = None  # Leave the phases something to solve
+        solver.streaming = True
+        solver.stream_limit = 1
+        solver.run()
+        self.assertTrue(solver.solved)
+        self.assertTrue(grid.check_solution())
+        self.assertIn("streaming", solver.phase_times)
+        self.assertIn("phase_1", solver.phase_times)
+
+    def test_run_pipelined(self):
+        """
+        A function to test the run_pipelined function
+        in grid_solver
+        """
+        print("\nTesting run_pipelined")
+
+        grid = grid_for_tests()
+        grid.current_solution = grid.user_rows
+        solver = gsol.GridSolver(grid, output)
+        solver.deduction = None
+        solver.setup_phase_1()
+
+        self.assertEqual(solver.run_pipelined(), (True, True))
+        self.assertTrue(solver.solved)
+        self.assertTrue(grid.check_solution())
+
+        # Bad Grid
+        grid.ga_p1_pos_cells = [[[0]] * 9] * 9
+        self.assertEqual(solver.run_pipelined(), (False, False))
+        self.assertFalse(solver.solved)
+
+    def test_merge_solutions(self):
+        """
+        A function to test the merge_solutions function
+        in grid_solver
+        """
+        print("\nTesting merge_solutions")
+
+        grid = grid_for_tests()
+        solver = gsol.GridSolver(grid, output)
+        solver.init_solution()
+
+        # Racers agree on a cell
+        solution1 = copy.deepcopy(grid.current_solution)
+        solution2 = copy.deepcopy(grid.current_solution)
+        solution1[0][0] = 9
+        solution2[0][0] = 9
+        self.assertTrue(solver.merge_solutions([solution1, solution2]))
+        self.assertEqual(grid.current_solution[0][0], 9)
+
+        # Racers disagree on a cell
+        solution1[0][1] = 6
+        solution2[0][1] = 4
+        self.assertFalse(solver.merge_solutions([solution1, solution2]))
+        self.assertEqual(grid.current_solution[0][1], 0)
+
+        # Digit conflicts with the current solution
+        solution3 = copy.deepcopy(grid.current_solution)
+        solution3[0][4] = 7
+        self.assertFalse(solver.merge_solutions([solution3]))
 
     def test_run_ga_solver(self):
         """
@@ -82,6 +341,7 @@ class TestGridSolver(unittest.TestCase):
         grid.ga_p1_pos_cells.append(cells)
 
         self.assertTrue(solver.run_ga_solver(cells))
+        self.assertEqual(solver.evaluations["phase_1"], grid.evaluations)
 
         # Test a possible box row
         row1 = [9, 6, 2, 1, 4, 5, 8, 7, 3]
@@ -153,6 +413,92 @@ class TestGridSolver(unittest.TestCase):
 
         self.assertFalse(solver.run_ga_solver(cells))
 
+    def test_run_search(self):
+        """
+        A function to test the run_search function
+        in grid_solver
+        """
+        print("\nTesting run_search")
+
+        grid = grid_for_tests()
+        solver = gsol.GridSolver(grid, output)
+
+        grid.phase = 1
+        grid.current_row = 0
+        cells = [[9], [6], [2], [1], [4, 5], [4, 5], [8], [7], [3]]
+        grid.ga_p1_pos_cells = [cells]
+
+        # Small search space is enumerated in full
+        self.assertEqual(solver.search_space(cells), 4)
+        self.assertEqual(solver.run_search(cells),
+                         [[0, 0, 0, 0, 0, 1, 0, 0, 0],
+                          [0, 0, 0, 0, 1, 0, 0, 0, 0]])
+
+        # Larger search space uses the genetic algorithm
+        solver.enumerate_limit = 1
+        results = solver.run_search(cells)
+        self.assertTrue(results)
+        for entry in results:
+            self.assertIn(entry, [[0, 0, 0, 0, 0, 1, 0, 0, 0],
+                                  [0, 0, 0, 0, 1, 0, 0, 0, 0]])
+
+    def test_enumerate_solver(self):
+        """
+        A function to test the enumerate_solver function
+        in grid_solver
+        """
+        print("\nTesting enumerate_solver")
+
+        grid = grid_for_tests()
+        solver = gsol.GridSolver(grid, output)
+
+        # Phase 1, cells
+        cells = [[1, 2], [1, 2], [3]]
+        self.assertEqual(solver.enumerate_solver(cells, 1),
+                         [[0, 1, 0], [1, 0, 0]])
+        self.assertEqual(solver.enumerate_solver(cells, 1, limit=1),
+                         [[0, 1, 0]])
+        self.assertEqual(solver.enumerate_solver([[0], [1]], 1), [])
+
+        # A cancelled search stops early
+        cancel = threading.Event()
+        cancel.set()
+        found = solver.enumerate_solver([list(range(1, 10))] * 9, 1,
+                                        cancel=cancel)
+        self.assertLess(len(found), 362880)
+
+        # Phase 2, rows
+        row1 = [9, 6, 2, 1, 4, 5, 8, 7, 3]
+        row2 = [7, 8, 4, 2, 3, 6, 5, 9, 1]
+        row3 = [1, 3, 5, 7, 8, 9, 6, 4, 2]
+        self.assertEqual(solver.enumerate_solver([[row1, row2],
+                                                  [row1, row2],
+                                                  [row3]], 2),
+                         [[0, 1, 0], [1, 0, 0]])
+
+        # Phase 3, box rows
+        self.assertEqual(solver.enumerate_solver([[[row1, row2, row3]],
+                                                  [[row2, row3, row1]]], 3),
+                         [])
+
+    def test_entry_mask(self):
+        """
+        A function to test the entry_mask function
+        in grid_solver
+        """
+        print("\nTesting entry_mask")
+
+        grid = grid_for_tests()
+        solver = gsol.GridSolver(grid, output)
+        row1 = [9, 6, 2, 1, 4, 5, 8, 7, 3]
+
+        self.assertEqual(solver.entry_mask(3, 1), 0b100)
+        self.assertEqual(solver.entry_mask(0, 1), -1)
+        self.assertEqual(solver.entry_mask(row1, 2),
+                         0b100100010 | 0b000011001 << 9 | 0b011000100 << 18)
+        self.assertEqual(solver.entry_mask([1] * 9, 2), -1)
+        self.assertEqual(solver.entry_mask([row1, row1, row1], 3), -1)
+
     def test_setup_phase_1(self):
         """
         A function to test the setup_phase_1 function
@@ -163,9 +509,41 @@ class TestGridSolver(unittest.TestCase):
         grid = grid_for_tests()
         grid.current_solution = grid.user_rows
         solver = gsol.GridSolver(grid, output)
+        solver.deduction = None
 
         # Good Grid
         self.assertTrue(solver.setup_phase_1())
+        candidates = solver.candidates
+        self.assertIsNotNone(candidates)
+
+        # Candidates kept when a cell has been fixed since
+        solution = next(dlx.solutions(grid.user_rows))
+        cell = candidates.values.index(0)
+        row_num = int(cell / 9)
+        col_num = cell % 9
+        grid.current_solution[row_num][col_num] = solution[row_num][col_num]
+        self.assertTrue(solver.setup_phase_1())
+        self.assertIs(solver.candidates, candidates)
+        self.assertGreaterEqual(solver.cells_placed, 1)
+
+        # Candidates rebuilt when a placed cell has changed
+        grid.current_solution[row_num][col_num] = 0
+        self.assertTrue(solver.setup_phase_1())
+        self.assertIsNot(solver.candidates, candidates)
+
+        # Deduction hits and times added to the run stats
+        grid = grid_for_tests()
+        grid.current_solution = grid.user_rows
+        solver = gsol.GridSolver(grid, output)
+        for _ in range(2):
+            self.assertTrue(solver.setup_phase_1())
+            self.assertEqual({name: stats["hits"] for name, stats
+                              in solver.deductions.items()},
+                             solver.deduction.hits)
+        self.assertGreater(sum(solver.deduction.hits.values()), 0)
+        self.assertAlmostEqual(sum(stats["seconds"] for stats
+                                   in solver.deductions.values()),
+                               sum(solver.deduction.times.values()))
 
         # Bad Grid
         bad_rows = [
@@ -194,10 +572,36 @@ class TestGridSolver(unittest.TestCase):
         grid = grid_for_tests()
         grid.current_solution = grid.user_rows
         solver = gsol.GridSolver(grid, output)
+        solver.deduction = None
         solver.setup_phase_1()
 
         # Good Grid
         self.assertTrue(solver.run_phase_1())
+        index_rows = list(grid.ga_p2_pos_rows)
+
+        # Good Grid from the row cache
+        solver.use_row_index = False
+        hits = rc.get_cache().hits
+        self.assertTrue(solver.run_phase_1())
+        self.assertEqual(grid.ga_p2_pos_rows, index_rows)
+        self.assertEqual(rc.get_cache().hits, hits + 9)
+
+        # Good Grid without the row index or cache
+        solver.use_row_cache = False
+        self.assertTrue(solver.run_phase_1())
+        self.assertEqual(grid.ga_p2_pos_rows, index_rows)
+
+        # A stopped enumeration isn't cached as the rows of the row
+        solver.use_row_cache = True
+        rc.set_cache(rc.RowCache())
+        solver.thread_running = False
+        cell_values = grid.ga_p1_pos_cells[0]
+        self.assertLess(len(solver.search_row(0)), len(index_rows[0]))
+        self.assertIsNone(rc.get_cache().get(cell_values))
+        solver.thread_running = True
+        self.assertEqual(solver.search_row(0), index_rows[0])
+        self.assertIsNotNone(rc.get_cache().get(cell_values))
+        solver.use_row_cache = False
 
         # Bad Grid
         grid.ga_p1_pos_cells.clear
@@ -247,6 +651,53 @@ class TestGridSolver(unittest.TestCase):
 
         self.assertFalse(solver.run_phase_2())
 
+        # A failed box row stops the searches still running
+        started = threading.Semaphore(0)
+        cancelled = []
+
+        def search_box_row(box_row, cancel, rng=None):
+            if box_row > 0:
+                started.release()
+                cancelled.append(cancel.wait(10))
+                return [[]]
+            for _ in range(2):  # Fail once the other searches are running
+                started.acquire(timeout=10)
+            return []
+
+        solver.search_box_row = search_box_row
+        start_time = time.time()
+        self.assertFalse(solver.run_phase_2())
+        self.assertLess(time.time() - start_time, 5)
+        self.assertEqual(cancelled, [True, True])  # Ended before return
+
+    def test_search_box_row(self):
+        """
+        A function to test the search_box_row function
+        in grid_solver
+        """
+        print("\nTesting search_box_row")
+
+        grid = grid_for_tests()
+        solver = gsol.GridSolver(grid, output)
+
+        row1 = [9, 6, 2, 1, 4, 5, 8, 7, 3]
+        row2 = [7, 8, 4, 2, 3, 6, 5, 9, 1]
+        row3 = [1, 3, 5, 7, 8, 9, 6, 4, 2]
+
+        grid.ga_p2_pos_rows.clear()
+        grid.ga_p2_pos_rows.append([row1])
+        grid.ga_p2_pos_rows.append([row2])
+        grid.ga_p2_pos_rows.append([row3])
+
+        # Good box row
+        cancel = threading.Event()
+        self.assertEqual(solver.search_box_row(0, cancel),
+                         [[row1, row2, row3]])
+
+        # Cancelled before starting
+        cancel.set()
+        self.assertFalse(solver.search_box_row(0, cancel))
+
     def test_run_phase_3(self):
         """
         A function to test the run_phase_3 function
@@ -377,6 +828,7 @@ class TestGridSolver(unittest.TestCase):
         self.assertEqual(grid.ga_p2_pos_rows[6][0], row7)
         self.assertEqual(grid.ga_p2_pos_rows[7][0], row8)
         self.assertEqual(grid.ga_p2_pos_rows[8][0], row9)
+        self.assertEqual(solver.rows_fixed, 9)
 
     def test_check_rows(self):
         """
@@ -397,6 +849,16 @@ class TestGridSolver(unittest.TestCase):
         row1 = [9, 6, 2, 1, 4, 5, 8, 7, 3]
         grid.ga_p2_pos_rows[0] = [row1]
         self.assertTrue(solver.check_rows())
+        self.assertEqual(solver.cells_fixed, 6)
+
+        # When 2 rows found sharing all but 2 cells
+        grid.current_solution[1] = [0] * 9
+        grid.ga_p2_pos_rows[1] = [[7, 8, 4, 2, 3, 6, 5, 9, 1],
+                                  [7, 8, 4, 2, 3, 6, 5, 1, 9]]
+        self.assertTrue(solver.check_rows())
+        self.assertEqual(solver.cells_fixed, 7)
+        self.assertEqual(grid.current_solution[1],
+                         [7, 8, 4, 2, 3, 6, 5, 0, 0])
 
         # When whole grid found
         row2 = [7, 8, 4, 2, 3, 6, 5, 9, 1]
@@ -0,0 +1,92 @@
+import join_engine as je
+import unittest
+
+
+def rows_for_tests():
+    """
+    A function to build the rows used in tests
+    """
+    rows = [
+        [9, 6, 2, 1, 4, 5, 8, 7, 3],
+        [7, 8, 4, 2, 3, 6, 5, 9, 1],
+        [1, 3, 5, 7, 8, 9, 6, 4, 2],
+        [3, 5, 9, 4, 7, 8, 2, 1, 6],
+        [6, 2, 8, 3, 9, 1, 7, 5, 4],
+        [4, 1, 7, 5, 6, 2, 3, 8, 9],
+        [2, 9, 6, 8, 5, 4, 1, 3, 7],
+        [8, 4, 3, 6, 1, 7, 9, 2, 5],
+        [5, 7, 1, 9, 2, 3, 4, 6, 8]
+    ]
+
+    return rows
+
+
+class TestJoinEngine(unittest.TestCase):
+    """
+    A class to perform unittests on functions
+    in join_engine
+    """
+
+    def test_row_masks(self):
+        """
+        A function to test the row_masks function
+        in join_engine
+        """
+        print("\nTesting row_masks")
+
+        row = tuple(rows_for_tests()[0])
+        box_mask, column_mask = je.row_masks(row)
+
+        self.assertEqual(box_mask & 0b111111111, 0b100100010)
+        self.assertEqual(column_mask & 0b111111111, 1 << 8)
+        self.assertEqual(column_mask >> 72, 1 << 2)
+
+        # Empty cell or digit repeated in a box
+        self.assertEqual(je.row_masks((0,) * 9), (-1, -1))
+        self.assertEqual(je.row_masks((1, 1, 2, 3, 4, 5, 6, 7, 8))[0], -1)
+
+    def test_column_mask(self):
+        """
+        A function to test the column_mask function
+        in join_engine
+        """
+        print("\nTesting column_mask")
+
+        rows = rows_for_tests()
+        self.assertGreater(je.column_mask(rows[0:3]), 0)
+        self.assertEqual(je.column_mask([rows[0], rows[0], rows[1]]), -1)
+
+    def test_join(self):
+        """
+        A function to test the join function
+        in join_engine
+        """
+        print("\nTesting join")
+
+        rows = rows_for_tests()
+
+        # Box rows from rows, the two top rows can swap
+        masks = []
+        masks.append([je.box_mask(rows[0]), je.box_mask(rows[1])])
+        masks.append([je.box_mask(rows[1]), je.box_mask(rows[0])])
+        masks.append([je.box_mask(rows[2]), -1])
+
+        self.assertEqual(je.join(masks), [[0, 0, 0], [1, 1, 0]])
+        self.assertEqual(je.join(masks, limit=1), [[0, 0, 0]])
+        self.assertIsNone(je.join(masks, max_work=2))
+
+        # Grid from box rows
+        masks = []
+        for box_row in range(3):
+            masks.append([je.column_mask(rows[box_row * 3: box_row * 3 + 3])])
+
+        self.assertEqual(je.join(masks), [[0, 0, 0]])
+
+        # Nothing to join
+        self.assertEqual(je.join([]), [])
+        self.assertEqual(je.join([[1], [-1]]), [])
+        self.assertEqual(je.join([[1], [1]]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import phase_pipeline as pp
+import sudoku_grid as sg
+import unittest
+
+
+def rows_for_tests():
+    """
+    A function to build the rows used in tests
+    """
+    rows = [
+        [9, 6, 2, 1, 4, 5, 8, 7, 3],
+        [7, 8, 4, 2, 3, 6, 5, 9, 1],
+        [1, 3, 5, 7, 8, 9, 6, 4, 2],
+        [3, 5, 9, 4, 7, 8, 2, 1, 6],
+        [6, 2, 8, 3, 9, 1, 7, 5, 4],
+        [4, 1, 7, 5, 6, 2, 3, 8, 9],
+        [2, 9, 6, 8, 5, 4, 1, 3, 7],
+        [8, 4, 3, 6, 1, 7, 9, 2, 5],
+        [5, 7, 1, 9, 2, 3, 4, 6, 8]
+    ]
+
+    return rows
+
+
+def counted_source(rows: list, pulled: list):
+    """
+    A function that yields the given rows, counting each row pulled.
+    """
+    for row in rows:
+        pulled.append(row)
+        yield row
+
+
+class TestPhasePipeline(unittest.TestCase):
+    """
+    A class to perform unittests on functions
+    in phase_pipeline
+    """
+
+    def test_run(self):
+        """
+        A function to test the run function
+        of the PhasePipeline class
+        """
+        print("\nTesting run")
+
+        rows = rows_for_tests()
+
+        # Each row offered along with the rows swapped in its box row
+        sources = []
+        for row_num in range(9):
+            swap = row_num - row_num % 3 + (row_num + 1) % 3
+            sources.append([rows[swap], rows[row_num]])
+
+        pipeline = pp.PhasePipeline(sources, buffer_size=1)
+        grid = sg.SudokuGrid()
+        grid.current_solution = pipeline.run()
+        self.assertTrue(grid.check_solution())
+
+        # A row with no candidates
+        sources[4] = []
+        pipeline = pp.PhasePipeline(sources)
+        self.assertIsNone(pipeline.run())
+        self.assertEqual(pipeline.box_rows[1], [])
+
+    def test_run_short_circuit(self):
+        """
+        A function to test the run function
+        of the PhasePipeline class stops pulling rows once solved
+        """
+        print("\nTesting run_short_circuit")
+
+        rows = rows_for_tests()
+        pulled = []
+        sources = []
+        for row_num in range(9):
+            extra = [rows[row_num]] * 10
+            sources.append(counted_source([rows[row_num]] + extra, pulled))
+
+        pipeline = pp.PhasePipeline(sources, buffer_size=1)
+        self.assertEqual(pipeline.run(), rows)
+        self.assertEqual(len(pulled), 9)
+
+    def test_run_max_kept(self):
+        """
+        A function to test the run function
+        of the PhasePipeline class gives up past max_kept candidates
+        """
+        print("\nTesting run_max_kept")
+
+        rows = rows_for_tests()
+        sources = []
+        for row_num in range(9):
+            sources.append([rows[row_num]] * 10)
+
+        # The rows all fit, but the bound is reached before the last one
+        pipeline = pp.PhasePipeline(sources, buffer_size=1, max_kept=5)
+        self.assertIsNone(pipeline.run())
+        self.assertTrue(pipeline.overflowed)
+        self.assertEqual(pipeline.kept, 6)
+
+        pipeline = pp.PhasePipeline(sources, buffer_size=1, max_kept=20)
+        self.assertEqual(pipeline.run(), rows)
+        self.assertFalse(pipeline.overflowed)
+        self.assertLessEqual(pipeline.kept, 20)
+
+    def test_add_box_row(self):
+        """
+        A function to test the add_box_row function
+        of the PhasePipeline class
+        """
+        print("\nTesting add_box_row")
+
+        rows = rows_for_tests()
+        pipeline = pp.PhasePipeline([[]] * 9)
+        pipeline.add_box_row(2, rows[6:])
+        pipeline.add_box_row(0, rows[:3])
+        pipeline.add_box_row(1, rows[:3])  # Clashes with box row 0
+        self.assertIsNone(pipeline.solution)
+        self.assertEqual(len(pipeline.box_rows[1]), 1)
+
+        # The box row that completes the columns finishes the grid
+        pipeline.add_box_row(1, rows[3:6])
+        self.assertEqual(pipeline.solution, rows)
+
+    def test_get_rows(self):
+        """
+        A function to test the get_rows function
+        of the PhasePipeline class
+        """
+        print("\nTesting get_rows")
+
+        rows = rows_for_tests()
+        pipeline = pp.PhasePipeline([[]] * 9)
+        pipeline.add_row(0, rows[0])
+        pipeline.add_row(0, [0] * 9)  # Never usable so not kept
+
+        self.assertEqual(pipeline.get_rows()[0], [rows[0]])
+        self.assertEqual(pipeline.get_rows()[1], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import phase_scheduler as ps
+import threading
+import unittest
+
+
+class TestPhaseScheduler(unittest.TestCase):
+    """
+    A class to perform unittests on functions
+    in phase_scheduler
+    """
+
+    def test_run(self):
+        """
+        A function to test the run function
+        of the PhaseScheduler class
+        """
+        print("\nTesting run")
+
+        order = []
+        lock = threading.Lock()
+
+        def make_task(name):
+            def task(cancel):
+                with lock:
+                    order.append(name)
+                return [name]
+            return task
+
+        scheduler = ps.PhaseScheduler(max_workers=2)
+        scheduler.add("grid", make_task("grid"), ["box 0", "box 1"])
+        scheduler.add("box 0", make_task("box 0"), ["row 0", "row 1"])
+        scheduler.add("box 1", make_task("box 1"), ["row 2"])
+        for row_num in range(3):
+            scheduler.add(f"row {row_num}", make_task(f"row {row_num}"))
+
+        self.assertTrue(scheduler.run())
+        self.assertEqual(scheduler.results["grid"], ["grid"])
+        self.assertEqual(order[-1], "grid")
+        self.assertLess(order.index("row 0"), order.index("box 0"))
+        self.assertLess(order.index("row 2"), order.index("box 1"))
+
+    def test_run_fail_fast(self):
+        """
+        A function to test the run function
+        of the PhaseScheduler class stops after a failed task
+        """
+        print("\nTesting run_fail_fast")
+
+        started = []
+
+        def slow_task(cancel):
+            started.append("slow")
+            cancel.wait(5)  # Returns early once cancelled
+            return cancel.is_set()
+
+        def failed_task(cancel):
+            return []
+
+        def next_task(cancel):
+            started.append("next")
+            return True
+
+        scheduler = ps.PhaseScheduler(max_workers=2)
+        scheduler.add("slow", slow_task)
+        scheduler.add("failed", failed_task)
+        scheduler.add("next", next_task, ["failed"])
+
+        self.assertFalse(scheduler.run())
+        self.assertEqual(scheduler.failed, "failed")
+        self.assertEqual(started, ["slow"])
+        self.assertTrue(scheduler.cancel.is_set())
+
+
+if __name__ == "__main__":
+    unittest.main()
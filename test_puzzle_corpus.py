@@ -0,0 +1,109 @@
+import numpy as np
+import os
+import puzzle_corpus as pc
+import tempfile
+import unittest
+
+
+def puzzles_for_tests():
+    """
+    A function to build the puzzles used in tests
+    """
+    puzzle = ("..21...7..8...6..113..8...2.59..82.....391....." +
+              "75..38.2...5..378..6...2..7...34..")
+    solution = ("962145873784236591135789642359478216628391754" +
+                "417562389296854137843617925571923468")
+
+    return [puzzle, solution, puzzle.replace(".", "0")]
+
+
+class TestPuzzleCorpus(unittest.TestCase):
+    """
+    A class to perform unittests on functions
+    in puzzle_corpus
+    """
+
+    def test_read(self):
+        """
+        A function to test the read function
+        of the PuzzleCorpus class
+        """
+        print("\nTesting read")
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "puzzles.txt")
+
+            # Windows line endings and no line ending on the last record
+            with open(path, "w", newline="") as corpus_file:
+                corpus_file.write("\r\n".join(puzzles_for_tests()))
+
+            with pc.PuzzleCorpus(path) as corpus:
+                self.assertEqual(len(corpus), 3)
+                self.assertEqual(corpus.record_size, 83)
+
+                digits = corpus.read(0, 10)
+                self.assertEqual(digits.shape, (3, 81))
+                self.assertEqual(digits.dtype, np.uint8)
+                self.assertEqual(pc.puzzle_string(digits[0]),
+                                 puzzles_for_tests()[2])
+                self.assertEqual(pc.puzzle_rows(digits[1])[0],
+                                 [9, 6, 2, 1, 4, 5, 8, 7, 3])
+
+            # Bad characters
+            with open(path, "w") as corpus_file:
+                corpus_file.write(puzzles_for_tests()[0].replace(".", "x"))
+            with pc.PuzzleCorpus(path) as corpus:
+                self.assertRaises(ValueError, corpus.read, 0, 1)
+
+            # A bad record among good ones
+            with open(path, "w") as corpus_file:
+                corpus_file.write(puzzles_for_tests()[1] + "\n" +
+                                  puzzles_for_tests()[0].replace(".", "x") +
+                                  "\n" + puzzles_for_tests()[2] + "\n")
+            with pc.PuzzleCorpus(path) as corpus:
+                digits, valid = corpus.read_checked(0, 3)
+                self.assertEqual(valid.tolist(), [True, False, True])
+                self.assertFalse(digits[1].any())
+                self.assertEqual(pc.puzzle_string(digits[2]),
+                                 puzzles_for_tests()[2])
+                self.assertEqual(corpus.record_text(1),
+                                 puzzles_for_tests()[0].replace(".", "x"))
+
+                chunks = list(corpus.checked_chunks(chunk_size=2))
+                self.assertEqual([chunk[2].tolist() for chunk in chunks],
+                                 [[True, False], [True]])
+                self.assertRaises(ValueError, list, corpus.chunks(2))
+
+    def test_chunks(self):
+        """
+        A function to test the chunks and shard_offsets functions
+        of the PuzzleCorpus class
+        """
+        print("\nTesting chunks")
+
+        puzzles = [puzzles_for_tests()[index % 3] for index in range(10)]
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "puzzles.txt")
+            pc.write_corpus(path, [[int(char) for char in
+                                    puzzle.replace(".", "0")]
+                                   for puzzle in puzzles])
+
+            with pc.PuzzleCorpus(path) as corpus:
+                chunks = list(corpus.chunks(chunk_size=4))
+                self.assertEqual([first for first, _ in chunks], [0, 4, 8])
+                self.assertEqual(chunks[2][1].shape, (2, 81))
+
+                # Every puzzle is read once across the shards
+                found = []
+                for start, stop in corpus.shard_offsets(3):
+                    for first, digits in pc.iter_shard(path, start, stop, 2):
+                        for digit_row in digits:
+                            found.append(pc.puzzle_string(digit_row))
+                self.assertEqual(found, [puzzle.replace(".", "0")
+                                         for puzzle in puzzles])
+
+                self.assertRaises(ValueError, list, corpus.chunks(4, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import canonical_form as cf
+import dlx_solver as dlx
+import os
+import puzzle_store as ps
+import tempfile
+import unittest
+
+
+def rows_for_tests():
+    """
+    A function to build the rows used in tests
+    """
+    rows = [
+        [0, 0, 2, 1, 0, 0, 0, 7, 0],
+        [0, 8, 0, 0, 0, 6, 0, 0, 1],
+        [1, 3, 0, 0, 8, 0, 0, 0, 2],
+        [0, 5, 9, 0, 0, 8, 2, 0, 0],
+        [0, 0, 0, 3, 9, 1, 0, 0, 0],
+        [0, 0, 7, 5, 0, 0, 3, 8, 0],
+        [2, 0, 0, 0, 5, 0, 0, 3, 7],
+        [8, 0, 0, 6, 0, 0, 0, 2, 0],
+        [0, 7, 0, 0, 0, 3, 4, 0, 0]
+    ]
+
+    return rows
+
+
+class TestPuzzleStore(unittest.TestCase):
+    """
+    A class to perform unittests on functions
+    in puzzle_store
+    """
+
+    def test_get(self):
+        """
+        A function to test the get and put functions
+        of the PuzzleStore class
+        """
+        print("\nTesting get")
+
+        rows = rows_for_tests()
+        solution = next(dlx.solutions(rows))
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "solved")
+
+            with ps.PuzzleStore(path) as store:
+                self.assertIsNone(store.get(rows))
+                store.put(rows, solution)
+                self.assertEqual(store.get(rows), solution)
+
+            # Kept on disk, and found for a relabelled transpose
+            labels = [0, 9, 8, 7, 6, 5, 4, 3, 2, 1]
+            variant = [[labels[digit] for digit in row]
+                       for row in cf.transpose(rows)]
+            with ps.PuzzleStore(path) as store:
+                found = store.get(variant)
+                self.assertEqual(found, [[labels[digit] for digit in row]
+                                         for row in cf.transpose(solution)])
+                self.assertEqual(store.hits, 1)
+
+            # Read only, so a transpose is found but not kept
+            key = "p" + ps.grid_string(cf.transpose(rows))
+            with ps.PuzzleStore(path, "r") as store:
+                self.assertEqual(store.get(cf.transpose(rows)),
+                                 cf.transpose(solution))
+                store.put(rows, found)
+                self.assertIsNone(store.db.get(key))
+                self.assertEqual(store.get(rows), solution)
+
+    def test_grid_string(self):
+        """
+        A function to test the grid_string and string_grid functions
+        in puzzle_store
+        """
+        print("\nTesting grid_string")
+
+        text = ps.grid_string(rows_for_tests())
+        self.assertEqual(text[:9], "002100070")
+        self.assertEqual(ps.string_grid(text), rows_for_tests())
+
+
+if __name__ == "__main__":
+    unittest.main()
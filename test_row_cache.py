@@ -0,0 +1,81 @@
+import os
+import row_cache as rc
+import tempfile
+import unittest
+
+
+def cells_for_tests(first: int):
+    """
+    A function to build the candidate digits of a row used in tests
+    """
+    return [[first, 2]] + [[digit] for digit in range(3, 10)] + [[1, 2]]
+
+
+class TestRowCache(unittest.TestCase):
+    """
+    A class to perform unittests on functions
+    in row_cache
+    """
+
+    def test_get(self):
+        """
+        A function to test the get and put functions
+        of the RowCache class
+        """
+        print("\nTesting get")
+
+        cache = rc.RowCache(max_rows=2, max_entry_rows=1)
+        row = [1] + list(range(3, 10)) + [2]
+        self.assertIsNone(cache.get(cells_for_tests(1)))
+        self.assertEqual(cache.misses, 1)
+
+        cache.put(cells_for_tests(1), [row])
+        found = cache.get(cells_for_tests(1))
+        self.assertEqual(found, [row])
+        self.assertEqual(cache.hits, 1)
+
+        # Returned rows are new lists
+        found[0][0] = 0
+        self.assertEqual(cache.get(cells_for_tests(1)), [row])
+
+        # Least recently used entry dropped once over the row limit
+        cache.put(cells_for_tests(4), [row])
+        cache.get(cells_for_tests(1))
+        cache.put(cells_for_tests(5), [row])
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.n_rows, 2)
+        self.assertIsNone(cache.get(cells_for_tests(4)))
+        self.assertEqual(cache.get(cells_for_tests(5)), [row])
+
+        # Replacing an entry counts only its new rows
+        cache.put(cells_for_tests(5), [])
+        self.assertEqual(cache.n_rows, 1)
+        self.assertEqual(len(cache), 2)
+
+        # Too many rows for one entry
+        cache.put(cells_for_tests(6), [row, row])
+        self.assertIsNone(cache.get(cells_for_tests(6)))
+        self.assertEqual(cache.n_rows, 1)
+
+    def test_save(self):
+        """
+        A function to test the save and load functions
+        of the RowCache class
+        """
+        print("\nTesting save")
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "rows.pickle")
+            row = [1] + list(range(3, 10)) + [2]
+
+            cache = rc.RowCache(path=path)
+            cache.put(cells_for_tests(1), [row])
+            cache.save()
+
+            self.assertEqual(rc.RowCache(path=path).get(cells_for_tests(1)),
+                             [row])
+            self.assertEqual(os.listdir(folder), ["rows.pickle"])
+
+
+if __name__ == "__main__":
+    unittest.main()
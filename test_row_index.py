@@ -0,0 +1,60 @@
+import row_index as ri
+import tempfile
+import unittest
+
+
+class TestRowIndex(unittest.TestCase):
+    """
+    A class to perform unittests on functions
+    in row_index
+    """
+
+    def test_build(self):
+        """
+        A function to test the build function
+        of the RowIndex class
+        """
+        print("\nTesting build")
+
+        with tempfile.TemporaryDirectory() as folder:
+            index = ri.RowIndex(folder)
+
+            self.assertEqual(index.table.shape, (ri.N_ROWS, 9))
+            self.assertEqual(index.bits.shape, (9, ri.N_ROWS))
+            self.assertEqual(index.table[0].tolist(), list(range(1, 10)))
+            self.assertEqual(index.bits[8][0], 1 << 8)
+
+            # Reloading reuses the files on disk
+            self.assertEqual(ri.RowIndex(folder).table[-1].tolist(),
+                             list(range(9, 0, -1)))
+
+    def test_find_rows(self):
+        """
+        A function to test the find_rows function
+        of the RowIndex class
+        """
+        print("\nTesting find_rows")
+
+        index = ri.get_index()
+
+        # Two rows possible
+        cells = [[9], [6], [2], [1], [4, 5], [4, 5], [8], [7], [3]]
+        self.assertEqual(list(index.find_rows(cells)),
+                         [[9, 6, 2, 1, 4, 5, 8, 7, 3],
+                          [9, 6, 2, 1, 5, 4, 8, 7, 3]])
+
+        # Every row possible, kept as digits until each row is used
+        rows = index.find_rows([list(range(1, 10))] * 9)
+        self.assertEqual(len(rows), ri.N_ROWS)
+        self.assertLessEqual(rows.digits.nbytes, ri.N_ROWS * 9)
+        self.assertEqual(rows[0], list(range(1, 10)))
+        self.assertEqual(rows[-1], list(range(9, 0, -1)))
+        self.assertEqual(sum(1 for _ in rows), ri.N_ROWS)
+
+        # No rows possible
+        self.assertEqual(index.find_rows([[1]] * 9), [])
+        self.assertEqual(index.find_rows([[0]] * 9), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
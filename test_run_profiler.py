@@ -0,0 +1,97 @@
+import grid_solver as gsol
+import os
+import row_cache as rc
+import run_profiler as rp
+import sudoku_grid as sg
+import tempfile
+import tracemalloc
+import unittest
+
+
+def grid_for_tests():
+    """
+    A function to build the grid used in tests
+    """
+    grid = sg.SudokuGrid()
+    grid.load_puzzle("..21...7..8...6..113..8...2.59..82.....391....." +
+                     "75..38.2...5..378..6...2..7...34..")
+    return grid
+
+
+class TestRunProfiler(unittest.TestCase):
+    """
+    A class to perform unittests on functions
+    in run_profiler
+    """
+
+    def setUp(self):
+        # Rows cached by earlier tests would skip the phase 1 searches
+        rc.set_cache(rc.RowCache())
+
+    def profiled_functions(self, profiler):
+        """
+        A function that returns the names of the functions
+        profiled in the last run.
+        """
+        return {name for _, _, name in profiler.stats.stats}
+
+    def test_profile_run(self):
+        """
+        A function to test profiling a GridSolver run
+        with the RunProfiler class
+        """
+        print("\nTesting profile_run")
+
+        with tempfile.TemporaryDirectory() as folder:
+            solver = gsol.GridSolver(grid_for_tests(), None)
+            solver.deduction = None  # Leave the phases something to solve
+            solver.use_row_cache = False
+            profiler = rp.RunProfiler(memory=True, out_dir=folder,
+                                      name="puzzle")
+            solver.profiler = profiler
+
+            solver.run()
+            self.assertTrue(solver.solved)
+            self.assertFalse(tracemalloc.is_tracing())
+            self.assertEqual(profiler.path,
+                             os.path.join(folder, "puzzle.prof"))
+            self.assertTrue(os.path.exists(profiler.path))
+
+        phases = ["setup", "phase_1", "phase_2", "phase_3"]
+        for phase in phases:
+            self.assertIn(phase, solver.cpu_times)
+            self.assertIn(phase, solver.peak_memory)
+        self.assertEqual(set(solver.cpu_times), set(solver.phase_times))
+        self.assertGreaterEqual(solver.peak_memory["run"],
+                                max(solver.peak_memory[phase]
+                                    for phase in phases))
+        self.assertIn("run_phases", self.profiled_functions(profiler))
+        self.assertIn("function calls", profiler.summary(5))
+
+        # Not profiled, nothing recorded
+        solver.profiler = None
+        solver.run()
+        self.assertEqual(solver.cpu_times, {})
+        self.assertEqual(solver.peak_memory, {})
+
+    def test_profile_cpu_only(self):
+        """
+        A function to test profiling without tracing memory
+        """
+        print("\nTesting profile_cpu_only")
+
+        solver = gsol.GridSolver(grid_for_tests(), None)
+        profiler = rp.RunProfiler()
+        solver.profiler = profiler
+
+        solver.run()
+        self.assertIn("setup", solver.cpu_times)
+        self.assertEqual(solver.peak_memory, {})
+        self.assertIsNone(profiler.path)
+        self.assertIn("setup_phase_1", self.profiled_functions(profiler))
+        self.assertIn("function calls", profiler.summary())
+        self.assertEqual(rp.RunProfiler().summary(), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import numpy as np
+import shared_batch as sb
+import unittest
+
+
+def puzzles_for_tests():
+    """
+    A function to build the puzzle digits used in tests
+    """
+    puzzle = ("002100070080006001130080002059008200000391000" +
+              "007500380200050037800600020070003400")
+    conflict = "11" + puzzle[2:]
+    digits = [[int(char) for char in text]
+              for text in [puzzle, conflict, puzzle, puzzle]]
+
+    return np.array(digits, dtype=np.uint8)
+
+
+class TestSharedBatch(unittest.TestCase):
+    """
+    A class to perform unittests on functions
+    in shared_batch
+    """
+
+    def test_solve(self):
+        """
+        A function to test the solve function
+        of the SharedBatchSolver class
+        """
+        print("\nTesting solve")
+
+        solution = ("962145873784236591135789642359478216628391754" +
+                    "417562389296854137843617925571923468")
+
+        with sb.SharedBatchSolver(8, workers=2, engine="exact") as solver:
+            self.assertEqual(solver.descriptors(3), [(0, 1, "exact"),
+                                                     (1, 1, "exact"),
+                                                     (2, 1, "exact")])
+
+            for _ in range(2):  # Arrays and workers reused
+                solutions, status, times = solver.solve(puzzles_for_tests())
+                self.assertEqual(status.tolist(), [sb.SOLVED, sb.INVALID,
+                                                   sb.SOLVED, sb.SOLVED])
+                self.assertEqual("".join(str(digit) for digit in
+                                         solutions[3]), solution)
+                self.assertFalse(solutions[1].any())
+                self.assertEqual(times.shape, (4,))
+
+            # Puzzles that couldn't be read are invalid, not solved
+            solutions, status, times = solver.solve(
+                puzzles_for_tests(), [True, True, False, True])
+            self.assertEqual(status.tolist(), [sb.SOLVED, sb.INVALID,
+                                               sb.INVALID, sb.SOLVED])
+            self.assertFalse(solutions[2].any())
+            self.assertEqual(times[2], 0)
+
+            self.assertRaises(ValueError, solver.solve,
+                              np.zeros((9, 81), dtype=np.uint8))
+
+    def test_requeue(self):
+        """
+        A function to test puzzles that run out of time with the ga
+        are queued again for the exact engine
+        """
+        print("\nTesting requeue")
+
+        hard = ("800000000003600000070090200050007000000045700" +
+                "000100030001000068008500010090000400")
+        puzzles = np.array([[int(char) for char in hard]] * 2,
+                           dtype=np.uint8)
+
+        with sb.SharedBatchSolver(100, workers=2, timeout=0.001,
+                                  max_unit=4) as solver:
+            sizes = [descriptor[1] for descriptor in solver.descriptors(100)]
+            self.assertEqual(sum(sizes), 100)
+            self.assertEqual(sizes[0], 4)
+            self.assertEqual(sizes[-1], 1)
+
+            solutions, status, times = solver.solve(puzzles)
+            self.assertEqual(status.tolist(), [sb.SOLVED, sb.SOLVED])
+            self.assertEqual(solver.requeued, 2)
+            self.assertEqual(solutions[0][:9].tolist(),
+                             [8, 1, 2, 7, 5, 3, 6, 4, 9])
+
+
+if __name__ == "__main__":
+    unittest.main()
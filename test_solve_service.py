@@ -0,0 +1,112 @@
+import json
+import solve_service as ss
+import time
+import unittest
+import urllib.error
+import urllib.request
+
+
+def puzzle_for_tests():
+    """
+    A function to build the puzzle used in tests
+    """
+    return ("..21...7..8...6..113..8...2.59..82.....391....." +
+            "75..38.2...5..378..6...2..7...34..")
+
+
+def call(port: int, path: str, body: dict = None):
+    """
+    A function that sends a request to the service and returns
+    the HTTP status and the response.
+    """
+    data = None
+    if body is not None:
+        data = json.dumps(body).encode()
+    request = urllib.request.Request(f"http://{ss.HOST}:{port}{path}",
+                                     data=data)
+
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as error:
+        return error.code, json.loads(error.read())
+
+
+class TestSolveService(unittest.TestCase):
+    """
+    A class to perform unittests on functions
+    in solve_service
+    """
+
+    def test_service(self):
+        """
+        A function to test the requests of the SolveService class
+        """
+        print("\nTesting service")
+
+        with ss.SolveService(port=0, workers=1, queue_size=1) as service:
+            service.start()
+            port = service.port
+
+            self.assertEqual(call(port, "/health"), (200, {"status": "ok"}))
+
+            code, result = call(port, "/solve", {"puzzle": puzzle_for_tests(),
+                                                 "id": "first"})
+            self.assertEqual(code, 200)
+            self.assertEqual(result["id"], "first")
+            self.assertTrue(result["solved"])
+            self.assertEqual(result["solution"][:9], "962145873")
+
+            # Deadline passed before a worker could start
+            code, result = call(port, "/solve", {"puzzle": puzzle_for_tests(),
+                                                 "timeout": 1e-9})
+            self.assertEqual(result["status"], "timeout")
+
+            # Bad requests
+            self.assertEqual(call(port, "/solve", {"puzzle": "123",
+                                                   "timeout": -1})[0], 400)
+            self.assertEqual(call(port, "/solve",
+                                  {"puzzle": puzzle_for_tests(),
+                                   "engine": "fast"})[0], 400)
+            self.assertEqual(call(port, "/cancel", {"id": "none"})[0], 404)
+            self.assertEqual(call(port, "/other")[0], 404)
+
+            # Every slot in use
+            free_slots = list(service.free_slots)
+            service.free_slots.clear()
+            code, result = call(port, "/solve", {"puzzle": puzzle_for_tests()})
+            self.assertEqual(code, 503)
+            service.free_slots.extend(free_slots)
+
+            code, metrics = call(port, "/metrics")
+            self.assertEqual(metrics["solved"], 1)
+            self.assertEqual(metrics["timeout"], 1)
+            self.assertEqual(metrics["rejected"], 1)
+            self.assertEqual(metrics["in_flight"], 0)
+            self.assertEqual(metrics["slots"], 2)
+
+    def test_solve_request(self):
+        """
+        A function to test the solve_request function
+        in solve_service
+        """
+        print("\nTesting solve_request")
+
+        hard = ("800000000003600000070090200050007000000045700" +
+                "000100030001000068008500010090000400")
+        ss.cancel_flags = [0, 1]
+
+        result = ss.solve_request(0, hard, "exact", None, time.time() + 30)
+        self.assertTrue(result["solved"])
+
+        # Cancelled through its slot
+        result = ss.solve_request(1, hard, "ga", 1, time.time() + 30)
+        self.assertEqual(result["status"], "cancelled")
+
+        # Past its deadline
+        result = ss.solve_request(0, hard, "ga", 1, time.time() - 1)
+        self.assertEqual(result["status"], "timeout")
+
+
+if __name__ == "__main__":
+    unittest.main()
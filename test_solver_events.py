@@ -0,0 +1,85 @@
+import solver_events as ev
+import unittest
+
+
+class TestSolverEvents(unittest.TestCase):
+    """
+    A class to perform unittests on functions
+    in solver_events
+    """
+
+    def test_event_stream(self):
+        """
+        A function to test the subscribe, unsubscribe and emit
+        functions of the EventStream class
+        """
+        print("\nTesting event_stream")
+
+        stream = ev.EventStream()
+        stream.emit(ev.STOPPED, elapsed=0)  # Nothing listening
+
+        first = []
+        second = []
+        stream.subscribe(first.append)
+        stream.subscribe(second.append)
+        stream.emit(ev.PHASE_START, phase="phase_1")
+        stream.unsubscribe(second.append)
+        stream.emit(ev.PHASE_END, phase="phase_1", ok=True, stopped=False,
+                    seconds=0.5)
+
+        self.assertEqual([event.kind for event in first],
+                         [ev.PHASE_START, ev.PHASE_END])
+        self.assertEqual(len(second), 1)
+        self.assertLessEqual(first[0].time, first[1].time)
+        self.assertEqual(first[1].to_dict(),
+                         {"type": "phase_end", "time": first[1].time,
+                          "phase": "phase_1", "ok": True, "stopped": False,
+                          "seconds": 0.5})
+
+    def test_text_output(self):
+        """
+        A function to test the text written
+        by the TextOutput class
+        """
+        print("\nTesting text_output")
+
+        texts = []
+        stream = ev.EventStream()
+        stream.subscribe(ev.TextOutput(texts.append))
+
+        stream.emit(ev.ATTEMPT_START, attempt=1, unit="attempt", racers=1)
+        for phase, searches in [("phase_1", 2), ("phase_2", 1)]:
+            stream.emit(ev.PHASE_START, phase=phase)
+            for _ in range(searches):
+                stream.emit(ev.SEARCH_DONE, phase=1, method="ga", results=3,
+                            evaluations=120)
+            stream.emit(ev.PHASE_END, phase=phase, ok=phase == "phase_1",
+                        stopped=False, seconds=0.1)
+        stream.emit(ev.ATTEMPT_END, attempt=1, unit="attempt",
+                    outcome="retry", elapsed=61)
+        stream.emit(ev.ATTEMPT_START, attempt=2, unit="round", racers=2)
+        stream.emit(ev.ATTEMPT_END, attempt=2, unit="round",
+                    outcome="failed", elapsed=62)
+        stream.emit(ev.FAILED, reason="round", count=2, fallback=True,
+                    elapsed=62)
+        stream.emit(ev.PHASE_START, phase="exact")
+        stream.emit(ev.PHASE_END, phase="exact", ok=True, stopped=False,
+                    seconds=0.1)
+        stream.emit(ev.SOLVED, source="exact", count=1, elapsed=63)
+
+        self.assertEqual("".join(texts),
+                         "Attempt 1:\n" +
+                         "        Phase 1 .. Ok\n" +
+                         "        Phase 2 . X\n" +
+                         "Didn't find anything this try, " +
+                         "starting new attempt.\n" +
+                         "Current time elapsed: 1 minute 01 second.\n\n" +
+                         "Round 2: racing 2 attempts \n" +
+                         "Unable to find the solution after 2 rounds.\n" +
+                         "Exact solver  Ok\n" +
+                         "Valid solution found after 1 search step!\n" +
+                         "Solver ran for 1 minute 03 seconds.\n\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import os
+import puzzle_store as ps
+import random
+import row_cache as rc
+import subprocess
+import sudoku_api as api
+import sys
+import tempfile
+import unittest
+
+
+def puzzle_for_tests():
+    """
+    A function to build the puzzle used in tests
+    """
+    return ("..21...7..8...6..113..8...2.59..82.....391....." +
+            "75..38.2...5..378..6...2..7...34..")
+
+
+class TestSudokuApi(unittest.TestCase):
+    """
+    A class to perform unittests on functions
+    in sudoku_api
+    """
+
+    def setUp(self):
+        # Rows cached by earlier tests would skip the phase 1 searches
+        rc.set_cache(rc.RowCache())
+
+    def test_solve(self):
+        """
+        A function to test the solve function
+        in sudoku_api
+        """
+        print("\nTesting solve")
+
+        solution = ("962145873784236591135789642359478216628391754" +
+                    "417562389296854137843617925571923468")
+
+        for engine in ["ga", "exact"]:
+            state = random.getstate()
+            result = api.solve(puzzle_for_tests(), engine=engine, seed=1)
+            self.assertTrue(result.solved)
+            self.assertEqual(result.solution_string(), solution)
+            self.assertEqual(result.to_dict()["engine"], engine)
+            self.assertEqual(random.getstate(), state)  # Caller's random
+
+        # Deduction stats reported, and read back from the dictionary
+        result = api.solve(puzzle_for_tests(), seed=1)
+        deductions = result.to_dict()["deductions"]
+        self.assertIn("hidden singles", deductions)
+        self.assertEqual(set(deductions["hidden singles"]),
+                         {"hits", "seconds"})
+        self.assertEqual(api.SolveResult.from_dict(
+            result.to_dict()).deductions, deductions)
+
+        # Puzzle given as a grid
+        rows = [[int(char) for char in solution[row_num * 9:
+                                                row_num * 9 + 9]]
+                for row_num in range(9)]
+        rows[0][0] = 0
+        result = api.solve(rows, engine="exact")
+        self.assertTrue(result.solved)
+        self.assertEqual(result.solution_string(), solution)
+
+        # Invalid puzzles
+        self.assertEqual(api.solve("12345").status, "invalid")
+        self.assertEqual(api.solve("11" + puzzle_for_tests()[2:]).status,
+                         "invalid")
+        self.assertEqual(api.solve("\u00b2" + puzzle_for_tests()[1:]).status,
+                         "invalid")
+        self.assertRaises(ValueError, api.solve, puzzle_for_tests(),
+                          engine="fast")
+
+    def test_solve_store(self):
+        """
+        A function to test the solve function
+        in sudoku_api answers from a puzzle store
+        """
+        print("\nTesting solve with a puzzle store")
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "solved")
+
+            first = api.solve(puzzle_for_tests(), store=path)
+            self.assertTrue(first.solved)
+            self.assertGreaterEqual(first.attempts, 1)
+
+            # Solved from the store kept at the path
+            events = []
+            result = api.solve(puzzle_for_tests(), store=path,
+                               on_event=events.append)
+            self.assertTrue(result.solved)
+            self.assertEqual(result.solution, first.solution)
+            self.assertEqual(result.attempts, 0)
+            self.assertEqual(events[-1].data["source"], "store")
+
+            # Or from an open store
+            with ps.PuzzleStore(path) as store:
+                result = api.solve(puzzle_for_tests(), store=store)
+                self.assertEqual(result.attempts, 0)
+                self.assertEqual(store.hits, 1)
+
+    def test_no_tkinter(self):
+        """
+        A function to test solving through sudoku_api
+        never imports tkinter
+        """
+        print("\nTesting no tkinter")
+
+        code = ("import sys, sudoku_api\n" +
+                f"sudoku_api.solve({puzzle_for_tests()!r})\n" +
+                "print('tkinter' in sys.modules)")
+        output = subprocess.run([sys.executable, "-c", code],
+                                capture_output=True, text=True, check=True)
+        self.assertEqual(output.stdout.strip(), "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -430,5 +430,54 @@ class TestSudokuGrid(unittest.TestCase):
         self.assertTrue(grid.check_duplicates(row6))
 
 
+    def test_has_unique_solution(self):
+        """
+        A function to test the has_unique_solution function
+        of the sudoku_grid class.
+        """
+        print("\nTesting has_unique_solution")
+
+        grid = sudoku_grid.SudokuGrid()
+
+        # Full grid
+        grid.user_rows = grid_layout()
+        self.assertTrue(grid.has_unique_solution())
+
+        # Four corners that can swap their two digits
+        grid.user_rows = grid_layout()
+        for row_num in [3, 5]:
+            grid.user_rows[row_num][2] = 0
+            grid.user_rows[row_num][7] = 0
+
+        self.assertEqual(grid.count_solutions(5), 2)
+        self.assertFalse(grid.has_unique_solution())
+
+        # Conflicting clues
+        grid.user_rows = [[1] * 9] * 9
+        self.assertEqual(grid.count_solutions(), 0)
+
+    def test_load_puzzle(self):
+        """
+        A function to test the load_puzzle and solution_string
+        functions in sudoku_grid
+        """
+        print("\nTesting load_puzzle")
+
+        grid = sudoku_grid.SudokuGrid()
+        text = "..21...7..8...6..113..8...2.59..82.....391....." + \
+               "75..38.2...5..378..6...2..7...34.."
+        self.assertTrue(grid.load_puzzle(text))
+        self.assertEqual(grid.user_rows[0], [0, 0, 2, 1, 0, 0, 0, 7, 0])
+        self.assertEqual(grid.user_rows[8], [0, 7, 0, 0, 0, 3, 4, 0, 0])
+
+        grid.current_solution = grid.user_rows
+        self.assertEqual(grid.solution_string(), text.replace(".", "0"))
+
+        # Not a puzzle
+        self.assertFalse(grid.load_puzzle(text[1:]))
+        self.assertFalse(grid.load_puzzle("x" + text[1:]))
+        self.assertFalse(grid.load_puzzle("\u00b2" + text[1:]))
+
+
 if __name__ == "__main__":
     unittest.main()